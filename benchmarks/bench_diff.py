@@ -0,0 +1,100 @@
+"""
+Measures saving, loading and comparing snapshots of large synthetic scans.
+
+The later scan resizes, removes and adds a share of the files of the earlier one.
+
+Usage:
+    python benchmarks/bench_diff.py --files 2000000 --folders 20000 --changed 0.05
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import polars as pl
+
+from kittyscope.models.crawler import RECURSIVE_SCHEMA
+from kittyscope.models.scan_diff import diff_scans
+from kittyscope.models.snapshots import SnapshotStore
+
+
+def build_table(files: int, folders: int) -> pl.DataFrame:
+    """
+    Creates a recursive results table of files spread over nested folders.
+    """
+    now = datetime.now(timezone.utc)
+    folder_paths = [
+        f"folder_{index // 10}/folder_{index}" if index >= 10 else f"folder_{index}"
+        for index in range(folders)
+    ]
+    file_index = pl.int_range(files, eager=True)
+    table = pl.DataFrame(
+        {
+            "name": "file_" + file_index.cast(pl.String) + ".txt",
+            "type": "file",
+            "size": file_index * 7 % 100_000,
+            "parent": pl.Series(folder_paths).gather(file_index % folders),
+            "depth": 3,
+            "last_access": now,
+            "last_modification": now,
+        }
+    )
+    return table.with_columns(
+        extension=pl.lit(".txt"),
+        file_type=pl.lit("document"),
+        file_count=None,
+    ).cast({column: dtype for column, dtype in RECURSIVE_SCHEMA.items()})
+
+
+def change_table(table: pl.DataFrame, changed: float) -> pl.DataFrame:
+    """
+    Resizes, removes and adds about a share of the files each.
+    """
+    step = max(int(1 / changed), 1)
+    row = pl.int_range(pl.len())
+    resized = table.with_columns(
+        size=pl.when(row % step == 0).then(pl.col("size") + 1).otherwise("size")
+    ).filter(row % step != 1)
+    added = table.filter(row % step == 2).with_columns(
+        name=pl.col("name").str.replace(r"\.txt$", ".new")
+    )
+    return pl.concat([resized, added])
+
+
+def measure(label: str, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<14}{time.perf_counter() - start:>8.2f} s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2_000_000)
+    parser.add_argument("--folders", type=int, default=20_000)
+    parser.add_argument("--changed", type=float, default=0.05)
+    args = parser.parse_args()
+
+    old_table = build_table(args.files, args.folders)
+    new_table = change_table(old_table, args.changed)
+    print(f"entries:      {old_table.height:,} -> {new_table.height:,}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = SnapshotStore(tmp_dir)
+        entry = measure("save", lambda: store.save("/data", old_table, recursive=True))
+        size = os.path.getsize(os.path.join(tmp_dir, entry["file"]))
+        print(f"{'snapshot':<14}{size / 1024**2:>8.1f} MB")
+        snapshot_table = measure("load", lambda: store.load(entry["id"]))
+
+    diff = measure("diff", lambda: diff_scans(snapshot_table, new_table))
+    print(
+        f"changes:      {diff.summary['added']:,} added, "
+        f"{diff.summary['removed']:,} removed, {diff.summary['resized']:,} resized, "
+        f"{diff.folders.height:,} folders"
+    )
+
+
+if __name__ == "__main__":
+    main()
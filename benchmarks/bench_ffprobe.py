@@ -0,0 +1,110 @@
+"""
+Compares one ffmpeg.probe call per file against the concurrent FFprobePool.
+
+Generates short test clips with ffmpeg unless --path points to existing media.
+
+Usage:
+    python benchmarks/bench_ffprobe.py --clips 200 --concurrency 8 --repeat 3
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+
+import ffmpeg
+
+from kittyscope.models.ffprobe_pool import DEFAULT_CONCURRENCY, FFprobePool
+
+CLIP_EXTENSIONS = [".mp4", ".mkv", ".mp3", ".wav"]
+
+
+def generate_clips(root: str, clips: int, ffmpeg_cmd: str) -> list[str]:
+    """
+    Generates one second test clips, alternating video and audio containers.
+    """
+    paths = []
+    for index in range(clips):
+        extension = CLIP_EXTENSIONS[index % len(CLIP_EXTENSIONS)]
+        path = os.path.join(root, f"clip_{index}{extension}")
+        inputs = ["-f", "lavfi", "-i", "sine=frequency=440:duration=1"]
+        if extension in (".mp4", ".mkv"):
+            inputs += ["-f", "lavfi", "-i", "testsrc=duration=1:size=160x120:rate=10"]
+        subprocess.run(
+            [ffmpeg_cmd, "-v", "error", "-y", *inputs, "-shortest", path], check=True
+        )
+        paths.append(path)
+    return paths
+
+
+def list_media(root: str) -> list[str]:
+    return [
+        os.path.join(root, name)
+        for name in sorted(os.listdir(root))
+        if os.path.splitext(name)[1].lower() in CLIP_EXTENSIONS
+    ]
+
+
+def one_shot(paths: list[str]) -> list[dict]:
+    """
+    The original VideoResearcher and AudioResearcher path.
+    """
+    return [ffmpeg.probe(path).get("format", None) for path in paths]
+
+
+def pooled(paths: list[str], concurrency: int, format_only: bool) -> list[dict]:
+    pool = FFprobePool(max_concurrency=concurrency, format_only=format_only)
+    return [probe["format"] for probe in pool.probe_many(paths)]
+
+
+def measure(function, repeat: int) -> float:
+    """
+    Returns the best wall time of several runs of the given function.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clips", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--ffmpeg", default="ffmpeg", help="The ffmpeg executable")
+    parser.add_argument(
+        "--path", help="Probe existing media instead of generated clips"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.path:
+            paths = list_media(args.path)
+        else:
+            paths = generate_clips(tmp_dir, args.clips, args.ffmpeg)
+
+        expected = one_shot(paths)
+        actual = pooled(paths, args.concurrency, format_only=True)
+        assert expected == actual, "probes disagree"
+
+        one_shot_time = measure(lambda: one_shot(paths), args.repeat)
+        full_time = measure(
+            lambda: pooled(paths, args.concurrency, format_only=False), args.repeat
+        )
+        format_time = measure(
+            lambda: pooled(paths, args.concurrency, format_only=True), args.repeat
+        )
+
+    print(f"files:             {len(paths)}")
+    print(f"one-shot:          {one_shot_time:.4f} s")
+    print(f"pool:              {full_time:.4f} s")
+    print(f"pool format only:  {format_time:.4f} s")
+    print(f"speedup:           {one_shot_time / format_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measures the peak memory of a recursive scan against the size of its table.
+
+Every scan runs in a fresh interpreter, so the peak RSS only covers one crawl.
+The baseline is the RSS of the interpreter after importing the scanner.
+
+Usage:
+    python benchmarks/bench_memory.py --files 200000 --folders 2000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+CHILD_SCRIPT = """
+import json, resource, sys, time
+from kittyscope.models.crawler import TreeCrawler
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+table = TreeCrawler().crawl(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "entries": table.height,
+    "seconds": elapsed,
+    "table_mb": table.estimated_size("mb"),
+    "peak_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) / 1024,
+}))
+"""
+
+
+def build_tree(root: str, files: int, folders: int) -> None:
+    """
+    Creates a tree of empty files spread over nested folders.
+    """
+    folder_paths = []
+    for index in range(folders):
+        parent = folder_paths[index // 10] if index >= 10 else root
+        folder_path = os.path.join(parent, f"folder_{index}")
+        os.mkdir(folder_path)
+        folder_paths.append(folder_path)
+    for index in range(files):
+        folder_path = folder_paths[index % folders] if folders else root
+        open(os.path.join(folder_path, f"file_{index}.txt"), "wb").close()
+
+
+def measure_crawl(path: str) -> dict:
+    """
+    Crawls a tree in a fresh interpreter.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, path],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=200000)
+    parser.add_argument("--folders", type=int, default=2000)
+    parser.add_argument(
+        "--path", help="Scan an existing directory instead of a synthetic one"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = args.path or tmp_dir
+        if not args.path:
+            build_tree(path, args.files, args.folders)
+        result = measure_crawl(path)
+
+    print(f"entries:      {result['entries']}")
+    print(f"crawl:        {result['seconds']:.2f} s")
+    print(f"table:        {result['table_mb']:.1f} MB")
+    print(f"peak RSS:     {result['peak_mb']:.1f} MB above the baseline")
+    print(f"peak / table: {result['peak_mb'] / result['table_mb']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
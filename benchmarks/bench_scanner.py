@@ -0,0 +1,119 @@
+"""
+Compares the scandir-based scanner against the original per-entry stat path.
+
+Usage:
+    python benchmarks/bench_scanner.py --files 20000 --folders 200 --repeat 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+from os import listdir
+from os.path import getatime, getmtime, getsize
+from pathlib import Path
+
+import polars as pl
+
+from kittyscope.models.scanner import scan_directory
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+COMPARED_COLUMNS = ["name", "type", "size", "extension"]
+EXTENSIONS = [".jpg", ".PNG", ".mp4", ".pdf", ".txt", ".tar", ".py", ""]
+
+
+def legacy_scan(path: str) -> pl.DataFrame:
+    """
+    The original Finder.create_results_dataframe implementation.
+    """
+    path = Path(path)
+    if listdir(path) == []:
+        raise Exception("Directory is empty")
+
+    elements_info = []
+    for element in path.iterdir():
+        if element.is_file():
+            element_type = "file"
+        elif element.is_dir():
+            element_type = "folder"
+        else:
+            element_type = "unknown"
+
+        elements_info.append(
+            {
+                "name": element.name,
+                "type": element_type,
+                "size": getsize(element),
+                "extension": element.suffix.lower() if len(element.suffix) > 0 else "-",
+                "last_access": datetime.fromtimestamp(getatime(element)).strftime(
+                    DATETIME_FORMAT
+                ),
+                "last_modification": datetime.fromtimestamp(getmtime(element)).strftime(
+                    DATETIME_FORMAT
+                ),
+            }
+        )
+
+    return pl.DataFrame(elements_info)
+
+
+def build_tree(root: str, files: int, folders: int) -> None:
+    """
+    Creates a flat synthetic directory with the given number of files and folders.
+    """
+    for index in range(files):
+        extension = EXTENSIONS[index % len(EXTENSIONS)]
+        with open(os.path.join(root, f"file_{index}{extension}"), "wb") as f:
+            f.write(b"x" * (index % 4096))
+    for index in range(folders):
+        os.mkdir(os.path.join(root, f"folder_{index}"))
+
+
+def measure(function, path: str, repeat: int) -> float:
+    """
+    Returns the best wall time of several runs of the given scan function.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--folders", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--path", help="Scan an existing directory instead of a synthetic one"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = args.path or tmp_dir
+        if not args.path:
+            build_tree(path, args.files, args.folders)
+
+        expected = legacy_scan(path).select(COMPARED_COLUMNS).sort("name")
+        actual = (
+            scan_directory(path)
+            .select(COMPARED_COLUMNS)
+            .with_columns(pl.col("type", "extension").cast(pl.String))
+            .sort("name")
+        )
+        assert expected.equals(actual), "scanners disagree"
+
+        legacy_time = measure(legacy_scan, path, args.repeat)
+        scandir_time = measure(scan_directory, path, args.repeat)
+
+    print(f"entries:  {actual.height}")
+    print(f"legacy:   {legacy_time:.4f} s")
+    print(f"scandir:  {scandir_time:.4f} s")
+    print(f"speedup:  {legacy_time / scandir_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measures the import time and memory of the headless and GUI entry points.
+
+Every import runs in a fresh interpreter, so nothing is cached between runs.
+The report also lists which heavy dependencies each entry point loads.
+
+Usage:
+    python benchmarks/bench_startup.py --repeat 5
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+ENTRY_POINTS = {
+    "finder (headless)": "kittyscope.models.finder",
+    "research router (headless)": "kittyscope.models.research_router",
+    "cli (headless)": "kittyscope.cli",
+    "main dialog (GUI)": "kittyscope.widgets.main_dialog",
+}
+HEAVY_MODULES = ["PySide6", "PIL", "pypdf", "ffmpeg"]
+
+CHILD_SCRIPT = """
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure_import(module: str) -> dict:
+    """
+    Imports a module in a fresh interpreter.
+    """
+    script = CHILD_SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'entry point':<28}{'import (s)':>12}{'max RSS (MB)':>14}  loaded")
+    for name, module in ENTRY_POINTS.items():
+        runs = [measure_import(module) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run["seconds"])
+        print(
+            f"{name:<28}{best['seconds']:>12.3f}"
+            f"{best['max_rss_kb'] / 1024:>14.1f}  {', '.join(best['loaded']) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+__all__ = ["App"]
+
+
+def __getattr__(name: str):
+    # The GUI is imported on first use, so the command line interface and the
+    # models can be used without Qt
+    if name == "App":
+        from .app import App
+
+        return App
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
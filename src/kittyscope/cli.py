@@ -0,0 +1,464 @@
+"""
+Scans folders and prints or writes reports without starting the GUI.
+
+Nothing here imports Qt, so the scanner runs on servers and from cron.
+
+Usage:
+    kittyscope-cli /data /backup --recursive --report report.json --output results.parquet
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import TextIO
+
+import polars as pl
+
+from kittyscope.models.analyzer import DEFAULT_TOP_N, Analyzer
+from kittyscope.models.crawler import DEFAULT_MAX_WORKERS
+from kittyscope.models.duplicate_finder import get_duplicate_groups
+from kittyscope.models.exporter import EXPORT_FORMATS, export_table
+from kittyscope.models.finder import Finder
+from kittyscope.models.scan_cache import ScanCache
+from kittyscope.models.scan_diff import CHANGE_TYPES, ScanDiff
+from kittyscope.models.scanner import concat_tables
+from kittyscope.models.snapshots import DEFAULT_SNAPSHOT_DIR, SnapshotStore
+
+SIZE_UNITS = ["B", "KB", "MB", "GB", "TB", "PB"]
+LATEST_SNAPSHOT = "latest"
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """
+    Creates the parser of the command line arguments.
+
+    Returns:
+        argparse.ArgumentParser: The argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="kittyscope-cli",
+        description="Scans folders and reports their size and content.",
+    )
+    parser.add_argument("paths", nargs="+", help="The folders to scan")
+    parser.add_argument(
+        "-r", "--recursive", action="store_true", help="Crawl the whole trees"
+    )
+    parser.add_argument(
+        "--max-depth", type=int, help="The deepest level listed by a recursive crawl"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="The number of threads crawling each tree",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="The number of folders scanned at once",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse and update the scan cache shared with the GUI",
+    )
+    parser.add_argument(
+        "--detect-types",
+        action="store_true",
+        help="Detect file types from the first bytes of the files",
+    )
+    parser.add_argument(
+        "--probe",
+        action="store_true",
+        help="Extract image, PDF, video and audio metadata into the results",
+    )
+    parser.add_argument(
+        "--duplicates", action="store_true", help="Find files with identical content"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP_N,
+        help="The number of largest files in the reports",
+    )
+    parser.add_argument(
+        "--age-column",
+        choices=["last_access", "last_modification"],
+        default="last_access",
+        help="The time the age buckets are based on",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Write the results of all folders to one table, with a root column",
+    )
+    parser.add_argument(
+        "--format",
+        choices=list(EXPORT_FORMATS),
+        help="The format of the output table. Defaults to the extension of --output",
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Save the results as a snapshot to compare later scans with",
+    )
+    parser.add_argument(
+        "--diff-since",
+        metavar="SNAPSHOT",
+        help=f'Compare the results with a snapshot id, or "{LATEST_SNAPSHOT}" for '
+        "the latest snapshot taken with the same options",
+    )
+    parser.add_argument(
+        "--diff-output",
+        help="Write the changed entries of all folders to one table, with a root column",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        default=DEFAULT_SNAPSHOT_DIR,
+        help="The folder holding the snapshots",
+    )
+    parser.add_argument(
+        "--report", help='Write the reports as JSON to a file, or to stdout with "-"'
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Do not print the summaries"
+    )
+    return parser
+
+
+def format_size(size: int | None) -> str:
+    """
+    Formats a number of bytes with a binary unit.
+
+    Args:
+        size (int | None): The number of bytes.
+
+    Returns:
+        str: The size like "1.5 MB", or "-" if it is unknown.
+    """
+    if size is None:
+        return "-"
+
+    value = float(size)
+    for unit in SIZE_UNITS:
+        if abs(value) < 1024 or unit == SIZE_UNITS[-1]:
+            break
+        value /= 1024
+    return f"{int(value)} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+
+
+def format_delta(delta: int) -> str:
+    """
+    Formats a change in bytes with its sign.
+
+    Args:
+        delta (int): The number of added bytes, negative if bytes were freed.
+
+    Returns:
+        str: The delta like "+1.5 MB" or "-12 B".
+    """
+    return ("-" if delta < 0 else "+") + format_size(abs(delta))
+
+
+def scan_path(path: str, args: argparse.Namespace, cache: ScanCache | None) -> Finder:
+    """
+    Scans a folder and runs the optional type detection and probe.
+
+    Args:
+        path (str): The folder to scan.
+        args (argparse.Namespace): The parsed command line arguments.
+        cache (ScanCache | None): The scan cache, if enabled.
+
+    Raises:
+        Exception: If the folder cannot be scanned.
+
+    Returns:
+        Finder: The Finder holding the results table.
+    """
+    finder = Finder(
+        os.path.abspath(path),
+        recursive=args.recursive,
+        max_depth=args.max_depth,
+        max_workers=args.workers,
+        cache=cache,
+    )
+    if args.detect_types:
+        finder.detect_types()
+    if args.probe:
+        finder.probe_media()
+    return finder
+
+
+def get_report(finder: Finder, args: argparse.Namespace) -> dict:
+    """
+    Calculates the report of a scanned folder.
+
+    Args:
+        finder (Finder): The Finder holding the results table.
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        dict: The totals of the folder and the Analyzer capacity report.
+    """
+    analyzer = Analyzer()
+    type_stat = analyzer.get_type_stat(finder.results_table)["type_stat"]
+    counts = dict(zip(type_stat["type"], type_stat["len"]))
+    report = {
+        "path": finder.path,
+        "recursive": finder.recursive,
+        "entries": finder.results_table.height,
+        "files": counts.get("file", 0),
+        "folders": counts.get("folder", 0),
+        **analyzer.get_capacity_report(
+            finder.results_table, n=args.top, age_column=args.age_column
+        ),
+    }
+    report["size"] = sum(report["file_type_bytes"]["size"])
+
+    if args.duplicates:
+        groups = get_duplicate_groups(finder.find_duplicates())
+        report["duplicates"] = {
+            "groups": groups.height,
+            "files": groups.get_column("count").sum(),
+            "wasted": groups.get_column("wasted").sum(),
+        }
+    return report
+
+
+def get_diff(
+    finder: Finder, args: argparse.Namespace, store: SnapshotStore
+) -> ScanDiff | None:
+    """
+    Compares the results of a scanned folder with the snapshot given by --diff-since.
+
+    Args:
+        finder (Finder): The Finder holding the results table.
+        args (argparse.Namespace): The parsed command line arguments.
+        store (SnapshotStore): The store holding the snapshots.
+
+    Raises:
+        Exception: If the snapshot does not exist.
+
+    Returns:
+        ScanDiff | None: The differences, or None if the latest snapshot was asked
+            for and the folder has none yet.
+    """
+    if args.diff_since != LATEST_SNAPSHOT:
+        return finder.diff_snapshot(args.diff_since, store)
+    if not store.get_snapshots(finder.path, finder.recursive, finder.max_depth):
+        print(
+            f"kittyscope-cli: {finder.path}: no snapshot to compare with yet",
+            file=sys.stderr,
+        )
+        return None
+    return finder.diff_snapshot(store=store)
+
+
+def get_diff_report(diff: ScanDiff, n: int = DEFAULT_TOP_N) -> dict:
+    """
+    Summarizes the differences with a snapshot for the JSON report.
+
+    Args:
+        diff (ScanDiff): The differences returned by get_diff.
+        n (int): The number of folders, file types and entries listed.
+
+    Returns:
+        dict: The diff summary and the n changes with the largest impact.
+    """
+    return {
+        **diff.summary,
+        "folders": diff.folders.head(n).to_dict(as_series=False),
+        "file_types": diff.file_types.head(n).to_dict(as_series=False),
+        "entries": diff.entries.head(n).to_dict(as_series=False),
+    }
+
+
+def print_summary(report: dict, file: TextIO = sys.stdout) -> None:
+    """
+    Prints a readable summary of a report.
+
+    Args:
+        report (dict): The report returned by get_report.
+        file (TextIO): The stream to print to.
+    """
+
+    def write(text: str = "") -> None:
+        print(text, file=file)
+
+    write(report["path"])
+    write(
+        f"  entries: {report['entries']:,} "
+        f"({report['files']:,} files, {report['folders']:,} folders)"
+    )
+    write(f"  size: {format_size(report['size'])}")
+
+    percentiles = report["size_percentiles"]
+    write(
+        "  file size "
+        + ", ".join(
+            f"{name}: {format_size(values[0])}" for name, values in percentiles.items()
+        )
+    )
+
+    file_type_bytes = report["file_type_bytes"]
+    write("  by file type:")
+    for file_type, count, size, share in zip(*file_type_bytes.values()):
+        write(
+            f"    {file_type or 'other':<12}{count:>10,} files"
+            f"{format_size(size):>12}{share:>8.1%}"
+        )
+
+    write("  by age:")
+    age_buckets = report["age_buckets"]
+    for age, count, size in zip(*age_buckets.values()):
+        write(f"    {age:<16}{count:>10,} files{format_size(size):>12}")
+
+    largest_files = report["largest_files"]
+    write("  largest files:")
+    parents = largest_files.get("parent", [None] * len(largest_files["name"]))
+    for parent, name, size in zip(
+        parents, largest_files["name"], largest_files["size"]
+    ):
+        path = name if parent in (None, ".") else os.path.join(parent, name)
+        write(f"    {format_size(size):>10}  {path}")
+
+    if "duplicates" in report:
+        duplicates = report["duplicates"]
+        write(
+            f"  duplicates: {duplicates['files']:,} files in "
+            f"{duplicates['groups']:,} groups, "
+            f"{format_size(duplicates['wasted'])} wasted"
+        )
+
+    if "diff" in report:
+        diff = report["diff"]
+        write(
+            f"  since snapshot: {format_delta(diff['delta'])} "
+            + ", ".join(
+                f"{diff[change]:,} {change}" for change in CHANGE_TYPES.categories
+            )
+        )
+        write("  growth by folder:")
+        for path, delta in zip(diff["folders"]["path"], diff["folders"]["delta"]):
+            write(f"    {format_delta(delta):>12}  {path}")
+        write("  growth by file type:")
+        file_types = diff["file_types"]
+        for file_type, delta in zip(file_types["file_type"], file_types["delta"]):
+            if delta == 0:
+                continue
+            write(f"    {file_type or 'other':<12}{format_delta(delta):>12}")
+    write()
+
+
+def write_results(finders: list[Finder], path: str, export_format: str | None) -> int:
+    """
+    Writes the results tables of all scanned folders to one file.
+
+    Args:
+        finders (list[Finder]): The Finders holding the results tables.
+        path (str): The path of the output file.
+        export_format (str | None): The format of the file, or None to pick it by
+            the extension of the path.
+
+    Returns:
+        int: The number of written rows.
+    """
+    table = concat_tables(
+        [
+            finder.results_table.select(pl.lit(finder.path).alias("root"), pl.all())
+            for finder in finders
+        ],
+        how="diagonal_relaxed",
+    )
+    return export_table(table, path, export_format=export_format)
+
+
+def write_diffs(
+    diffs: list[tuple[Finder, ScanDiff]], path: str, export_format: str | None
+) -> int:
+    """
+    Writes the changed entries of all compared folders to one file.
+
+    Args:
+        diffs (list[tuple[Finder, ScanDiff]]): The Finders and their differences.
+        path (str): The path of the output file.
+        export_format (str | None): The format of the file, or None to pick it by
+            the extension of the path.
+
+    Returns:
+        int: The number of written rows.
+    """
+    table = concat_tables(
+        [
+            diff.entries.select(pl.lit(finder.path).alias("root"), pl.all())
+            for finder, diff in diffs
+        ]
+    )
+    return export_table(table, path, export_format=export_format)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Runs the command line interface.
+
+    Folders that cannot be scanned are reported on stderr and skipped. Folders
+    are compared with --diff-since before --snapshot saves their new snapshot.
+
+    Args:
+        argv (list[str] | None): The arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit code, 1 if any folder could not be scanned.
+    """
+    args = create_parser().parse_args(argv)
+    cache = ScanCache() if args.cache else None
+    store = SnapshotStore(args.snapshot_dir)
+
+    def run(path: str) -> tuple[Finder | None, dict | None, ScanDiff | None]:
+        try:
+            finder = scan_path(path, args, cache)
+            report = get_report(finder, args)
+            diff = get_diff(finder, args, store) if args.diff_since else None
+            if diff is not None:
+                report["diff"] = get_diff_report(diff, args.top)
+            if args.snapshot:
+                report["snapshot"] = finder.save_snapshot(store)["id"]
+            return finder, report, diff
+        except Exception as e:
+            print(f"kittyscope-cli: {path}: {e}", file=sys.stderr)
+            return None, None, None
+
+    with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as executor:
+        results = list(executor.map(run, args.paths))
+
+    finders = [finder for finder, _, _ in results if finder is not None]
+    reports = [report for _, report, _ in results if report is not None]
+    diffs = [(finder, diff) for finder, _, diff in results if diff is not None]
+
+    if not args.quiet and args.report != "-":
+        for report in reports:
+            print_summary(report)
+
+    if args.report:
+        text = json.dumps(reports, indent=2, default=str)
+        if args.report == "-":
+            print(text)
+        else:
+            with open(args.report, "w", encoding="utf-8") as f:
+                f.write(text)
+
+    if args.output and finders:
+        write_results(finders, args.output, args.format)
+
+    if args.diff_output and diffs:
+        write_diffs(diffs, args.diff_output, args.format)
+
+    return 0 if len(finders) == len(args.paths) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
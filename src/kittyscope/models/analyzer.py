@@ -1,33 +1,41 @@
+from datetime import datetime, timezone
+
 import polars as pl
 
-from kittyscope.utils import EXTENSION_TYPE_MAPPING
+from .scanner import to_scan_time
 
-EXTENSION_TYPE_MAPPING_DF = pl.DataFrame(
-    {
-        "extension": list(EXTENSION_TYPE_MAPPING.keys()),
-        "file_type": list(EXTENSION_TYPE_MAPPING.values()),
-    }
-)
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+DEFAULT_TOP_N = 10
+DEFAULT_AGE_BREAKS = (30, 90, 180, 365, 730)
+UNKNOWN_AGE = "unknown"
 
 
 class Analyzer:
-    def get_type_stat(self, df: pl.DataFrame) -> dict[str, dict[str, list]]:
+    def get_type_stat(
+        self, df: pl.DataFrame | pl.LazyFrame
+    ) -> dict[str, dict[str, list]]:
         """
         Calculates statistics for the given DataFrame by grouping data based on type and extension.
 
+        Both aggregations are collected together, so a lazy query is computed once.
+
         Args:
-            df (pl.DataFrame): The DataFrame containing file information with columns "type" and "extension".
+            df (pl.DataFrame | pl.LazyFrame): The DataFrame containing file information with columns "type" and "extension".
 
         Returns:
             dict[str, dict[str, list]]: A dictionary containing two keys:
                 - "type_stat": A dictionary with the count of entries for each file type.
                 - "extension_stat": A dictionary with the count of entries for each file extension.
         """
-        df_type_stat = df.group_by("type").len()
-        df_extension_stat = (
-            df.filter(pl.col("type") == "file", pl.col("extension").is_not_null())
-            .group_by("extension")
-            .len()
+        lf = df.lazy()
+        df_type_stat, df_extension_stat = pl.collect_all(
+            [
+                lf.group_by("type").len(),
+                lf.filter(pl.col("type") == "file", pl.col("extension").is_not_null())
+                .group_by("extension")
+                .len()
+                .with_columns(pl.col("extension").cast(pl.String)),
+            ]
         )
 
         stat_data = {
@@ -37,25 +45,262 @@ class Analyzer:
 
         return stat_data
 
-    def get_file_type_stat(self, df: pl.DataFrame):
+    def get_file_type_counts(self, df: pl.DataFrame | pl.LazyFrame) -> pl.LazyFrame:
+        """
+        Builds the lazy aggregation behind get_file_type_stat.
+
+        Args:
+            df (pl.DataFrame | pl.LazyFrame): The DataFrame or query containing file
+                information with the categorical "file_type" column.
+
+        Returns:
+            pl.LazyFrame: The "file_type" and "count" of every file type.
+        """
+        return (
+            df.lazy()
+            .filter(pl.col("file_type").is_not_null())
+            .group_by("file_type")
+            .len(name="count")
+            .with_columns(pl.col("file_type").cast(pl.String))
+        )
+
+    def get_file_type_stat(self, df: pl.DataFrame | pl.LazyFrame):
         """
         Calculates the count of entries for each file type in the given DataFrame.
 
+        Entries with an unknown extension have no file type and are not counted.
+
+        Args:
+            df (pl.DataFrame | pl.LazyFrame): The DataFrame containing file information
+                with the categorical "file_type" column classified at scan time.
+
+        Returns:
+            dict[str, list]: A dictionary with the count of entries for each file type.
+        """
+        stat_data = self.get_file_type_counts(df).collect().to_dict(as_series=False)
+        stat_data["group_count"] = len(stat_data["file_type"])
+
+        return stat_data
+
+    def update_file_type_stat(
+        self, stat_data: dict, added: pl.DataFrame, removed: pl.DataFrame
+    ) -> dict:
+        """
+        Updates file type counts with added and removed entries instead of recounting.
+
         Args:
-            df (pl.DataFrame): The DataFrame containing file information with columns "extension".
+            stat_data (dict): The statistics returned by get_file_type_stat.
+            added (pl.DataFrame): The entries added since stat_data was calculated.
+            removed (pl.DataFrame): The entries removed since stat_data was calculated.
 
         Returns:
             dict[str, list]: A dictionary with the count of entries for each file type.
         """
-        df_with_file_types = df.join(
-            EXTENSION_TYPE_MAPPING_DF, on="extension", how="inner"
+        counts = dict(zip(stat_data["file_type"], stat_data["count"]))
+        for rows, sign in ((added, 1), (removed, -1)):
+            if rows.is_empty():
+                continue
+            rows_stat = self.get_file_type_stat(rows)
+            for file_type, count in zip(rows_stat["file_type"], rows_stat["count"]):
+                counts[file_type] = counts.get(file_type, 0) + sign * count
+
+        counts = {file_type: count for file_type, count in counts.items() if count > 0}
+        return {
+            "file_type": list(counts.keys()),
+            "count": list(counts.values()),
+            "group_count": len(counts),
+        }
+
+    def get_bytes_by(
+        self, df: pl.DataFrame | pl.LazyFrame, column: str = "file_type"
+    ) -> pl.LazyFrame:
+        """
+        Builds the byte-weighted totals of the files grouped by a column.
+
+        Folders are left out, because their sizes already include the files.
+
+        Args:
+            df (pl.DataFrame | pl.LazyFrame): The results table or query.
+            column (str): The column to group by, like "file_type" or "extension".
+
+        Returns:
+            pl.LazyFrame: The "count", "size" and "size_share" of every group,
+                largest first.
+        """
+        return (
+            self.__files(df)
+            .group_by(pl.col(column).cast(pl.String))
+            .agg(pl.len().alias("count"), pl.col("size").sum().alias("size"))
+            .with_columns(
+                (pl.col("size") / pl.col("size").sum()).fill_nan(0).alias("size_share")
+            )
+            .sort("size", column, descending=[True, False], nulls_last=True)
         )
 
-        stat_data = (
-            df_with_file_types.group_by("file_type")
-            .len(name="count")
-            .to_dict(as_series=False)
+    def get_size_histogram(self, df: pl.DataFrame | pl.LazyFrame) -> pl.LazyFrame:
+        """
+        Builds a histogram of the file sizes in powers of two.
+
+        Bucket 0 holds the empty files, and bucket n > 0 holds the sizes from
+        2 ** (n - 1) up to, but excluding, 2 ** n bytes.
+
+        Args:
+            df (pl.DataFrame | pl.LazyFrame): The results table or query.
+
+        Returns:
+            pl.LazyFrame: The "bucket", "min_size", "max_size", "count" and total
+                "size" of every non-empty bucket, in size order.
+        """
+        bucket = (
+            pl.when(pl.col("size") > 0)
+            .then(pl.col("size").clip(1).log(2).floor().cast(pl.Int64) + 1)
+            .otherwise(0)
+            .alias("bucket")
+        )
+        power = pl.lit(2, dtype=pl.Int64).pow((pl.col("bucket") - 1).clip(0))
+        return (
+            self.__files(df)
+            .filter(pl.col("size").is_not_null())
+            .group_by(bucket)
+            .agg(pl.len().alias("count"), pl.col("size").sum().alias("size"))
+            .sort("bucket")
+            .select(
+                "bucket",
+                pl.when(pl.col("bucket") > 0)
+                .then(power)
+                .otherwise(0)
+                .alias("min_size"),
+                pl.when(pl.col("bucket") > 0)
+                .then(power * 2)
+                .otherwise(1)
+                .alias("max_size"),
+                "count",
+                "size",
+            )
         )
-        stat_data["group_count"] = len(stat_data["file_type"])
 
-        return stat_data
+    def get_size_percentiles(
+        self,
+        df: pl.DataFrame | pl.LazyFrame,
+        quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+    ) -> pl.LazyFrame:
+        """
+        Builds the percentiles of the file sizes.
+
+        Args:
+            df (pl.DataFrame | pl.LazyFrame): The results table or query.
+            quantiles (tuple[float, ...]): The quantiles between 0 and 1.
+
+        Returns:
+            pl.LazyFrame: A single row with a column like "p50" per quantile,
+                holding the size of an actual file.
+        """
+        return self.__files(df).select(
+            pl.col("size")
+            .quantile(quantile, interpolation="nearest")
+            .cast(pl.Int64)
+            .alias(f"p{quantile * 100:g}")
+            for quantile in quantiles
+        )
+
+    def get_largest_files(
+        self, df: pl.DataFrame | pl.LazyFrame, n: int = DEFAULT_TOP_N
+    ) -> pl.LazyFrame:
+        """
+        Builds the list of the largest files without sorting the whole table.
+
+        Args:
+            df (pl.DataFrame | pl.LazyFrame): The results table or query.
+            n (int): The number of files.
+
+        Returns:
+            pl.LazyFrame: The rows of the n largest files, largest first.
+        """
+        return self.__files(df).top_k(n, by="size")
+
+    def get_age_buckets(
+        self,
+        df: pl.DataFrame | pl.LazyFrame,
+        column: str = "last_access",
+        now: datetime | None = None,
+        breaks: tuple[int, ...] = DEFAULT_AGE_BREAKS,
+    ) -> pl.LazyFrame:
+        """
+        Builds the count and bytes of the files grouped by the age of a time column.
+
+        Args:
+            df (pl.DataFrame | pl.LazyFrame): The results table or query.
+            column (str): The time column, "last_access" or "last_modification".
+            now (datetime | None): The moment ages are measured from. Defaults to now.
+            breaks (tuple[int, ...]): The increasing bucket bounds in days.
+
+        Returns:
+            pl.LazyFrame: The "age", "count" and "size" of every non-empty bucket,
+                from the newest to the oldest, with files without a time last.
+        """
+        now = to_scan_time(now or datetime.now(timezone.utc))
+        labels = [f"< {breaks[0]} days"]
+        labels += [f"{low}-{high} days" for low, high in zip(breaks, breaks[1:])]
+        labels += [f">= {breaks[-1]} days", UNKNOWN_AGE]
+
+        age = (
+            (pl.lit(now) - pl.col(column))
+            .dt.total_days()
+            .cut(list(breaks), labels=labels[:-1], left_closed=True)
+            .cast(pl.String)
+            .fill_null(UNKNOWN_AGE)
+            .cast(pl.Enum(labels))
+            .alias("age")
+        )
+        return (
+            self.__files(df)
+            .group_by(age)
+            .agg(pl.len().alias("count"), pl.col("size").sum().alias("size"))
+            .sort("age")
+            .with_columns(pl.col("age").cast(pl.String))
+        )
+
+    def get_capacity_report(
+        self,
+        df: pl.DataFrame | pl.LazyFrame,
+        n: int = DEFAULT_TOP_N,
+        age_column: str = "last_access",
+        now: datetime | None = None,
+    ) -> dict[str, dict[str, list]]:
+        """
+        Calculates the size and age distributions of the files.
+
+        All aggregations are collected together, so polars runs them in parallel
+        and computes shared parts of a lazy query once.
+
+        Args:
+            df (pl.DataFrame | pl.LazyFrame): The results table or query.
+            n (int): The number of largest files.
+            age_column (str): The time column of the age buckets.
+            now (datetime | None): The moment ages are measured from. Defaults to now.
+
+        Returns:
+            dict[str, dict[str, list]]: The results of get_bytes_by for
+                "file_type" and "extension", get_size_histogram,
+                get_size_percentiles, get_largest_files and get_age_buckets, under
+                the keys "file_type_bytes", "extension_bytes", "size_histogram",
+                "size_percentiles", "largest_files" and "age_buckets".
+        """
+        lf = df.lazy()
+        plans = {
+            "file_type_bytes": self.get_bytes_by(lf, "file_type"),
+            "extension_bytes": self.get_bytes_by(lf, "extension"),
+            "size_histogram": self.get_size_histogram(lf),
+            "size_percentiles": self.get_size_percentiles(lf),
+            "largest_files": self.get_largest_files(lf, n),
+            "age_buckets": self.get_age_buckets(lf, age_column, now),
+        }
+        results = pl.collect_all(list(plans.values()))
+        return {
+            key: result.to_dict(as_series=False)
+            for key, result in zip(plans.keys(), results)
+        }
+
+    @staticmethod
+    def __files(df: pl.DataFrame | pl.LazyFrame) -> pl.LazyFrame:
+        return df.lazy().filter(pl.col("type") == "file")
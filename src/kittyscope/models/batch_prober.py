@@ -0,0 +1,305 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable
+
+import polars as pl
+
+from .crawler import relative_path_expr
+from .ffprobe_pool import DEFAULT_CONCURRENCY, FFprobePool
+from .research_router import ResearchRouter
+from .scanner import ScanCancelled
+
+DEFAULT_PROBE_WORKERS = os.cpu_count() or 1
+PROBE_CHUNK_SIZE = 64
+MEDIA_CHUNK_SIZE = 256
+MEDIA_CHUNK_ROUNDS = 4
+CANCEL_POLL_INTERVAL = 0.1
+PROBED_FILE_TYPES = {"image", "video", "audio"}
+MEDIA_FILE_TYPES = {"video", "audio"}
+PROBED_EXTENSIONS = {".pdf"}
+RESEARCHED_FILE_TYPES = PROBED_FILE_TYPES | {"document"}
+
+PROBE_SCHEMA = {
+    "path": pl.String,
+    "media_type": pl.String,
+    "width": pl.Int64,
+    "height": pl.Int64,
+    "color_mode": pl.String,
+    "media_format": pl.String,
+    "duration": pl.Float64,
+    "bit_rate": pl.Int64,
+    "nb_streams": pl.Int64,
+    "pages_count": pl.Int64,
+    "author": pl.String,
+    "title": pl.String,
+    "probe_error": pl.String,
+}
+
+_research_router: ResearchRouter | None = None
+
+
+def get_probed_files(
+    results_table: pl.DataFrame, detected_types: pl.DataFrame | None = None
+) -> pl.DataFrame:
+    """
+    Returns the files that have a researcher, with the type they are routed by.
+
+    Files with a detected content type are routed by it, so misnamed files reach
+    the right researcher and readable text is never probed. The other files are
+    routed by their extension.
+
+    Args:
+        results_table (pl.DataFrame): The results table of a scan, which may have
+            a "detected_type" column.
+        detected_types (pl.DataFrame | None): The rows returned by sniff_files,
+            used instead of the "detected_type" column of the table.
+
+    Returns:
+        pl.DataFrame: The "path" relative to the scanned folder and the
+            "file_type" of every probed file.
+    """
+    path_expr = (
+        relative_path_expr() if "parent" in results_table.columns else pl.col("name")
+    )
+    files = (
+        results_table.lazy()
+        .filter(pl.col("type") == "file")
+        .with_columns(path_expr.alias("path"))
+    )
+    if detected_types is not None:
+        files = files.drop("detected_type", strict=False).join(
+            detected_types.lazy(), on="path", how="left"
+        )
+
+    if "detected_type" in files.collect_schema().names():
+        detected_type = pl.col("detected_type").cast(pl.String)
+    else:
+        detected_type = pl.lit(None, dtype=pl.String)
+    extension_type = (
+        pl.when(pl.col("extension").is_in(list(PROBED_EXTENSIONS)))
+        .then(pl.lit("document"))
+        .when(pl.col("file_type").is_in(list(PROBED_FILE_TYPES)))
+        .then(pl.col("file_type").cast(pl.String))
+    )
+    return (
+        files.select(
+            "path", pl.coalesce(detected_type, extension_type).alias("file_type")
+        )
+        .filter(pl.col("file_type").is_in(list(RESEARCHED_FILE_TYPES)))
+        .collect()
+    )
+
+
+def to_int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_float(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_text(value) -> str | None:
+    return None if value in (None, "", "-") else str(value)
+
+
+def flatten_file_info(tag: str, file_info: dict) -> dict:
+    """
+    Converts the output of a Researcher to typed PROBE_SCHEMA values.
+
+    Args:
+        tag (str): The tag returned by the researcher.
+        file_info (dict): The file information returned by the researcher.
+
+    Returns:
+        dict: The PROBE_SCHEMA values found in the file information.
+    """
+    match tag:
+        case "image":
+            common_info = file_info["common_info"]
+            return {
+                "width": to_int(common_info.get("width")),
+                "height": to_int(common_info.get("height")),
+                "color_mode": to_text(common_info.get("color_mode")),
+                "media_format": to_text(common_info.get("format")),
+            }
+        case "pdf":
+            return {
+                "pages_count": to_int(file_info.get("pages_count")),
+                "author": to_text(file_info.get("author")),
+                "title": to_text(file_info.get("title")),
+                "media_format": "PDF",
+            }
+        case "video" | "audio":
+            file_info = file_info or {}
+            return {
+                "duration": to_float(file_info.get("duration")),
+                "bit_rate": to_int(file_info.get("bit_rate")),
+                "nb_streams": to_int(file_info.get("nb_streams")),
+                "media_format": to_text(file_info.get("format_name")),
+                "title": to_text((file_info.get("tags") or {}).get("title")),
+            }
+        case _:
+            return {}
+
+
+def get_probe_rows(
+    relative_paths: list[str], files_info: list[tuple[str, dict] | Exception | None]
+) -> list[dict]:
+    """
+    Converts Researcher results to PROBE_SCHEMA rows.
+
+    Args:
+        relative_paths (list[str]): The probed files relative to the scanned folder.
+        files_info (list[tuple[str, dict] | Exception | None]): The results of
+            ResearchRouter.get_files_info.
+
+    Returns:
+        list[dict]: One PROBE_SCHEMA row per file.
+    """
+    rows = []
+    for relative_path, file_info in zip(relative_paths, files_info):
+        row = {"path": relative_path}
+        if isinstance(file_info, Exception):
+            row["probe_error"] = file_info.__str__() or type(file_info).__name__
+        elif file_info is not None:
+            tag, info = file_info
+            row["media_type"] = tag
+            try:
+                row.update(flatten_file_info(tag, info))
+            except Exception as e:
+                row["probe_error"] = e.__str__() or type(e).__name__
+        rows.append(row)
+    return rows
+
+
+def probe_chunk(
+    root: str, relative_paths: list[str], file_types: list[str]
+) -> list[dict]:
+    """
+    Probes a chunk of files in a worker process.
+
+    Every process keeps its own ResearchRouter between chunks.
+
+    Args:
+        root (str): The path to the scanned folder.
+        relative_paths (list[str]): The files relative to root.
+        file_types (list[str]): The types the files are routed by.
+
+    Returns:
+        list[dict]: One PROBE_SCHEMA row per file.
+    """
+    global _research_router
+    if _research_router is None:
+        _research_router = ResearchRouter()
+
+    files_info = _research_router.get_files_info(
+        [os.path.join(root, relative_path) for relative_path in relative_paths],
+        file_types,
+    )
+    return get_probe_rows(relative_paths, files_info)
+
+
+def probe_files(
+    root: str,
+    results_table: pl.DataFrame,
+    max_workers: int = DEFAULT_PROBE_WORKERS,
+    max_ffprobe_processes: int = DEFAULT_CONCURRENCY,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel_event: threading.Event | None = None,
+    detected_types: pl.DataFrame | None = None,
+) -> pl.DataFrame:
+    """
+    Extracts media metadata of every supported file.
+
+    Images and PDF files are parsed on a process pool. Video and audio files are
+    probed meanwhile from the calling thread by an FFprobePool, since the work
+    happens in the ffprobe processes anyway. Files are routed as returned by
+    get_probed_files.
+
+    The pool spawns its processes instead of forking, because the caller runs
+    threads of its own, like a QThread or the polars thread pool, and forking a
+    multi-threaded process may deadlock the child. Media files are probed in
+    chunks of a few rounds of ffprobe processes and the pool is polled, so a
+    cancellation is noticed without waiting for a whole chunk. Once cancelled,
+    the chunks still running in the pool finish in the background.
+
+    Args:
+        root (str): The path to the scanned folder.
+        results_table (pl.DataFrame): The results table of the scan.
+        max_workers (int): The number of worker processes.
+        max_ffprobe_processes (int): The maximal number of running ffprobe processes.
+        on_progress (Callable[[int, int], None] | None): A callback receiving the
+            number of probed files and the total number of files.
+        cancel_event (threading.Event | None): An event that cancels probing when set.
+        detected_types (pl.DataFrame | None): The rows returned by sniff_files, if
+            the table has no "detected_type" column yet.
+
+    Raises:
+        ScanCancelled: If probing was cancelled.
+
+    Returns:
+        pl.DataFrame: One PROBE_SCHEMA row per probed file.
+    """
+    probed_files = get_probed_files(results_table, detected_types)
+    is_media = pl.col("file_type").is_in(list(MEDIA_FILE_TYPES))
+    media_files = probed_files.filter(is_media)
+    other_files = probed_files.filter(~is_media)
+
+    rows = []
+
+    def check_cancelled() -> None:
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScanCancelled("Probing cancelled")
+
+    def add_rows(new_rows: list[dict]) -> None:
+        check_cancelled()
+        rows.extend(new_rows)
+        if on_progress is not None:
+            on_progress(len(rows), probed_files.height)
+
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        pending = {
+            executor.submit(
+                probe_chunk, root, chunk["path"].to_list(), chunk["file_type"].to_list()
+            )
+            for chunk in other_files.iter_slices(PROBE_CHUNK_SIZE)
+        }
+
+        research_router = ResearchRouter(
+            ffprobe_pool=FFprobePool(max_concurrency=max_ffprobe_processes)
+        )
+        media_chunk_size = min(
+            MEDIA_CHUNK_SIZE, max_ffprobe_processes * MEDIA_CHUNK_ROUNDS
+        )
+        for chunk in media_files.iter_slices(media_chunk_size):
+            check_cancelled()
+            relative_paths = chunk["path"].to_list()
+            files_info = research_router.get_files_info(
+                [os.path.join(root, relative_path) for relative_path in relative_paths],
+                chunk["file_type"].to_list(),
+            )
+            add_rows(get_probe_rows(relative_paths, files_info))
+
+        while pending:
+            check_cancelled()
+            done, pending = wait(
+                pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                add_rows(future.result())
+    finally:
+        cancelled = cancel_event is not None and cancel_event.is_set()
+        executor.shutdown(wait=not cancelled, cancel_futures=True)
+
+    return pl.DataFrame(rows, schema=PROBE_SCHEMA)
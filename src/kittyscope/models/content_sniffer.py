@@ -0,0 +1,234 @@
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable
+
+import polars as pl
+
+from .crawler import relative_path_expr
+from .scanner import FILE_TYPES, ScanCancelled
+
+DEFAULT_SNIFF_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+SNIFF_SIZE = 64
+SNIFF_CHUNK_SIZE = 1024
+TEXT_TYPE = "text"
+PE_OFFSET_POSITION = 0x3C
+PE_SIGNATURE = b"PE\x00\x00"
+MAX_PE_OFFSET = 0x10000
+UTF8_BOM = b"\xef\xbb\xbf"
+TEXT_BOMS = (UTF8_BOM, b"\xff\xfe", b"\xfe\xff")
+DETECTED_TYPES = pl.Enum(sorted([*FILE_TYPES.categories, TEXT_TYPE]))
+
+# Signatures are tried in order, so the more specific ones come first. The only
+# document signature is PDF, so a detected "document" can always be researched.
+# Windows executables only start with "MZ", like many text files, so they are
+# checked by is_portable_executable instead. MIDI is "data" since ffprobe cannot
+# read it. The MPEG sync excludes "\xff\xfe" and "\xff\xff", which start text
+# with a UTF-16 byte order mark and blank flash images.
+MARKUP_SIGNATURES = [
+    ("data", rb"\s*<\?xml"),
+    ("web", rb"\s*<(?i:!doctype html|html|head|body)"),
+]
+SIGNATURES = [
+    ("image", rb"\x89PNG\r\n\x1a\n"),
+    ("image", rb"\xff\xd8\xff"),
+    ("image", rb"GIF8[79]a"),
+    ("image", rb"BM.{4}\x00\x00\x00\x00"),
+    ("image", rb"II\*\x00|MM\x00\*"),
+    ("image", rb"RIFF.{4}WEBP"),
+    ("image", rb".{4}ftyp(?:avif|avis|heic|heix|hevc|mif1|msf1)"),
+    ("audio", rb".{4}ftyp(?:M4A |M4B |M4P )"),
+    ("video", rb".{4}ftyp"),
+    ("video", rb"\x1a\x45\xdf\xa3"),
+    ("video", rb"RIFF.{4}AVI "),
+    ("video", rb"FLV\x01"),
+    ("video", rb"\x00\x00\x01[\xb3\xba]"),
+    ("video", rb"\x30\x26\xb2\x75\x8e\x66\xcf\x11"),
+    ("audio", rb"RIFF.{4}WAVE"),
+    ("audio", rb"FORM.{4}AIF[FC]"),
+    ("audio", rb"ID3|fLaC|OggS"),
+    ("audio", rb"\xff[\xe2-\xe7\xf0-\xfd]"),
+    ("document", rb"%PDF-"),
+    ("archive", rb"PK\x03\x04|PK\x05\x06|PK\x07\x08"),
+    ("archive", rb"\x1f\x8b|BZh[1-9]|\xfd7zXZ\x00|\x28\xb5\x2f\xfd"),
+    ("archive", rb"7z\xbc\xaf\x27\x1c|Rar!\x1a\x07"),
+    ("executable", rb"\x7fELF"),
+    ("executable", rb"\xca\xfe\xba\xbe|\xcf\xfa\xed\xfe|\xce\xfa\xed\xfe"),
+    ("script", rb"#!"),
+    ("data", rb"SQLite format 3\x00|PAR1|MThd"),
+    *MARKUP_SIGNATURES,
+]
+
+
+def compile_signatures(signatures: list[tuple[str, bytes]]) -> re.Pattern[bytes]:
+    """
+    Compiles signatures into one pattern with a group named "s<index>" per signature.
+
+    Args:
+        signatures (list[tuple[str, bytes]]): The (type, regex) signatures.
+
+    Returns:
+        re.Pattern[bytes]: The pattern matching any of the signatures.
+    """
+    return re.compile(
+        b"|".join(
+            b"(?P<s%d>%s)" % (index, signature)
+            for index, (_, signature) in enumerate(signatures)
+        ),
+        re.DOTALL,
+    )
+
+
+SIGNATURE_PATTERN = compile_signatures(SIGNATURES)
+MARKUP_PATTERN = compile_signatures(MARKUP_SIGNATURES)
+BINARY_BYTES = re.compile(rb"[\x00-\x07\x0e-\x1a\x1c-\x1f]")
+
+
+def detect_type(head: bytes) -> str | None:
+    """
+    Detects the file type of a file from its first bytes.
+
+    Args:
+        head (bytes): The first SNIFF_SIZE bytes of the file.
+
+    Returns:
+        str | None: A DETECTED_TYPES value, "text" for readable content without
+            a known signature, or None if the content is empty or unknown.
+    """
+    # Text with a byte order mark can still be XML or HTML, but never binary.
+    if head.startswith(TEXT_BOMS):
+        match = MARKUP_PATTERN.match(head.removeprefix(UTF8_BOM))
+        if match is not None:
+            return MARKUP_SIGNATURES[int(match.lastgroup[1:])][0]
+        return TEXT_TYPE
+
+    match = SIGNATURE_PATTERN.match(head)
+    if match is not None:
+        return SIGNATURES[int(match.lastgroup[1:])][0]
+
+    if not head or BINARY_BYTES.search(head):
+        return None
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # The head may end in the middle of a multi-byte character.
+        if e.start < len(head) - 3:
+            return None
+    return TEXT_TYPE
+
+
+def is_portable_executable(head: bytes, f: BinaryIO) -> bool:
+    """
+    Checks that a file starting with "MZ" has the PE header its DOS header points to.
+
+    Args:
+        head (bytes): The first SNIFF_SIZE bytes of the file.
+        f (BinaryIO): The file, opened in binary mode.
+
+    Returns:
+        bool: True if the file is a Windows executable.
+    """
+    if not head.startswith(b"MZ") or len(head) < PE_OFFSET_POSITION + 4:
+        return False
+
+    pe_offset = int.from_bytes(
+        head[PE_OFFSET_POSITION : PE_OFFSET_POSITION + 4], "little"
+    )
+    if pe_offset + len(PE_SIGNATURE) <= len(head):
+        return head[pe_offset : pe_offset + len(PE_SIGNATURE)] == PE_SIGNATURE
+    if pe_offset > MAX_PE_OFFSET:
+        return False
+    f.seek(pe_offset)
+    return f.read(len(PE_SIGNATURE)) == PE_SIGNATURE
+
+
+def sniff_file(file_path: str) -> str | None:
+    """
+    Reads the first bytes of a file and detects its type.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str | None: The detected type, or None if it is unknown or the file
+            could not be read.
+    """
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            head = f.read(SNIFF_SIZE)
+            if is_portable_executable(head, f):
+                return "executable"
+    except OSError:
+        return None
+    return detect_type(head)
+
+
+def sniff_chunk(root: str, relative_paths: list[str]) -> list[str | None]:
+    return [
+        sniff_file(os.path.join(root, relative_path))
+        for relative_path in relative_paths
+    ]
+
+
+def sniff_files(
+    root: str,
+    results_table: pl.DataFrame,
+    max_workers: int = DEFAULT_SNIFF_WORKERS,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel_event: threading.Event | None = None,
+) -> pl.DataFrame:
+    """
+    Detects the type of every file of a results table from its content.
+
+    Only the first SNIFF_SIZE bytes of each file are read, unbuffered, and
+    matched against SIGNATURES compiled into a single regular expression. Files
+    starting with "MZ" also have their PE signature read. Files are read in
+    chunks of SNIFF_CHUNK_SIZE on a thread pool, since the time is spent waiting
+    on open and read calls, which release the GIL.
+
+    Args:
+        root (str): The path to the scanned folder.
+        results_table (pl.DataFrame): The results table of the scan.
+        max_workers (int): The number of reading threads.
+        on_progress (Callable[[int, int], None] | None): A callback receiving the
+            number of sniffed files and the total number of files.
+        cancel_event (threading.Event | None): An event that cancels sniffing when set.
+
+    Raises:
+        ScanCancelled: If sniffing was cancelled.
+
+    Returns:
+        pl.DataFrame: The "path" relative to the scanned folder and the
+            "detected_type" of every file.
+    """
+    path_expr = (
+        relative_path_expr() if "parent" in results_table.columns else pl.col("name")
+    )
+    relative_paths = (
+        results_table.filter(pl.col("type") == "file")
+        .select(path_expr)
+        .to_series()
+        .to_list()
+    )
+    chunks = [
+        relative_paths[start : start + SNIFF_CHUNK_SIZE]
+        for start in range(0, len(relative_paths), SNIFF_CHUNK_SIZE)
+    ]
+
+    detected_types = []
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for chunk_types in executor.map(lambda chunk: sniff_chunk(root, chunk), chunks):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ScanCancelled("Sniffing cancelled")
+            detected_types.extend(chunk_types)
+            if on_progress is not None:
+                on_progress(len(detected_types), len(relative_paths))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return pl.DataFrame(
+        {"path": relative_paths, "detected_type": detected_types},
+        schema={"path": pl.String, "detected_type": DETECTED_TYPES},
+    )
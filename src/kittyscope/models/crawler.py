@@ -0,0 +1,363 @@
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable
+
+import polars as pl
+
+from .scanner import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    RESULTS_SCHEMA,
+    ScanCancelled,
+    TableBuilder,
+    append_entry,
+    create_columns,
+    localize_categoricals,
+    stat_entry,
+)
+
+ROOT_PARENT = "."
+DEFAULT_MAX_WORKERS = 16
+
+# Parents are categorical, so every distinct folder path is stored once and
+# rows only hold its id. Depths and file counts use the narrowest integer
+# dtypes that fit any real tree.
+CRAWLED_SCHEMA = {
+    **RESULTS_SCHEMA,
+    "depth": pl.UInt16,
+    "parent": pl.Categorical(ordering="lexical"),
+}
+RECURSIVE_SCHEMA = {**CRAWLED_SCHEMA, "file_count": pl.UInt32}
+
+
+def join_relative(parent: str, name: str) -> str:
+    """
+    Joins a parent folder and a name into a path relative to the crawl root.
+
+    Args:
+        parent (str): The parent folder relative to the crawl root, or ROOT_PARENT.
+        name (str): The name of the entry.
+
+    Returns:
+        str: The path of the entry relative to the crawl root.
+    """
+    return name if parent == ROOT_PARENT else os.path.join(parent, name)
+
+
+def relative_path_expr() -> pl.Expr:
+    """
+    Returns an expression joining the "parent" and "name" columns like join_relative.
+
+    Returns:
+        pl.Expr: The path of every row relative to the crawl root.
+    """
+    return (
+        pl.when(pl.col("parent") == ROOT_PARENT)
+        .then(pl.col("name"))
+        .otherwise(pl.concat_str("parent", "name", separator=os.sep))
+    )
+
+
+def get_children_depth(relative_path: str) -> int:
+    """
+    Returns the depth of the children of a folder.
+
+    Args:
+        relative_path (str): The folder path relative to the crawl root, or ROOT_PARENT.
+
+    Returns:
+        int: The depth of the folder children, where 1 is the root children.
+    """
+    if relative_path == ROOT_PARENT:
+        return 1
+    return relative_path.count(os.sep) + 2
+
+
+def create_builder(
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_chunk: Callable[[pl.DataFrame], None] | None = None,
+) -> TableBuilder:
+    """
+    Creates a TableBuilder of RECURSIVE_SCHEMA rows with null file counts.
+
+    Args:
+        chunk_size (int): The number of rows converted at once.
+        on_chunk (Callable[[pl.DataFrame], None] | None): A callback receiving
+            every chunk as it is converted.
+
+    Returns:
+        TableBuilder: The empty builder.
+    """
+    return TableBuilder(
+        RECURSIVE_SCHEMA,
+        chunk_size=chunk_size,
+        on_chunk=on_chunk,
+        scanned_schema=CRAWLED_SCHEMA,
+    )
+
+
+class FolderScan:
+    """
+    The result of scanning a single folder of the tree.
+
+    Attributes:
+        relative_path (str): The folder path relative to the crawl root, the
+            "parent" of every child.
+        depth (int): The "depth" of every child.
+        columns (dict[str, list | array]): The RESULTS_SCHEMA values of the folder children.
+        subfolders (list[str]): The relative paths of the children to descend into.
+        files_size (int): The total size of the files directly inside the folder.
+        files_count (int): The number of files directly inside the folder.
+    """
+
+    def __init__(self, relative_path: str, depth: int) -> None:
+        self.relative_path = relative_path
+        self.depth = depth
+        self.columns = create_columns(RESULTS_SCHEMA)
+        self.subfolders: list[str] = []
+        self.files_size = 0
+        self.files_count = 0
+
+    def add_to(self, builder: TableBuilder) -> None:
+        """
+        Appends the folder children to a builder of RECURSIVE_SCHEMA rows.
+
+        Args:
+            builder (TableBuilder): The builder to append to.
+        """
+        builder.extend(self.columns, depth=self.depth, parent=self.relative_path)
+
+    def create_table(self) -> pl.DataFrame:
+        """
+        Builds the RECURSIVE_SCHEMA rows of the folder children.
+
+        Returns:
+            pl.DataFrame: The children, with null file counts.
+        """
+        with pl.StringCache():
+            builder = create_builder()
+            self.add_to(builder)
+            return localize_categoricals(builder.build())
+
+
+class TreeCrawler:
+    """
+    Walks a directory tree with a bounded thread pool and rolls folder sizes up.
+
+    Every folder is listed by one os.scandir call on a worker thread. Stat calls
+    release the GIL, so on network filesystems the folders overlap well.
+
+    Attributes:
+        max_workers (int): The number of worker threads.
+        max_depth (int | None): The deepest level to list, where 1 is the root children.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_depth: int | None = None,
+        cancel_event: threading.Event | None = None,
+        on_batch: Callable[[pl.DataFrame], None] | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """
+        Initializes the TreeCrawler object.
+
+        Args:
+            max_workers (int): The number of worker threads.
+            max_depth (int | None): The deepest level to list. None walks the whole tree.
+            cancel_event (threading.Event | None): An event that cancels the crawl when set.
+            on_batch (Callable[[pl.DataFrame], None] | None): A callback receiving rows as
+                folders are listed, before folder sizes are rolled up.
+            batch_size (int): The minimal number of rows passed to on_batch at once.
+        """
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+        self._cancel_event = cancel_event or threading.Event()
+
+    def cancel(self) -> None:
+        """
+        Cancels the running crawl.
+        """
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def crawl(self, path: str) -> pl.DataFrame:
+        """
+        Crawls the tree below the given path.
+
+        Folder rows get the cumulative size and file count of their subtree.
+        Folders at the depth limit are listed but not walked, so they keep the
+        size of the directory inode and a null file count. The chunks and the
+        folder totals share one scoped string cache, and the returned table has
+        local categories.
+
+        Args:
+            path (str): The path to the root directory.
+
+        Raises:
+            Exception: If the path is not a directory or the directory is empty.
+            ScanCancelled: If the crawl was cancelled.
+
+        Returns:
+            pl.DataFrame: A DataFrame with the RECURSIVE_SCHEMA columns.
+        """
+        if not os.path.isdir(path):
+            raise Exception("Path is not a directory")
+
+        with pl.StringCache():
+            builder = create_builder(
+                chunk_size=DEFAULT_CHUNK_SIZE
+                if self.on_batch is None
+                else self.batch_size,
+                on_chunk=self.on_batch,
+            )
+            folders_depth: dict[str, int] = {}
+            files_size: dict[str, int] = {}
+            files_count: dict[str, int] = {}
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = {executor.submit(self.scan_folder, path, ROOT_PARENT, 1)}
+                while pending and not self.cancelled:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            folder_scan = future.result()
+                        except OSError:
+                            if not folders_depth:
+                                raise
+                            continue
+
+                        folder_scan.add_to(builder)
+                        files_size[folder_scan.relative_path] = folder_scan.files_size
+                        files_count[folder_scan.relative_path] = folder_scan.files_count
+
+                        depth = folders_depth.get(folder_scan.relative_path, 0)
+                        folders_depth.setdefault(folder_scan.relative_path, depth)
+                        for subfolder in folder_scan.subfolders:
+                            folders_depth[subfolder] = depth + 1
+                            pending.add(
+                                executor.submit(
+                                    self.scan_folder, path, subfolder, depth + 2
+                                )
+                            )
+
+                if self.cancelled:
+                    for future in pending:
+                        future.cancel()
+                    raise ScanCancelled("Scan cancelled")
+
+            if len(builder) == 0:
+                raise Exception("Directory is empty")
+
+            results_table = builder.build()
+            return localize_categoricals(
+                self._roll_up(results_table, folders_depth, files_size, files_count)
+            )
+
+    def scan_folder(self, root: str, relative_path: str, depth: int) -> FolderScan:
+        """
+        Lists one folder of the tree.
+
+        Args:
+            root (str): The path to the crawl root.
+            relative_path (str): The folder path relative to the crawl root.
+            depth (int): The depth of the folder children.
+
+        Returns:
+            FolderScan: The folder children and the subfolders to descend into.
+        """
+        folder_scan = FolderScan(relative_path, depth)
+        if self.cancelled:
+            return folder_scan
+
+        columns = folder_scan.columns
+        with os.scandir(os.path.join(root, relative_path)) as entries:
+            for entry in entries:
+                if self.cancelled:
+                    break
+
+                entry_stat = stat_entry(entry)
+                append_entry(columns, entry, entry_stat)
+
+                if columns["type"][-1] == "file":
+                    folder_scan.files_size += entry_stat.st_size
+                    folder_scan.files_count += 1
+                elif entry.is_dir(follow_symlinks=False) and (
+                    self.max_depth is None or depth < self.max_depth
+                ):
+                    folder_scan.subfolders.append(
+                        join_relative(relative_path, entry.name)
+                    )
+
+        return folder_scan
+
+    def _roll_up(
+        self,
+        results_table: pl.DataFrame,
+        folders_depth: dict[str, int],
+        files_size: dict[str, int],
+        files_count: dict[str, int],
+    ) -> pl.DataFrame:
+        """
+        Replaces the size of every walked folder with the cumulative size of its subtree.
+
+        Args:
+            results_table (pl.DataFrame): The crawled entries.
+            folders_depth (dict[str, int]): The depth of every walked folder.
+            files_size (dict[str, int]): The size of the files directly inside each folder.
+            files_count (dict[str, int]): The number of files directly inside each folder.
+
+        Returns:
+            pl.DataFrame: The entries with rolled up folder sizes and file counts.
+        """
+        total_size = dict(files_size)
+        total_count = dict(files_count)
+        for folder in sorted(folders_depth, key=folders_depth.get, reverse=True):
+            if folder == ROOT_PARENT:
+                continue
+            parent = os.path.dirname(folder) or ROOT_PARENT
+            total_size[parent] = total_size.get(parent, 0) + total_size.get(folder, 0)
+            total_count[parent] = total_count.get(parent, 0) + total_count.get(
+                folder, 0
+            )
+
+        # Folders are matched by parent and name, so no path column is built
+        # for the whole table.
+        folder_totals = pl.DataFrame(
+            {
+                "parent": [
+                    os.path.dirname(folder) or ROOT_PARENT for folder in total_size
+                ],
+                "name": [os.path.basename(folder) for folder in total_size],
+                "total_size": list(total_size.values()),
+                "total_count": [total_count[folder] for folder in total_size],
+            },
+            schema={
+                "parent": RECURSIVE_SCHEMA["parent"],
+                "name": pl.String,
+                "total_size": pl.Int64,
+                "total_count": RECURSIVE_SCHEMA["file_count"],
+            },
+        )
+
+        return (
+            results_table.join(folder_totals, on=["parent", "name"], how="left")
+            .with_columns(
+                pl.when(pl.col("type") == "folder")
+                .then(pl.coalesce("total_size", "size"))
+                .otherwise(pl.col("size"))
+                .alias("size"),
+                pl.when(pl.col("type") == "folder")
+                .then(pl.col("total_count"))
+                .otherwise(pl.col("file_count"))
+                .alias("file_count"),
+            )
+            .select(RECURSIVE_SCHEMA.keys())
+        )
@@ -0,0 +1,232 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import polars as pl
+
+from .crawler import relative_path_expr
+from .scanner import ScanCancelled
+
+DEFAULT_HASH_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+PARTIAL_HASH_SIZE = 4096
+HASH_CHUNK_SIZE = 1 << 20
+HASH_DIGEST_SIZE = 16
+
+DUPLICATES_SCHEMA = {
+    "group": pl.UInt32,
+    "path": pl.String,
+    "size": pl.Int64,
+    "hash": pl.String,
+}
+
+
+def get_size_collisions(results_table: pl.DataFrame, min_size: int) -> pl.DataFrame:
+    """
+    Returns the files that share their exact size with at least one other file.
+
+    Args:
+        results_table (pl.DataFrame): The results table of a scan.
+        min_size (int): The size in bytes below which files are ignored.
+
+    Returns:
+        pl.DataFrame: The "path" relative to the scanned folder and the "size" of
+            every candidate file.
+    """
+    path_expr = (
+        relative_path_expr() if "parent" in results_table.columns else pl.col("name")
+    )
+    return (
+        results_table.lazy()
+        .filter(pl.col("type") == "file", pl.col("size") >= min_size)
+        .filter(pl.len().over("size") > 1)
+        .select(path_expr.alias("path"), "size")
+        .collect()
+    )
+
+
+def hash_partial(file_path: str, size: int, partial_size: int) -> str | None:
+    """
+    Hashes the first and last partial_size bytes of a file.
+
+    Files of up to twice partial_size bytes are read whole, so their partial
+    hash is also their full hash.
+
+    Args:
+        file_path (str): The path to the file.
+        size (int): The scanned size of the file.
+        partial_size (int): The number of bytes read at each end.
+
+    Returns:
+        str | None: The hex digest, or None if the file could not be read.
+    """
+    file_hash = hashlib.blake2b(digest_size=HASH_DIGEST_SIZE)
+    try:
+        with open(file_path, "rb") as f:
+            if size <= 2 * partial_size:
+                file_hash.update(f.read())
+            else:
+                file_hash.update(f.read(partial_size))
+                f.seek(-partial_size, os.SEEK_END)
+                file_hash.update(f.read(partial_size))
+    except OSError:
+        return None
+    return file_hash.hexdigest()
+
+
+def hash_full(file_path: str, chunk_size: int) -> str | None:
+    """
+    Hashes the whole content of a file, reading it in chunks.
+
+    Args:
+        file_path (str): The path to the file.
+        chunk_size (int): The number of bytes read at once.
+
+    Returns:
+        str | None: The hex digest, or None if the file could not be read.
+    """
+    file_hash = hashlib.blake2b(digest_size=HASH_DIGEST_SIZE)
+    try:
+        with open(file_path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                file_hash.update(chunk)
+    except OSError:
+        return None
+    return file_hash.hexdigest()
+
+
+def keep_collisions(candidates: pl.DataFrame) -> pl.DataFrame:
+    """
+    Drops unreadable files and files whose size and hash are unique.
+
+    Args:
+        candidates (pl.DataFrame): Files with "size" and "hash" columns.
+
+    Returns:
+        pl.DataFrame: The files whose size and hash are shared with another file.
+    """
+    return candidates.filter(
+        pl.col("hash").is_not_null(), pl.len().over("size", "hash") > 1
+    )
+
+
+def find_duplicates(
+    root: str,
+    results_table: pl.DataFrame,
+    max_workers: int = DEFAULT_HASH_WORKERS,
+    partial_size: int = PARTIAL_HASH_SIZE,
+    chunk_size: int = HASH_CHUNK_SIZE,
+    min_size: int = 1,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel_event: threading.Event | None = None,
+) -> pl.DataFrame:
+    """
+    Finds files with identical content in stages that read as little as possible.
+
+    Files are first grouped by exact size, which needs no reads. Files sharing
+    a size are then told apart by a hash of their first and last partial_size
+    bytes. Only files still colliding after that are hashed whole with BLAKE2b.
+    Reads run on a thread pool, since hashlib releases the GIL while hashing.
+
+    Args:
+        root (str): The path to the scanned folder.
+        results_table (pl.DataFrame): The results table of the scan.
+        max_workers (int): The number of hashing threads.
+        partial_size (int): The number of bytes hashed at each end of a file first.
+        chunk_size (int): The number of bytes read at once by full hashes.
+        min_size (int): The size in bytes below which files are ignored.
+        on_progress (Callable[[int, int], None] | None): A callback receiving the
+            number of hashed files and the number of files to hash in the current stage.
+        cancel_event (threading.Event | None): An event that cancels the search when set.
+
+    Raises:
+        ScanCancelled: If the search was cancelled.
+
+    Returns:
+        pl.DataFrame: One DUPLICATES_SCHEMA row per duplicated file. Group 0 wastes
+            the most bytes.
+    """
+    candidates = get_size_collisions(results_table, min_size)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+
+        def hash_files(rows: pl.DataFrame, hash_file: Callable) -> list[str | None]:
+            digests = []
+            arguments = zip(rows["path"], rows["size"])
+            for digest in executor.map(lambda args: hash_file(*args), arguments):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ScanCancelled("Duplicate search cancelled")
+                digests.append(digest)
+                if on_progress is not None:
+                    on_progress(len(digests), rows.height)
+            return digests
+
+        candidates = keep_collisions(
+            candidates.with_columns(
+                hash=pl.Series(
+                    hash_files(
+                        candidates,
+                        lambda path, size: hash_partial(
+                            os.path.join(root, path), size, partial_size
+                        ),
+                    ),
+                    dtype=pl.String,
+                )
+            )
+        )
+
+        is_read_whole = pl.col("size") <= 2 * partial_size
+        large_files = candidates.filter(~is_read_whole)
+        large_files = large_files.with_columns(
+            hash=pl.Series(
+                hash_files(
+                    large_files,
+                    lambda path, size: hash_full(os.path.join(root, path), chunk_size),
+                ),
+                dtype=pl.String,
+            )
+        )
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    duplicates = keep_collisions(
+        pl.concat([candidates.filter(is_read_whole), large_files])
+    )
+    groups = (
+        duplicates.group_by("size", "hash")
+        .len()
+        .sort(
+            pl.col("size") * (pl.col("len") - 1),
+            "hash",
+            descending=[True, False],
+        )
+        .with_row_index("group")
+    )
+    return (
+        duplicates.join(groups, on=["size", "hash"])
+        .sort("group", "path")
+        .select(
+            pl.col(column).cast(dtype) for column, dtype in DUPLICATES_SCHEMA.items()
+        )
+    )
+
+
+def get_duplicate_groups(duplicates: pl.DataFrame) -> pl.DataFrame:
+    """
+    Summarizes the duplicate groups returned by find_duplicates.
+
+    Args:
+        duplicates (pl.DataFrame): The duplicated files.
+
+    Returns:
+        pl.DataFrame: The "group", file "size", file "count" and "wasted" bytes of
+            every group, where wasted bytes are the size of all copies but one.
+    """
+    return (
+        duplicates.group_by("group")
+        .agg(pl.col("size").first(), pl.len().alias("count"))
+        .with_columns(wasted=pl.col("size") * (pl.col("count") - 1))
+        .sort("group")
+    )
@@ -0,0 +1,140 @@
+import os
+import threading
+from typing import Callable
+
+import polars as pl
+
+from .scanner import ScanCancelled
+
+DEFAULT_EXPORT_BATCH_SIZE = 100_000
+PARQUET_COMPRESSION = "zstd"
+
+EXPORT_FORMATS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "ndjson": ".ndjson",
+}
+
+
+def get_export_format(path: str) -> str:
+    """
+    Returns the export format matching the extension of a path.
+
+    Args:
+        path (str): The path to export to.
+
+    Raises:
+        Exception: If the extension is not one of EXPORT_FORMATS.
+
+    Returns:
+        str: The export format, a key of EXPORT_FORMATS.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".jsonl":
+        return "ndjson"
+    for export_format, format_extension in EXPORT_FORMATS.items():
+        if extension == format_extension:
+            return export_format
+    raise Exception(f"Unsupported export file type: {extension or path}")
+
+
+def write_batches(
+    table: pl.DataFrame,
+    f,
+    export_format: str,
+    batch_size: int,
+    on_progress: Callable[[int, int], None] | None,
+    cancel_event: threading.Event | None,
+) -> None:
+    """
+    Writes a table as CSV or NDJSON one slice at a time.
+
+    Only one slice is serialized at once, so the export needs little memory
+    besides the table itself.
+
+    Args:
+        table (pl.DataFrame): The table to write.
+        f (BinaryIO): The open output file.
+        export_format (str): "csv" or "ndjson".
+        batch_size (int): The number of rows serialized at once.
+        on_progress (Callable[[int, int], None] | None): A callback receiving the
+            number of written rows and the total number of rows.
+        cancel_event (threading.Event | None): An event that cancels the export when set.
+
+    Raises:
+        ScanCancelled: If the export was cancelled.
+    """
+    if export_format == "csv":
+        table.clear().write_csv(f)
+
+    for offset in range(0, table.height, batch_size):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScanCancelled("Export cancelled")
+
+        batch = table.slice(offset, batch_size)
+        if export_format == "csv":
+            batch.write_csv(f, include_header=False)
+        else:
+            batch.write_ndjson(f)
+        if on_progress is not None:
+            on_progress(offset + batch.height, table.height)
+
+
+def export_table(
+    table: pl.DataFrame,
+    path: str,
+    export_format: str | None = None,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel_event: threading.Event | None = None,
+) -> int:
+    """
+    Exports a results table to a CSV, Parquet or NDJSON file.
+
+    CSV and NDJSON are written in batches of batch_size rows. Parquet is
+    streamed by polars with zstd compression through sink_parquet, which
+    reports progress only once it is done. The file is written next to the
+    target under a temporary name and moved in place at the end, so a failed
+    or cancelled export leaves no partial file behind.
+
+    Args:
+        table (pl.DataFrame): The table to export, like the results table or a
+            filtered view of it.
+        path (str): The path of the exported file.
+        export_format (str | None): A key of EXPORT_FORMATS. Defaults to the format
+            matching the extension of the path.
+        batch_size (int): The number of rows serialized at once.
+        on_progress (Callable[[int, int], None] | None): A callback receiving the
+            number of written rows and the total number of rows.
+        cancel_event (threading.Event | None): An event that cancels the export when set.
+
+    Raises:
+        ScanCancelled: If the export was cancelled.
+        Exception: If the format is not supported.
+
+    Returns:
+        int: The number of exported rows.
+    """
+    export_format = export_format or get_export_format(path)
+    if export_format not in EXPORT_FORMATS:
+        raise Exception(f"Unsupported export format: {export_format}")
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        if export_format == "parquet":
+            if cancel_event is not None and cancel_event.is_set():
+                raise ScanCancelled("Export cancelled")
+            table.lazy().sink_parquet(temporary_path, compression=PARQUET_COMPRESSION)
+            if on_progress is not None:
+                on_progress(table.height, table.height)
+        else:
+            with open(temporary_path, "wb") as f:
+                write_batches(
+                    table, f, export_format, batch_size, on_progress, cancel_event
+                )
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+    return table.height
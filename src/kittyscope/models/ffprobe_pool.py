@@ -0,0 +1,132 @@
+import asyncio
+import json
+import os
+
+DEFAULT_FFPROBE_COMMAND = "ffprobe"
+DEFAULT_CONCURRENCY = os.cpu_count() or 1
+DEFAULT_TIMEOUT = 30.0
+
+
+class FFprobePool:
+    """
+    Runs ffprobe over many files with a bounded number of concurrent processes.
+
+    Every file still needs its own ffprobe process, but an asyncio scheduler keeps
+    up to max_concurrency of them running at once, so process startup overlaps
+    instead of adding up. A process that exceeds the timeout is killed. With
+    format_only, ffprobe is asked for the format section alone, which is all the
+    researchers return, and skips probing and serializing the streams.
+
+    Attributes:
+        max_concurrency (int): The maximal number of running ffprobe processes.
+        timeout (float): The seconds after which the probe of a file is abandoned.
+        format_only (bool): If True, only the "format" section is requested.
+        cmd (str): The ffprobe executable.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        format_only: bool = True,
+        cmd: str = DEFAULT_FFPROBE_COMMAND,
+    ) -> None:
+        """
+        Initializes the FFprobePool object.
+
+        Args:
+            max_concurrency (int): The maximal number of running ffprobe processes.
+            timeout (float): The seconds after which the probe of a file is abandoned.
+            format_only (bool): If True, only the "format" section is requested.
+            cmd (str): The ffprobe executable.
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.format_only = format_only
+        self.cmd = cmd
+
+    def get_args(self, file_path: str) -> list[str]:
+        """
+        Returns the ffprobe command line for a file.
+
+        Args:
+            file_path (str): The path to the media file.
+
+        Returns:
+            list[str]: The command and its arguments.
+        """
+        args = [self.cmd, "-v", "error", "-of", "json", "-show_format"]
+        if not self.format_only:
+            args.append("-show_streams")
+        return [*args, str(file_path)]
+
+    def probe(self, file_path: str) -> dict:
+        """
+        Probes a single file.
+
+        Args:
+            file_path (str): The path to the media file.
+
+        Raises:
+            Exception: If ffprobe fails or times out.
+
+        Returns:
+            dict: The parsed ffprobe output.
+        """
+        return asyncio.run(self.probe_async(file_path))
+
+    def probe_many(self, file_paths: list[str]) -> list[dict | Exception]:
+        """
+        Probes many files concurrently.
+
+        Args:
+            file_paths (list[str]): The paths to the media files.
+
+        Returns:
+            list[dict | Exception]: The parsed ffprobe output of every file, in the
+                order of file_paths, or the exception its probe raised.
+        """
+        return asyncio.run(self.__probe_all(file_paths))
+
+    async def probe_async(
+        self, file_path: str, semaphore: asyncio.Semaphore | None = None
+    ) -> dict:
+        """
+        Probes a file in a subprocess without blocking the event loop.
+
+        Args:
+            file_path (str): The path to the media file.
+            semaphore (asyncio.Semaphore | None): Bounds the running processes.
+
+        Raises:
+            Exception: If ffprobe fails or times out.
+
+        Returns:
+            dict: The parsed ffprobe output.
+        """
+        semaphore = semaphore or asyncio.Semaphore(1)
+        async with semaphore:
+            process = await asyncio.create_subprocess_exec(
+                *self.get_args(file_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(), self.timeout
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise Exception(f"ffprobe timed out after {self.timeout} s")
+
+        if process.returncode != 0:
+            raise Exception(stderr.decode(errors="replace").strip() or "ffprobe failed")
+        return json.loads(stdout)
+
+    async def __probe_all(self, file_paths: list[str]) -> list[dict | Exception]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(
+            *(self.probe_async(file_path, semaphore) for file_path in file_paths),
+            return_exceptions=True,
+        )
@@ -1,13 +1,63 @@
+import os
+import threading
+import warnings
 from datetime import datetime
-from os import listdir
-from os.path import getatime, getmtime, getsize
-from pathlib import Path
+from typing import Callable
 
 import polars as pl
-from PySide6.QtCore import QDateTime
 
-DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
-QT_DATETIME_FORMAT = "yyyy-MM-dd HH:mm:ss"
+from .batch_prober import DEFAULT_PROBE_WORKERS, PROBE_SCHEMA, probe_files
+from .content_sniffer import DEFAULT_SNIFF_WORKERS, sniff_files
+from .crawler import (
+    DEFAULT_MAX_WORKERS,
+    RECURSIVE_SCHEMA,
+    ROOT_PARENT,
+    TreeCrawler,
+    get_children_depth,
+    join_relative,
+    relative_path_expr,
+)
+from .duplicate_finder import DEFAULT_HASH_WORKERS, find_duplicates
+from .exporter import export_table
+from .query import ResultsQuery
+from .scan_cache import ScanCache
+from .scan_diff import ScanDiff, diff_scans
+from .scanner import (
+    RESULTS_SCHEMA,
+    DEFAULT_BATCH_SIZE,
+    concat_tables,
+    scan_directory,
+)
+from .snapshots import SnapshotStore
+
+PROBE_KEY = "__probe_path"
+PROBE_COLUMNS = [column for column in PROBE_SCHEMA if column != "path"]
+CONTENT_COLUMNS = [*PROBE_COLUMNS, "detected_type"]
+
+
+class FolderChanges:
+    """
+    The entries of a folder that changed since the previous scan.
+
+    Attributes:
+        added (pl.DataFrame): The new rows, including whole subtrees of new folders.
+        removed (pl.DataFrame): The dropped rows, including whole subtrees of removed folders.
+        modified (pl.DataFrame): The new versions of rows whose type, size or mtime changed.
+    """
+
+    def __init__(
+        self, added: pl.DataFrame, removed: pl.DataFrame, modified: pl.DataFrame
+    ) -> None:
+        self.added = added
+        self.removed = removed
+        self.modified = modified
+
+    def is_empty(self) -> bool:
+        return (
+            self.added.is_empty()
+            and self.removed.is_empty()
+            and self.modified.is_empty()
+        )
 
 
 class Finder:
@@ -15,64 +65,621 @@ class Finder:
     A class to find and retrieve information about files and folders.
     """
 
-    def __init__(self, path: str) -> None:
+    def __init__(
+        self,
+        path: str,
+        recursive: bool = False,
+        max_depth: int | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        cancel_event: threading.Event | None = None,
+        on_batch: Callable[[pl.DataFrame], None] | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        cache: ScanCache | None = None,
+        force_rescan: bool = False,
+    ) -> None:
         """
         Initializes the Finder object.
 
         Args:
             path (str): The path to the directory or file.
+            recursive (bool): If True, crawls the whole tree instead of the immediate children.
+            max_depth (int | None): The deepest level listed by a recursive crawl.
+            max_workers (int): The number of threads used by a recursive crawl.
+            cancel_event (threading.Event | None): An event that cancels the scan when set.
+            on_batch (Callable[[pl.DataFrame], None] | None): A callback receiving rows while
+                the scan is running.
+            batch_size (int): The number of rows passed to on_batch at once.
+            cache (ScanCache | None): The cache to load unchanged directories from and
+                to store new scans in.
+            force_rescan (bool): If True, scans the directory even if the cache is valid.
         """
+        self.path = path
+        self.recursive = recursive
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.cancel_event = cancel_event or threading.Event()
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+        self.cache = cache
+        self.force_rescan = force_rescan
+        self.from_cache = False
         self.create_results_dataframe(path)
 
     def create_results_dataframe(self, path: str) -> None:
         """
         Creates a DataFrame of file and folder information.
 
+        A recursive crawl adds the "depth", "parent" and "file_count" columns and
+        replaces folder sizes with the cumulative size of their subtree. If a valid
+        cached table exists it is used instead of scanning, and is passed to
+        on_batch as a single batch. The results are kept if they cannot be
+        written to the cache.
+
         Args:
             path (str): The path to the directory.
 
         Raises:
-            Exception: If the directory is empty.
-        """
-
-        path = Path(path)
-        if path.is_dir():
-            if listdir(path) == []:
-                raise Exception("Directory is empty")
-            else:
-                elements_info = []
-                for element in path.iterdir():
-                    if element.is_file():
-                        element_type = "file"
-                    elif element.is_dir():
-                        element_type = "folder"
-                    else:
-                        element_type = "unknown"
-
-                    element_size = getsize(element)
-                    element_access_time = datetime.fromtimestamp(
-                        getatime(element)
-                    ).strftime(DATETIME_FORMAT)
-                    element_modification_time = datetime.fromtimestamp(
-                        getmtime(element)
-                    ).strftime(DATETIME_FORMAT)
-
-                    elements_info.append(
-                        {
-                            "name": element.name,
-                            "type": element_type,
-                            "size": element_size,
-                            "extension": element.suffix.lower()
-                            if len(element.suffix) > 0
-                            else "-",
-                            "last_access": element_access_time,
-                            "last_modification": element_modification_time,
-                        }
-                    )
+            Exception: If the path is not a directory or the directory is empty.
+            ScanCancelled: If the scan was cancelled.
+        """
+        use_cache = self.cache is not None and os.path.isdir(path)
+        if use_cache:
+            if not self.force_rescan:
+                cached_table = self.cache.load(path, self.recursive, self.max_depth)
+                if cached_table is not None:
+                    self.results_table = cached_table
+                    self.from_cache = True
+                    if self.on_batch is not None:
+                        self.on_batch(cached_table)
+                    return
+            fingerprint = self.cache.get_fingerprint(path)
+
+        if self.recursive:
+            crawler = TreeCrawler(
+                max_workers=self.max_workers,
+                max_depth=self.max_depth,
+                cancel_event=self.cancel_event,
+                on_batch=self.on_batch,
+                batch_size=self.batch_size,
+            )
+            self.results_table = crawler.crawl(path)
+        else:
+            self.results_table = scan_directory(
+                path,
+                on_batch=self.on_batch,
+                batch_size=self.batch_size,
+                cancel_event=self.cancel_event,
+            )
+
+        if use_cache:
+            try:
+                self.cache.store(
+                    path,
+                    self.results_table,
+                    fingerprint,
+                    self.recursive,
+                    self.max_depth,
+                )
+            except (OSError, pl.exceptions.PolarsError):
+                pass
+
+    def refresh_folder(self, relative_path: str = ROOT_PARENT) -> FolderChanges:
+        """
+        Lists one folder again and applies only its changed entries to the results table.
+
+        In a recursive table the subtrees of added folders are crawled, the subtrees
+        of removed folders are dropped, and the size and file count of every ancestor
+        folder are adjusted by the difference. Probed media metadata is kept for
+        unchanged files and cleared for modified ones, as are detected types.
+
+        Files modified in place are found by their type, size and mtime. Watching
+        a folder does not report them, so callers watching folders watch files too.
+
+        Args:
+            relative_path (str): The folder path relative to the scanned path.
+
+        Returns:
+            FolderChanges: The added, removed and modified rows.
+        """
+        schema = RECURSIVE_SCHEMA if self.recursive else RESULTS_SCHEMA
+        probe_results = self.__take_probe_results()
+        crawler = TreeCrawler(max_depth=self.max_depth)
+        try:
+            folder_scan = crawler.scan_folder(
+                self.path, relative_path, get_children_depth(relative_path)
+            )
+        except FileNotFoundError:
+            folder_scan = None
+
+        if self.recursive:
+            old_rows = self.results_table.filter(pl.col("parent") == relative_path)
+        else:
+            old_rows = self.results_table
+
+        if folder_scan is None:
+            new_rows = old_rows.clear()
         else:
-            raise Exception("Path is not a directory")
+            new_rows = folder_scan.create_table().select(schema.keys())
+
+        added = new_rows.join(old_rows.select("name"), on="name", how="anti")
+        removed = old_rows.join(new_rows.select("name"), on="name", how="anti")
+        modified = (
+            new_rows.join(
+                old_rows.select("name", "type", "size", "last_modification"),
+                on="name",
+                how="inner",
+                suffix="_old",
+            )
+            .filter(
+                (pl.col("type") != pl.col("type_old"))
+                | (pl.col("last_modification") != pl.col("last_modification_old"))
+                | ((pl.col("type") == "file") & (pl.col("size") != pl.col("size_old")))
+            )
+            .select(schema.keys())
+        )
+
+        if not self.recursive:
+            self.results_table = new_rows
+            self.__restore_probe_results(probe_results, modified)
+            return FolderChanges(added, removed, modified)
 
-        self.results_table = pl.DataFrame(elements_info)
+        new_rows = self.__keep_rolled_up_sizes(new_rows, old_rows)
+        removed = self.__with_subtrees(removed)
+        added_subtrees, new_rows = self.__crawl_added_folders(
+            relative_path,
+            added,
+            new_rows,
+            folder_scan.subfolders if folder_scan else [],
+        )
+        added = concat_tables(
+            [new_rows.join(added.select("name"), on="name"), added_subtrees]
+        )
+        modified = new_rows.join(modified.select("name"), on="name")
+
+        size_delta, count_delta = (
+            new_rows.select(self.__size_contribution(), self.__count_contribution())
+            .sum()
+            .row(0)
+        )
+        old_size, old_count = (
+            old_rows.select(self.__size_contribution(), self.__count_contribution())
+            .sum()
+            .row(0)
+        )
+
+        removed_paths = self.__get_paths(removed)
+        refreshed_rows = concat_tables([new_rows, added_subtrees])
+        with warnings.catch_warnings():
+            # Appending keeps the categories of the results table and only
+            # re-encodes the refreshed rows, which is much cheaper than casting
+            # the whole table to strings, so the remapping is expected.
+            warnings.simplefilter(
+                "ignore", category=pl.exceptions.CategoricalRemappingWarning
+            )
+            self.results_table = pl.concat(
+                [
+                    self.results_table.filter(
+                        pl.col("parent") != relative_path,
+                        ~relative_path_expr().is_in(removed_paths),
+                    ),
+                    refreshed_rows,
+                ]
+            )
+        self.__update_ancestors(
+            relative_path, size_delta - old_size, count_delta - old_count
+        )
+        self.__update_folder_times(relative_path)
+        self.__restore_probe_results(probe_results, modified)
+
+        return FolderChanges(added, removed, modified)
+
+    def probe_media(
+        self,
+        max_workers: int = DEFAULT_PROBE_WORKERS,
+        on_progress: Callable[[int, int], None] | None = None,
+    ) -> pl.DataFrame:
+        """
+        Extracts the metadata of every image, PDF, video and audio file with a
+        process pool and merges it into the results table.
+
+        Args:
+            max_workers (int): The number of worker processes.
+            on_progress (Callable[[int, int], None] | None): A callback receiving the
+                number of probed files and the total number of files.
+
+        Raises:
+            ScanCancelled: If probing was cancelled.
+
+        Returns:
+            pl.DataFrame: The probe results, one row per probed file.
+        """
+        probe_results = probe_files(
+            self.path,
+            self.results_table,
+            max_workers=max_workers,
+            on_progress=on_progress,
+            cancel_event=self.cancel_event,
+        )
+        self.merge_probe_results(probe_results)
+        return probe_results
+
+    def detect_types(
+        self,
+        max_workers: int = DEFAULT_SNIFF_WORKERS,
+        on_progress: Callable[[int, int], None] | None = None,
+    ) -> pl.DataFrame:
+        """
+        Detects the type of every file from its first bytes and adds it to the
+        results table as the "detected_type" column.
+
+        Later probes route files by that column instead of their extension.
+
+        Args:
+            max_workers (int): The number of reading threads.
+            on_progress (Callable[[int, int], None] | None): A callback receiving the
+                number of sniffed files and the total number of files.
+
+        Raises:
+            ScanCancelled: If sniffing was cancelled.
+
+        Returns:
+            pl.DataFrame: The detected types, one row per file.
+        """
+        detected_types = sniff_files(
+            self.path,
+            self.results_table,
+            max_workers=max_workers,
+            on_progress=on_progress,
+            cancel_event=self.cancel_event,
+        )
+        self.merge_probe_results(detected_types)
+        return detected_types
+
+    def find_duplicates(
+        self,
+        max_workers: int = DEFAULT_HASH_WORKERS,
+        on_progress: Callable[[int, int], None] | None = None,
+    ) -> pl.DataFrame:
+        """
+        Finds the files with identical content among the results.
+
+        Args:
+            max_workers (int): The number of hashing threads.
+            on_progress (Callable[[int, int], None] | None): A callback receiving the
+                number of hashed files and the number of files to hash in the current stage.
+
+        Raises:
+            ScanCancelled: If the search was cancelled.
+
+        Returns:
+            pl.DataFrame: The duplicated files grouped as returned by find_duplicates.
+        """
+        return find_duplicates(
+            self.path,
+            self.results_table,
+            max_workers=max_workers,
+            on_progress=on_progress,
+            cancel_event=self.cancel_event,
+        )
+
+    def save_snapshot(self, store: SnapshotStore | None = None) -> dict:
+        """
+        Saves the current results as a snapshot to compare later scans with.
+
+        Args:
+            store (SnapshotStore | None): The store to save to. Defaults to the
+                default snapshot folder.
+
+        Returns:
+            dict: The index entry of the snapshot.
+        """
+        store = store or SnapshotStore()
+        return store.save(self.path, self.results_table, self.recursive, self.max_depth)
+
+    def diff_snapshot(
+        self, snapshot_id: str | None = None, store: SnapshotStore | None = None
+    ) -> ScanDiff:
+        """
+        Compares the current results with a snapshot.
+
+        Args:
+            snapshot_id (str | None): The snapshot to compare with. Defaults to the
+                latest snapshot of this directory taken with the same scan options.
+            store (SnapshotStore | None): The store holding the snapshot. Defaults
+                to the default snapshot folder.
+
+        Raises:
+            Exception: If there is no such snapshot.
+
+        Returns:
+            ScanDiff: The growth between the snapshot and the current results.
+        """
+        store = store or SnapshotStore()
+        if snapshot_id is None:
+            snapshots = store.get_snapshots(self.path, self.recursive, self.max_depth)
+            if not snapshots:
+                raise Exception(f"No snapshot of {self.path} to compare with")
+            snapshot_id = snapshots[-1]["id"]
+        return diff_scans(store.load(snapshot_id), self.results_table)
+
+    def merge_probe_results(self, probe_results: pl.DataFrame) -> None:
+        """
+        Adds the typed media metadata columns to the results table.
+
+        Columns of a previous probe are replaced. Rows that were not probed get nulls.
+
+        Args:
+            probe_results (pl.DataFrame): The rows returned by probe_files or
+                sniff_files, keyed by "path".
+        """
+        merged_columns = [
+            column for column in probe_results.columns if column != "path"
+        ]
+        self.results_table = (
+            self.results_table.drop(merged_columns, strict=False)
+            .with_columns(self.__path_expr().alias(PROBE_KEY))
+            .join(
+                probe_results.rename({"path": PROBE_KEY}),
+                on=PROBE_KEY,
+                how="left",
+            )
+            .drop(PROBE_KEY)
+        )
+
+    def __take_probe_results(self) -> pl.DataFrame | None:
+        """
+        Detaches the probed metadata and detected type columns from the results table.
+
+        Returns:
+            pl.DataFrame | None: The probed metadata keyed by path, or None if the
+                table was never probed.
+        """
+        columns = [
+            column for column in CONTENT_COLUMNS if column in self.results_table.columns
+        ]
+        if not columns:
+            return None
+
+        probe_results = self.results_table.select(
+            self.__path_expr().alias("path"), *columns
+        ).filter(pl.any_horizontal(pl.col(columns).is_not_null()))
+        self.results_table = self.results_table.drop(columns)
+        return probe_results
+
+    def __restore_probe_results(
+        self, probe_results: pl.DataFrame | None, modified: pl.DataFrame
+    ) -> None:
+        """
+        Merges detached metadata back, leaving out the rows that were modified.
+
+        Args:
+            probe_results (pl.DataFrame | None): The result of __take_probe_results.
+            modified (pl.DataFrame): The modified rows.
+        """
+        if probe_results is None:
+            return
+
+        modified_paths = modified.select(self.__path_expr()).to_series().to_list()
+        self.merge_probe_results(
+            probe_results.filter(~pl.col("path").is_in(modified_paths))
+        )
+
+    def __path_expr(self) -> pl.Expr:
+        return relative_path_expr() if self.recursive else pl.col("name")
+
+    def __keep_rolled_up_sizes(
+        self, new_rows: pl.DataFrame, old_rows: pl.DataFrame
+    ) -> pl.DataFrame:
+        """
+        Copies the rolled up size and file count of folders that are still present.
+
+        Args:
+            new_rows (pl.DataFrame): The folder children as listed now.
+            old_rows (pl.DataFrame): The folder children in the results table.
+
+        Returns:
+            pl.DataFrame: The new rows with the previous folder totals.
+        """
+        old_folders = old_rows.filter(pl.col("type") == "folder").select(
+            "name",
+            pl.col("size").alias("size_old"),
+            pl.col("file_count").alias("count_old"),
+        )
+        is_old_folder = (pl.col("type") == "folder") & pl.col("size_old").is_not_null()
+        return (
+            new_rows.join(old_folders, on="name", how="left")
+            .with_columns(
+                pl.when(is_old_folder).then("size_old").otherwise("size").alias("size"),
+                pl.when(is_old_folder)
+                .then("count_old")
+                .otherwise("file_count")
+                .alias("file_count"),
+            )
+            .select(RECURSIVE_SCHEMA.keys())
+        )
+
+    def __crawl_added_folders(
+        self,
+        relative_path: str,
+        added: pl.DataFrame,
+        new_rows: pl.DataFrame,
+        subfolders: list[str],
+    ) -> tuple[pl.DataFrame, pl.DataFrame]:
+        """
+        Crawls the subtrees of added folders and rolls their sizes up.
+
+        Args:
+            relative_path (str): The refreshed folder relative to the scanned path.
+            added (pl.DataFrame): The added children of the refreshed folder.
+            new_rows (pl.DataFrame): The children of the refreshed folder.
+            subfolders (list[str]): The children that can be walked.
+
+        Returns:
+            tuple[pl.DataFrame, pl.DataFrame]: The rows of the added subtrees, and
+                the children with the totals of the added folders.
+        """
+        subtrees = [new_rows.clear()]
+        totals = {"name": [], "size_new": [], "count_new": []}
+        for folder_name, depth in (
+            added.filter(pl.col("type") == "folder").select("name", "depth").iter_rows()
+        ):
+            folder_path = join_relative(relative_path, folder_name)
+            if folder_path not in subfolders:
+                continue
+
+            max_depth = None if self.max_depth is None else self.max_depth - depth
+            try:
+                subtree = TreeCrawler(
+                    max_workers=self.max_workers, max_depth=max_depth
+                ).crawl(os.path.join(self.path, folder_path))
+            except Exception:
+                subtree = new_rows.clear()
+
+            subtree = subtree.with_columns(
+                pl.col("depth") + depth,
+                pl.when(pl.col("parent") == ROOT_PARENT)
+                .then(pl.lit(folder_path))
+                .otherwise(pl.lit(folder_path + os.sep) + pl.col("parent"))
+                .cast(RECURSIVE_SCHEMA["parent"])
+                .alias("parent"),
+            )
+            subtrees.append(subtree)
+
+            direct_children = subtree.filter(pl.col("parent") == folder_path)
+            size, count = (
+                direct_children.select(
+                    self.__size_contribution(), self.__count_contribution()
+                )
+                .sum()
+                .row(0)
+            )
+            totals["name"].append(folder_name)
+            totals["size_new"].append(size)
+            totals["count_new"].append(count)
+
+        totals_table = pl.DataFrame(
+            totals,
+            schema={
+                "name": pl.String,
+                "size_new": pl.Int64,
+                "count_new": RECURSIVE_SCHEMA["file_count"],
+            },
+        )
+        new_rows = (
+            new_rows.join(totals_table, on="name", how="left")
+            .with_columns(
+                pl.coalesce("size_new", "size").alias("size"),
+                pl.coalesce("count_new", "file_count").alias("file_count"),
+            )
+            .select(RECURSIVE_SCHEMA.keys())
+        )
+        return concat_tables(subtrees), new_rows
+
+    def __with_subtrees(self, removed: pl.DataFrame) -> pl.DataFrame:
+        """
+        Extends removed rows with every row below the removed folders.
+
+        Args:
+            removed (pl.DataFrame): The removed children of the refreshed folder.
+
+        Returns:
+            pl.DataFrame: The removed rows and their subtrees.
+        """
+        removed_folders = self.__get_paths(removed.filter(pl.col("type") == "folder"))
+        if not removed_folders:
+            return removed
+
+        subtree_condition = pl.lit(False)
+        for folder in removed_folders:
+            subtree_condition |= (pl.col("parent") == folder) | pl.col("parent").cast(
+                pl.String
+            ).str.starts_with(folder + os.sep)
+        return pl.concat([removed, self.results_table.filter(subtree_condition)])
+
+    def __update_ancestors(
+        self, relative_path: str, size_delta: int, count_delta: int
+    ) -> None:
+        """
+        Adds the size and file count difference to a folder and all its ancestors.
+
+        Args:
+            relative_path (str): The refreshed folder relative to the scanned path.
+            size_delta (int): The change of the folder size.
+            count_delta (int): The change of the folder file count.
+        """
+        if relative_path == ROOT_PARENT or (size_delta == 0 and count_delta == 0):
+            return
+
+        ancestors = []
+        while relative_path:
+            ancestors.append(relative_path)
+            relative_path = os.path.dirname(relative_path)
+
+        is_ancestor = (pl.col("type") == "folder") & relative_path_expr().is_in(
+            ancestors
+        )
+        self.results_table = self.results_table.with_columns(
+            pl.when(is_ancestor)
+            .then(pl.col("size") + size_delta)
+            .otherwise(pl.col("size"))
+            .alias("size"),
+            pl.when(is_ancestor)
+            .then(pl.col("file_count") + count_delta)
+            .otherwise(pl.col("file_count"))
+            .cast(RECURSIVE_SCHEMA["file_count"])
+            .alias("file_count"),
+        )
+
+    def __update_folder_times(self, relative_path: str) -> None:
+        """
+        Updates the access and modification times of a refreshed folder's own row.
+
+        Args:
+            relative_path (str): The refreshed folder relative to the scanned path.
+        """
+        if relative_path == ROOT_PARENT:
+            return
+
+        try:
+            folder_stat = os.stat(os.path.join(self.path, relative_path))
+        except OSError:
+            return
+
+        is_folder = relative_path_expr() == relative_path
+        self.results_table = self.results_table.with_columns(
+            pl.when(is_folder)
+            .then(pl.lit(folder_stat.st_atime_ns).cast(pl.Datetime("ns")))
+            .otherwise(pl.col("last_access"))
+            .alias("last_access"),
+            pl.when(is_folder)
+            .then(pl.lit(folder_stat.st_mtime_ns).cast(pl.Datetime("ns")))
+            .otherwise(pl.col("last_modification"))
+            .alias("last_modification"),
+        )
+
+    def __get_paths(self, rows: pl.DataFrame) -> list[str]:
+        return rows.select(relative_path_expr()).to_series().to_list()
+
+    @staticmethod
+    def __size_contribution() -> pl.Expr:
+        return (
+            pl.when(
+                (pl.col("type") == "file")
+                | ((pl.col("type") == "folder") & pl.col("file_count").is_not_null())
+            )
+            .then(pl.col("size"))
+            .otherwise(0)
+            .alias("size")
+        )
+
+    @staticmethod
+    def __count_contribution() -> pl.Expr:
+        return (
+            pl.when(pl.col("type") == "file")
+            .then(1)
+            .otherwise(pl.col("file_count").fill_null(0))
+            .alias("file_count")
+        )
 
     def get_results(self) -> dict:
         """
@@ -81,19 +688,18 @@ class Finder:
         Returns:
             dict: A dictionary of file and folder information.
         """
-        result: dict = self.results_table.to_dict(as_series=False)
-        result["last_modification"] = [
-            QDateTime.fromString(element, QT_DATETIME_FORMAT)
-            for element in result["last_modification"]
-        ]
-        result["last_access"] = [
-            QDateTime.fromString(element, QT_DATETIME_FORMAT)
-            for element in result["last_access"]
-        ]
+        return self.results_table.to_dict(as_series=False)
+
+    def query(self) -> ResultsQuery:
+        """
+        Starts a lazy query over the results.
 
-        return result
+        Returns:
+            ResultsQuery: A query matching every result.
+        """
+        return ResultsQuery(self.results_table)
 
-    def filter_elements(self, filter_by: str, value: str) -> dict:
+    def filter_elements(self, filter_by: str, value: str) -> pl.DataFrame:
         """
         Filters the results by the specified column and value.
 
@@ -102,12 +708,58 @@ class Finder:
             value (str): The value to filter by.
 
         Returns:
-            dict: A dictionary of filtered file and folder information.
+            pl.DataFrame: The filtered file and folder information.
+        """
+        return self.query().filter(filter_by, value).collect()
+
+    def filter_by_date(
+        self,
+        column: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> pl.DataFrame:
+        """
+        Filters the results by a date range on a native time column.
+
+        Args:
+            column (str): The time column to filter by, "last_access" or "last_modification".
+            start (datetime | None): The inclusive lower bound. Naive values are local time.
+            end (datetime | None): The exclusive upper bound. Naive values are local time.
+
+        Returns:
+            pl.DataFrame: The rows whose time lies in the range, sorted by that time.
+        """
+        return self.query().filter_date(column, start, end).sort(column).collect()
+
+    def export(
+        self,
+        path: str,
+        export_format: str | None = None,
+        on_progress: Callable[[int, int], None] | None = None,
+    ) -> int:
+        """
+        Exports the results to a CSV, Parquet or NDJSON file.
+
+        Args:
+            path (str): The path of the exported file.
+            export_format (str | None): "csv", "parquet" or "ndjson". Defaults to the
+                format matching the extension of the path.
+            on_progress (Callable[[int, int], None] | None): A callback receiving the
+                number of written rows and the total number of rows.
+
+        Raises:
+            ScanCancelled: If the export was cancelled.
+
+        Returns:
+            int: The number of exported rows.
         """
-        result = self.results_table.filter(pl.col(filter_by) == value).to_dict(
-            as_series=False
+        return export_table(
+            self.results_table,
+            path,
+            export_format=export_format,
+            on_progress=on_progress,
+            cancel_event=self.cancel_event,
         )
-        return result
 
     def save_to_csv(self, path) -> None:
         """
@@ -116,4 +768,4 @@ class Finder:
         Args:
             path (str): The path where the CSV file will be saved.
         """
-        self.results_table.write_csv(path)
+        self.export(path, export_format="csv")
@@ -0,0 +1,173 @@
+import struct
+from typing import BinaryIO
+
+HEADER_SIZE = 32
+MAX_JPEG_SEGMENTS = 512
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Modes by bit depth and color type, as Pillow opens them. Combinations that
+# are not listed are left to Pillow.
+PNG_COLOR_MODES = {
+    (1, 0): "1",
+    (2, 0): "L",
+    (4, 0): "L",
+    (8, 0): "L",
+    (16, 0): "I;16",
+    (8, 2): "RGB",
+    (16, 2): "RGB",
+    (1, 3): "P",
+    (2, 3): "P",
+    (4, 3): "P",
+    (8, 3): "P",
+    (8, 4): "LA",
+    (16, 4): "RGBA",
+    (8, 6): "RGBA",
+    (16, 6): "RGBA",
+}
+BMP_COLOR_MODES = {16: "RGB", 24: "RGB", 32: "RGB"}
+JPEG_COLOR_MODES = {1: "L", 3: "RGB", 4: "CMYK"}
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_STANDALONE_MARKERS = set(range(0xD0, 0xD9)) | {0x01}
+
+
+def read_image_header(file_path: str) -> dict | None:
+    """
+    Reads the dimensions, format and color mode of an image from its header.
+
+    Only a few bytes at the start of PNG, GIF, BMP and WebP files are read. JPEG
+    files are walked segment by segment up to the frame header, seeking over the
+    segment payloads. The values match what Pillow reports. Palette BMP files are
+    not supported, because Pillow derives their mode from the whole palette, and
+    neither are PNG bit depths and color types missing from PNG_COLOR_MODES.
+
+    Args:
+        file_path (str): The path to the image.
+
+    Returns:
+        dict | None: The "width", "height", "format" and "color_mode" of the image,
+            or None if the format is not supported or the header is invalid.
+    """
+    with open(file_path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+        try:
+            if header.startswith(PNG_SIGNATURE):
+                return read_png_header(header)
+            if header[:6] in (b"GIF87a", b"GIF89a"):
+                return read_gif_header(header, f)
+            if header.startswith(b"BM"):
+                return read_bmp_header(header)
+            if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+                return read_webp_header(header)
+            if header.startswith(b"\xff\xd8"):
+                return read_jpeg_header(f)
+        except struct.error:
+            return None
+    return None
+
+
+def create_header_info(
+    width: int, height: int, format_: str, color_mode: str | None
+) -> dict | None:
+    if width <= 0 or height <= 0 or color_mode is None:
+        return None
+    return {
+        "width": width,
+        "height": height,
+        "format": format_,
+        "color_mode": color_mode,
+    }
+
+
+def read_png_header(header: bytes) -> dict | None:
+    if header[12:16] != b"IHDR":
+        return None
+
+    width, height, bit_depth, color_type = struct.unpack_from(">IIBB", header, 16)
+    color_mode = PNG_COLOR_MODES.get((bit_depth, color_type))
+    return create_header_info(width, height, "PNG", color_mode)
+
+
+def read_gif_header(header: bytes, f: BinaryIO) -> dict | None:
+    width, height, flags = struct.unpack_from("<HHB", header, 6)
+    if not flags & 0x80:
+        return None
+
+    # Like Pillow, a global palette that is a plain grayscale ramp means mode "L"
+    f.seek(13)
+    palette = f.read(3 << ((flags & 7) + 1))
+    is_grayscale = all(
+        index // 3 == palette[index] == palette[index + 1] == palette[index + 2]
+        for index in range(0, len(palette) - 2, 3)
+    )
+    return create_header_info(width, height, "GIF", "L" if is_grayscale else "P")
+
+
+def read_bmp_header(header: bytes) -> dict | None:
+    (dib_size,) = struct.unpack_from("<I", header, 14)
+    if dib_size == 12:
+        width, height, _, bit_count = struct.unpack_from("<HHHH", header, 18)
+    else:
+        width, height, _, bit_count = struct.unpack_from("<iiHH", header, 18)
+    return create_header_info(width, abs(height), "BMP", BMP_COLOR_MODES.get(bit_count))
+
+
+def read_webp_header(header: bytes) -> dict | None:
+    chunk_type = header[12:16]
+    if chunk_type == b"VP8X":
+        flags = header[20]
+        width = int.from_bytes(header[24:27], "little") + 1
+        height = int.from_bytes(header[27:30], "little") + 1
+        color_mode = "RGBA" if flags & 0x10 else "RGB"
+    elif chunk_type == b"VP8L":
+        if header[20] != 0x2F:
+            return None
+        (bits,) = struct.unpack_from("<I", header, 21)
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+        color_mode = "RGBA" if (bits >> 28) & 1 else "RGB"
+    elif chunk_type == b"VP8 ":
+        if header[23:26] != b"\x9d\x01\x2a":
+            return None
+        width, height = struct.unpack_from("<HH", header, 26)
+        width &= 0x3FFF
+        height &= 0x3FFF
+        color_mode = "RGB"
+    else:
+        return None
+    return create_header_info(width, height, "WEBP", color_mode)
+
+
+def read_jpeg_header(f: BinaryIO) -> dict | None:
+    """
+    Walks the JPEG segments up to the first frame header.
+
+    Args:
+        f (BinaryIO): The open JPEG file.
+
+    Returns:
+        dict | None: The header info, or None if no frame header was found.
+    """
+    f.seek(2)
+    for _ in range(MAX_JPEG_SEGMENTS):
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        while marker[1] == 0xFF:
+            marker = marker[1:] + f.read(1)
+            if len(marker) < 2:
+                return None
+
+        marker_type = marker[1]
+        if marker_type in JPEG_STANDALONE_MARKERS:
+            continue
+        if marker_type == 0xD9 or marker_type == 0xDA:
+            return None
+
+        (length,) = struct.unpack(">H", f.read(2))
+        if marker_type in JPEG_SOF_MARKERS:
+            _, height, width, components = struct.unpack(">BHHB", f.read(6))
+            return create_header_info(
+                width, height, "JPEG", JPEG_COLOR_MODES.get(components)
+            )
+        f.seek(length - 2, 1)
+    return None
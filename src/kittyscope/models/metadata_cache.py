@@ -0,0 +1,209 @@
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from .scan_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_DIR), "metadata.sqlite3")
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class MetadataCache:
+    """
+    A two-tier cache of Researcher results keyed by (path, variant, size, mtime).
+
+    Recently used results are kept in an in-memory LRU. Every result is also
+    pickled into a SQLite database, so unchanged files are not probed again by
+    later sessions or by other processes of a batch probe. An entry is stale as
+    soon as the size or the mtime of its file changes, and is replaced by the
+    next store.
+
+    Attributes:
+        db_path (str | None): The SQLite database file. None keeps the cache in memory only.
+        max_entries (int): The maximal number of entries of the in-memory tier.
+        memory_hits (int): The number of lookups answered by the in-memory tier.
+        disk_hits (int): The number of lookups answered by the SQLite tier.
+        misses (int): The number of lookups that found no valid entry.
+    """
+
+    def __init__(
+        self,
+        db_path: str | None = DEFAULT_DB_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        """
+        Initializes the MetadataCache object.
+
+        Args:
+            db_path (str | None): The SQLite database file. None keeps the cache in memory only.
+            max_entries (int): The maximal number of entries of the in-memory tier.
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[str, dict]] = OrderedDict()
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def get_stats(self) -> dict:
+        """
+        Returns the hit and miss counters.
+
+        Returns:
+            dict: The "memory_hits", "disk_hits", "hits" and "misses" counters.
+        """
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def get_key(self, file_path: str, variant: str = "") -> tuple[str, str, int, int]:
+        """
+        Returns the cache key of a file.
+
+        Args:
+            file_path (str): The path to the file.
+            variant (str): The cache variant of the researcher.
+
+        Returns:
+            tuple[str, str, int, int]: The absolute path, the variant, the size and
+                the mtime in nanoseconds.
+        """
+        file_stat = os.stat(file_path)
+        return (
+            os.path.abspath(file_path),
+            variant,
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+        )
+
+    def get(self, key: tuple[str, str, int, int]) -> tuple[str, dict] | None:
+        """
+        Looks up the Researcher result of a file.
+
+        Args:
+            key (tuple[str, str, int, int]): The key returned by get_key.
+
+        Returns:
+            tuple[str, dict] | None: The cached tag and file information, or None on a miss.
+        """
+        with self._lock:
+            file_info = self._entries.get(key)
+            if file_info is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return file_info
+
+            file_info = self.__load(key)
+            if file_info is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self.__remember(key, file_info)
+            return file_info
+
+    def store(
+        self, key: tuple[str, str, int, int], file_info: tuple[str, dict]
+    ) -> None:
+        """
+        Stores the Researcher result of a file in both tiers.
+
+        Args:
+            key (tuple[str, str, int, int]): The key returned by get_key.
+            file_info (tuple[str, dict]): The tag and file information.
+        """
+        with self._lock:
+            self.__remember(key, file_info)
+            connection = self.__get_connection()
+            if connection is None:
+                return
+
+            try:
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO file_info VALUES (?, ?, ?, ?, ?)",
+                        (*key, pickle.dumps(file_info)),
+                    )
+            except (sqlite3.Error, pickle.PicklingError, TypeError):
+                pass
+
+    def clear(self) -> None:
+        """
+        Removes every entry from both tiers and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.memory_hits = self.disk_hits = self.misses = 0
+            connection = self.__get_connection()
+            if connection is not None:
+                with connection:
+                    connection.execute("DELETE FROM file_info")
+
+    def __remember(self, key: tuple, file_info: tuple[str, dict]) -> None:
+        self._entries[key] = file_info
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __load(self, key: tuple[str, str, int, int]) -> tuple[str, dict] | None:
+        """
+        Reads a valid entry from the SQLite tier.
+
+        Args:
+            key (tuple[str, str, int, int]): The key returned by get_key.
+
+        Returns:
+            tuple[str, dict] | None: The cached tag and file information, or None.
+        """
+        connection = self.__get_connection()
+        if connection is None:
+            return None
+
+        try:
+            row = connection.execute(
+                "SELECT info FROM file_info "
+                "WHERE path = ? AND variant = ? AND size = ? AND mtime_ns = ?",
+                key,
+            ).fetchone()
+            return None if row is None else pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError):
+            return None
+
+    def __get_connection(self) -> sqlite3.Connection | None:
+        """
+        Opens the SQLite database on first use.
+
+        Returns:
+            sqlite3.Connection | None: The connection, or None if the cache is
+                memory only or the database cannot be opened.
+        """
+        if self._connection is not None or self.db_path is None:
+            return self._connection
+
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            connection = sqlite3.connect(
+                self.db_path, timeout=30, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS file_info (path TEXT, variant TEXT, "
+                "size INTEGER, mtime_ns INTEGER, info BLOB, PRIMARY KEY (path, variant))"
+            )
+        except (OSError, sqlite3.Error):
+            self.db_path = None
+            return None
+
+        self._connection = connection
+        return connection
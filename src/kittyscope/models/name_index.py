@@ -0,0 +1,220 @@
+import re
+
+import polars as pl
+
+GRAM_SIZE = 3
+SEARCH_MODES = ("substring", "glob", "regex")
+GLOB_WILDCARDS = re.compile(r"\*|\?|\[[^\]]*\]")
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    Translates a glob pattern into an anchored regular expression.
+
+    "*" matches any text, "?" matches one character, and "[...]" matches one
+    character of a class, negated by a leading "!". Other characters match
+    themselves.
+
+    Args:
+        pattern (str): The glob pattern.
+
+    Returns:
+        str: The regular expression matching whole names.
+    """
+    parts = []
+    position = 0
+    for match in GLOB_WILDCARDS.finditer(pattern):
+        parts.append(re.escape(pattern[position : match.start()]))
+        wildcard = match.group()
+        if wildcard == "*":
+            parts.append(".*")
+        elif wildcard == "?":
+            parts.append(".")
+        else:
+            negated = wildcard.startswith("[!")
+            characters = wildcard[2 if negated else 1 : -1]
+            characters = characters.replace("\\", "\\\\").replace("[", "\\[")
+            parts.append(("[^" if negated else "[") + characters + "]")
+        position = match.end()
+    parts.append(re.escape(pattern[position:]))
+    return "^" + "".join(parts) + "$"
+
+
+def get_grams(text: str) -> list[str]:
+    """
+    Returns the overlapping GRAM_SIZE character slices of a text.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        list[str]: The slices, empty if the text is shorter than GRAM_SIZE.
+    """
+    return [
+        text[start : start + GRAM_SIZE] for start in range(len(text) - GRAM_SIZE + 1)
+    ]
+
+
+class NameIndexSegment:
+    """
+    A trigram index over a contiguous range of rows.
+
+    Attributes:
+        offset (int): The row of the first name.
+        names (pl.Series): The lower-cased names, null for rows without a name,
+            which are left out of the postings and match no search.
+        postings (dict[str, pl.Series]): The rows relative to offset of the names
+            containing each trigram.
+    """
+
+    def __init__(self, names: pl.Series, offset: int) -> None:
+        """
+        Initializes the NameIndexSegment object.
+
+        Trigrams are sliced column-wise for every position with polars, so the
+        index is built without a Python loop over the names.
+
+        Args:
+            names (pl.Series): The names to index.
+            offset (int): The row of the first name.
+        """
+        self.offset = offset
+        self.names = names.cast(pl.String).str.to_lowercase()
+
+        names_table = pl.DataFrame({"name": self.names}).with_row_index("row").lazy()
+        max_length = self.names.str.len_chars().max() or 0
+        grams = [
+            names_table.select(
+                pl.col("name").str.slice(start, GRAM_SIZE).alias("gram"), "row"
+            ).filter(pl.col("gram").str.len_chars() == GRAM_SIZE)
+            for start in range(max_length - GRAM_SIZE + 1)
+        ]
+        self.postings: dict[str, pl.Series] = {}
+        if grams:
+            postings = pl.concat(grams).group_by("gram").agg("row").collect()
+            self.postings = dict(zip(postings["gram"], postings["row"]))
+
+    def find_substring(self, text: str) -> pl.Series:
+        """
+        Finds the names containing a lower-cased text.
+
+        The names are looked up by the rarest trigram of the text, and only those
+        candidates are compared. Texts shorter than a trigram scan every name.
+
+        Args:
+            text (str): The lower-cased text to search for.
+
+        Returns:
+            pl.Series: The matching rows relative to offset, in any order.
+        """
+        grams = get_grams(text)
+        if not grams:
+            return self.names.str.contains(text, literal=True).arg_true()
+
+        postings = [self.postings.get(gram) for gram in grams]
+        if any(rows is None for rows in postings):
+            return pl.Series(dtype=pl.UInt32)
+
+        candidates = min(postings, key=len).unique()
+        return candidates.filter(
+            self.names.gather(candidates).str.contains(text, literal=True)
+        )
+
+    def find_regex(self, pattern: str, literal: str = "") -> pl.Series:
+        """
+        Finds the names matching a regular expression.
+
+        Args:
+            pattern (str): The regular expression, matched case-insensitively.
+            literal (str): A lower-cased text every match contains, used to narrow
+                the candidates with the index.
+
+        Returns:
+            pl.Series: The matching rows relative to offset, in any order.
+        """
+        if len(literal) < GRAM_SIZE:
+            return self.names.str.contains(pattern).arg_true()
+
+        candidates = self.find_substring(literal)
+        return candidates.filter(self.names.gather(candidates).str.contains(pattern))
+
+
+class NameIndex:
+    """
+    An index over the names of a results table for fast search as you type.
+
+    The index is made of segments, so rows appended while a scan streams in are
+    indexed on their own instead of rebuilding the whole index. Search is case
+    insensitive and returns rows of the indexed table, in table order.
+
+    Attributes:
+        segments (list[NameIndexSegment]): The indexed row ranges.
+    """
+
+    def __init__(self, names: pl.Series | None = None) -> None:
+        """
+        Initializes the NameIndex object.
+
+        Args:
+            names (pl.Series | None): The names of the rows to index.
+        """
+        self.segments: list[NameIndexSegment] = []
+        if names is not None:
+            self.append(names)
+
+    def __len__(self) -> int:
+        return sum(segment.names.len() for segment in self.segments)
+
+    def append(self, names: pl.Series) -> None:
+        """
+        Indexes the names of rows appended to the table.
+
+        Args:
+            names (pl.Series): The names of the appended rows.
+        """
+        if names.len() > 0:
+            self.segments.append(NameIndexSegment(names, len(self)))
+
+    def search(self, pattern: str, mode: str = "substring") -> pl.Series:
+        """
+        Finds the rows whose name matches a pattern.
+
+        Args:
+            pattern (str): The text to search for.
+            mode (str): "substring" to find names containing the pattern, "glob" to
+                match whole names against a pattern with "*", "?" and "[...]"
+                wildcards, or "regex" to find names containing a match of a
+                regular expression.
+
+        Raises:
+            Exception: If the mode is unknown.
+
+        Returns:
+            pl.Series: The matching rows in ascending order. An invalid regular
+                expression matches nothing.
+        """
+        if mode not in SEARCH_MODES:
+            raise Exception(f"Unknown search mode: {mode}")
+        if not pattern:
+            return pl.Series(dtype=pl.UInt32)
+
+        results = []
+        for segment in self.segments:
+            try:
+                match mode:
+                    case "substring":
+                        rows = segment.find_substring(pattern.lower())
+                    case "glob":
+                        literal = max(GLOB_WILDCARDS.split(pattern.lower()), key=len)
+                        rows = segment.find_regex(
+                            "(?is)" + glob_to_regex(pattern), literal
+                        )
+                    case "regex":
+                        rows = segment.find_regex("(?i)" + pattern)
+            except pl.exceptions.ComputeError:
+                return pl.Series(dtype=pl.UInt32)
+            results.append(rows + segment.offset)
+
+        if not results:
+            return pl.Series(dtype=pl.UInt32)
+        return pl.concat(results).sort()
@@ -0,0 +1,532 @@
+import mmap
+import re
+import zlib
+from typing import NamedTuple
+
+WHITESPACE = b" \t\r\n\x0c\x00"
+DELIMITERS = b"()<>[]{}/%"
+STARTXREF_WINDOW = 1024
+MAX_XREF_SECTIONS = 64
+MAX_RESOLVE_DEPTH = 32
+
+STARTXREF_PATTERN = re.compile(rb"startxref\s+(\d+)")
+XREF_ENTRY_PATTERN = re.compile(rb"\s*(\d{1,10})\s+(\d{1,5})\s+([nf])")
+XREF_ENTRY_SIZE = 20
+INTEGER_PATTERN = re.compile(rb"[+-]?\d+")
+REFERENCE_PATTERN = re.compile(rb"\s+(\d+)\s+R(?=[\s()<>\[\]{}/%]|$)")
+
+
+class Reference(NamedTuple):
+    number: int
+    generation: int
+
+
+class Stream(NamedTuple):
+    dictionary: dict
+    data: bytes
+
+
+def read_pdf_info(file_path: str) -> dict | None:
+    """
+    Reads the document information and the page count of a PDF file.
+
+    The file is memory-mapped, and only the cross-reference sections, the
+    trailer, the Info dictionary, the catalog and the root of the page tree are
+    parsed. The page count is the /Count of the root /Pages node, so no page is
+    ever materialized. Cross-reference streams and object streams compressed
+    with FlateDecode are supported. Text strings without a byte order mark are
+    decoded as Latin-1, which matches PDFDocEncoding for printable characters.
+
+    Args:
+        file_path (str): The path to the PDF file.
+
+    Returns:
+        dict | None: The "author", "title", "pages_count", "subject", "creator"
+            and "producer" of the document with "-" for missing values, or None
+            if the file is encrypted or could not be parsed.
+    """
+    try:
+        with open(file_path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            document = PdfDocument(data)
+            return document.get_info()
+    except Exception:
+        return None
+
+
+class PdfDocument:
+    """
+    A minimal reader of the objects needed for the document metadata.
+
+    Attributes:
+        data (mmap.mmap): The mapped PDF file.
+        trailer (dict): The merged trailer dictionaries, newest first.
+        sections (list[dict | tuple[int, int, int]]): The cross-reference sections,
+            newest first. Tables in the standard 20-byte layout are kept as the
+            first object number, the count and the position of their entries and
+            looked up on demand. Other sections map object numbers to
+            ("offset", position), ("compressed", object stream number, index) or
+            None for free objects.
+    """
+
+    def __init__(self, data: mmap.mmap) -> None:
+        self.data = data
+        self.trailer: dict = {}
+        self.sections: list[dict | tuple[int, int, int]] = []
+        self._object_streams: dict[int, tuple[bytes, list[int]]] = {}
+        self.__read_xref_sections()
+
+    def get_info(self) -> dict | None:
+        if "Encrypt" in self.trailer:
+            return None
+
+        root = self.resolve(self.trailer["Root"])
+        pages = self.resolve(root["Pages"])
+        pages_count = self.resolve(pages["Count"])
+        info = self.resolve(self.trailer.get("Info")) or {}
+        if not isinstance(pages_count, int) or not isinstance(info, dict):
+            return None
+
+        return {
+            "author": self.__get_text(info, "Author"),
+            "title": self.__get_text(info, "Title"),
+            "pages_count": pages_count if pages_count else "-",
+            "subject": self.__get_text(info, "Subject"),
+            "creator": self.__get_text(info, "Creator"),
+            "producer": self.__get_text(info, "Producer"),
+        }
+
+    def resolve(self, value, depth: int = 0):
+        """
+        Follows references until a direct object is reached.
+
+        Args:
+            value: A direct object or a Reference.
+            depth (int): The number of references followed so far.
+
+        Returns:
+            The direct object, or None for a missing object.
+        """
+        if not isinstance(value, Reference):
+            return value
+        if depth > MAX_RESOLVE_DEPTH:
+            raise Exception("Reference chain is too long")
+
+        location = self.__get_location(value.number)
+        if location is None:
+            return None
+        if location[0] == "offset":
+            _, obj = self.__read_indirect_object(location[1])
+        else:
+            obj = self.__read_compressed_object(location[1], location[2])
+        return self.resolve(obj, depth + 1)
+
+    def __get_location(self, number: int) -> tuple | None:
+        """
+        Finds an object in the newest cross-reference section that lists it.
+
+        Args:
+            number (int): The object number.
+
+        Returns:
+            tuple | None: The location of the object, or None if it is free or missing.
+        """
+        for section in self.sections:
+            if isinstance(section, dict):
+                if number in section:
+                    return section[number]
+                continue
+
+            first, count, position = section
+            if first <= number < first + count:
+                entry_position = position + (number - first) * XREF_ENTRY_SIZE
+                match = XREF_ENTRY_PATTERN.match(self.data, entry_position)
+                if match is None:
+                    raise Exception("Invalid cross-reference entry")
+                if match.group(3) == b"n":
+                    return "offset", int(match.group(1))
+                return None
+        return None
+
+    def __get_text(self, info: dict, key: str) -> str:
+        value = self.resolve(info.get(key))
+        if isinstance(value, bytes) and value:
+            return decode_text(value) or "-"
+        return "-"
+
+    def __read_xref_sections(self) -> None:
+        """
+        Reads the cross-reference sections from the last one along the /Prev chain.
+        """
+        tail_start = max(0, len(self.data) - STARTXREF_WINDOW)
+        matches = list(STARTXREF_PATTERN.finditer(self.data, tail_start))
+        if not matches:
+            raise Exception("startxref not found")
+
+        offset = int(matches[-1].group(1))
+        visited = set()
+        while offset is not None and offset not in visited:
+            if len(visited) >= MAX_XREF_SECTIONS:
+                raise Exception("Too many cross-reference sections")
+            visited.add(offset)
+
+            trailer = self.__read_xref_section(offset)
+            if "XRefStm" in trailer and trailer["XRefStm"] not in visited:
+                visited.add(trailer["XRefStm"])
+                self.__read_xref_section(trailer["XRefStm"])
+            for key, value in trailer.items():
+                self.trailer.setdefault(key, value)
+            offset = trailer.get("Prev")
+
+    def __read_xref_section(self, offset: int) -> dict:
+        """
+        Reads one cross-reference table or stream. Entries of newer sections win.
+
+        Args:
+            offset (int): The position of the section.
+
+        Returns:
+            dict: The trailer dictionary of the section.
+        """
+        position = skip_whitespace(self.data, offset)
+        if self.data[position : position + 4] != b"xref":
+            return self.__read_xref_stream(position)
+
+        position += 4
+        while True:
+            position = skip_whitespace(self.data, position)
+            if self.data[position : position + 7] == b"trailer":
+                trailer, _ = parse_object(self.data, position + 7)
+                return trailer
+
+            first, position = parse_object(self.data, position)
+            count, position = parse_object(self.data, position)
+            position = skip_whitespace(self.data, position)
+            end = position + count * XREF_ENTRY_SIZE
+            if count == 0 or self.data[end - 2 : end] in (b" \n", b" \r", b"\r\n"):
+                self.sections.append((first, count, position))
+                position = end
+                continue
+
+            entries = {}
+            for number in range(first, first + count):
+                match = XREF_ENTRY_PATTERN.match(self.data, position)
+                if match is None:
+                    raise Exception("Invalid cross-reference entry")
+                position = match.end()
+                is_used = match.group(3) == b"n"
+                entries[number] = ("offset", int(match.group(1))) if is_used else None
+            self.sections.append(entries)
+
+    def __read_xref_stream(self, offset: int) -> dict:
+        _, stream = self.__read_indirect_object(offset)
+        if not isinstance(stream, Stream) or stream.dictionary.get("Type") != "XRef":
+            raise Exception("Invalid cross-reference stream")
+
+        dictionary = stream.dictionary
+        widths = dictionary["W"]
+        index = dictionary.get("Index", [0, dictionary["Size"]])
+        data = self.__decode_stream(stream)
+
+        entries = {}
+        position = 0
+        for start, count in zip(index[::2], index[1::2]):
+            for number in range(start, start + count):
+                fields = []
+                for width in widths:
+                    fields.append(
+                        int.from_bytes(data[position : position + width], "big")
+                    )
+                    position += width
+                entry_type = fields[0] if widths[0] else 1
+                if entry_type == 1:
+                    entries[number] = ("offset", fields[1])
+                elif entry_type == 2:
+                    entries[number] = ("compressed", fields[1], fields[2])
+                else:
+                    entries[number] = None
+        self.sections.append(entries)
+        return dictionary
+
+    def __read_indirect_object(self, offset: int) -> tuple[int, object]:
+        """
+        Reads the "n g obj" object at the given position.
+
+        Args:
+            offset (int): The position of the object.
+
+        Returns:
+            tuple[int, object]: The object number and the object.
+        """
+        number, position = parse_object(self.data, offset)
+        _, position = parse_object(self.data, position)
+        keyword, position = parse_object(self.data, position)
+        if keyword != b"obj":
+            raise Exception("Invalid indirect object")
+
+        obj, position = parse_object(self.data, position)
+        position = skip_whitespace(self.data, position)
+        if isinstance(obj, dict) and self.data[position : position + 6] == b"stream":
+            position += 6
+            if self.data[position : position + 2] == b"\r\n":
+                position += 2
+            elif self.data[position : position + 1] in (b"\n", b"\r"):
+                position += 1
+            length = self.resolve(obj["Length"])
+            obj = Stream(obj, bytes(self.data[position : position + length]))
+        return number, obj
+
+    def __read_compressed_object(self, stream_number: int, index: int):
+        """
+        Reads an object stored in an object stream.
+
+        Args:
+            stream_number (int): The object number of the object stream.
+            index (int): The index of the object in the stream.
+
+        Returns:
+            The object.
+        """
+        if stream_number not in self._object_streams:
+            stream = self.resolve(Reference(stream_number, 0))
+            data = self.__decode_stream(stream)
+            first = stream.dictionary["First"]
+            offsets = []
+            position = 0
+            for _ in range(stream.dictionary["N"]):
+                _, position = parse_object(data, position)
+                object_offset, position = parse_object(data, position)
+                offsets.append(first + object_offset)
+            self._object_streams[stream_number] = (data, offsets)
+
+        data, offsets = self._object_streams[stream_number]
+        obj, _ = parse_object(data, offsets[index])
+        return obj
+
+    def __decode_stream(self, stream: Stream) -> bytes:
+        """
+        Applies the FlateDecode filter and PNG predictors of a stream.
+
+        Args:
+            stream (Stream): The stream.
+
+        Returns:
+            bytes: The decoded data.
+        """
+        filters = self.resolve(stream.dictionary.get("Filter"))
+        filters = filters if isinstance(filters, list) else [filters]
+        if filters == [None]:
+            return stream.data
+        if filters != ["FlateDecode"]:
+            raise Exception("Unsupported stream filter")
+
+        data = zlib.decompress(stream.data)
+        params = self.resolve(stream.dictionary.get("DecodeParms")) or {}
+        if isinstance(params, list):
+            params = params[0] or {}
+        predictor = params.get("Predictor", 1)
+        if predictor < 10:
+            if predictor != 1:
+                raise Exception("Unsupported predictor")
+            return data
+        return undo_png_predictor(data, params.get("Columns", 1))
+
+
+def undo_png_predictor(data: bytes, columns: int) -> bytes:
+    """
+    Reverses the per-row PNG filters of single-byte samples.
+
+    Args:
+        data (bytes): The filtered rows, each starting with its filter type.
+        columns (int): The number of bytes of every row.
+
+    Returns:
+        bytes: The unfiltered rows.
+    """
+    output = bytearray()
+    previous = bytearray(columns)
+    for start in range(0, len(data), columns + 1):
+        filter_type = data[start]
+        row = bytearray(data[start + 1 : start + 1 + columns])
+        for i in range(len(row)):
+            left = row[i - 1] if i else 0
+            up = previous[i]
+            up_left = previous[i - 1] if i else 0
+            if filter_type == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif filter_type == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif filter_type == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif filter_type == 4:
+                estimate = left + up - up_left
+                distances = (
+                    abs(estimate - left),
+                    abs(estimate - up),
+                    abs(estimate - up_left),
+                )
+                if distances[0] <= distances[1] and distances[0] <= distances[2]:
+                    predicted = left
+                elif distances[1] <= distances[2]:
+                    predicted = up
+                else:
+                    predicted = up_left
+                row[i] = (row[i] + predicted) & 0xFF
+        output += row
+        previous = row
+    return bytes(output)
+
+
+def decode_text(value: bytes) -> str:
+    if value.startswith(b"\xfe\xff"):
+        return value[2:].decode("utf-16-be", errors="replace")
+    if value.startswith(b"\xef\xbb\xbf"):
+        return value[3:].decode("utf-8", errors="replace")
+    return value.decode("latin-1")
+
+
+def skip_whitespace(data, position: int) -> int:
+    while position < len(data):
+        char = data[position]
+        if char == 0x25:
+            while position < len(data) and data[position] not in b"\r\n":
+                position += 1
+        elif char in WHITESPACE:
+            position += 1
+        else:
+            break
+    return position
+
+
+def read_token(data, position: int) -> tuple[bytes, int]:
+    end = position
+    while (
+        end < len(data) and data[end] not in WHITESPACE and data[end] not in DELIMITERS
+    ):
+        end += 1
+    return bytes(data[position:end]), end
+
+
+def parse_object(data, position: int) -> tuple[object, int]:
+    """
+    Parses the PDF object starting at the given position.
+
+    Names become str, strings become bytes, and keywords other than true, false
+    and null are returned as bytes.
+
+    Args:
+        data: The buffer holding the object.
+        position (int): The position to start at.
+
+    Returns:
+        tuple[object, int]: The object and the position after it.
+    """
+    position = skip_whitespace(data, position)
+    char = data[position : position + 1]
+
+    if data[position : position + 2] == b"<<":
+        dictionary = {}
+        position += 2
+        while True:
+            position = skip_whitespace(data, position)
+            if data[position : position + 2] == b">>":
+                return dictionary, position + 2
+            key, position = parse_object(data, position)
+            value, position = parse_object(data, position)
+            dictionary[key] = value
+
+    if char == b"[":
+        array = []
+        position += 1
+        while True:
+            position = skip_whitespace(data, position)
+            if data[position : position + 1] == b"]":
+                return array, position + 1
+            value, position = parse_object(data, position)
+            array.append(value)
+
+    if char == b"/":
+        token, position = read_token(data, position + 1)
+        name = re.sub(
+            rb"#([0-9A-Fa-f]{2})", lambda m: bytes.fromhex(m.group(1).decode()), token
+        )
+        return name.decode("latin-1"), position
+
+    if char == b"(":
+        return parse_literal_string(data, position + 1)
+
+    if char == b"<":
+        end = data.find(b">", position)
+        digits = re.sub(rb"\s", b"", bytes(data[position + 1 : end]))
+        if len(digits) % 2:
+            digits += b"0"
+        return bytes.fromhex(digits.decode()), end + 1
+
+    token, end = read_token(data, position)
+    if not token:
+        raise Exception("Unexpected delimiter")
+    if INTEGER_PATTERN.fullmatch(token):
+        reference = REFERENCE_PATTERN.match(data, end)
+        if reference is not None:
+            return Reference(int(token), int(reference.group(1))), reference.end()
+        return int(token), end
+    if token == b"true" or token == b"false":
+        return token == b"true", end
+    if token == b"null":
+        return None, end
+    try:
+        return float(token), end
+    except ValueError:
+        return token, end
+
+
+ESCAPES = {
+    ord("n"): b"\n",
+    ord("r"): b"\r",
+    ord("t"): b"\t",
+    ord("b"): b"\b",
+    ord("f"): b"\f",
+}
+
+
+def parse_literal_string(data, position: int) -> tuple[bytes, int]:
+    """
+    Parses a literal string after its opening parenthesis.
+
+    Args:
+        data: The buffer holding the string.
+        position (int): The position after the opening parenthesis.
+
+    Returns:
+        tuple[bytes, int]: The string and the position after the closing parenthesis.
+    """
+    output = bytearray()
+    depth = 1
+    while True:
+        char = data[position]
+        position += 1
+        if char == 0x5C:
+            char = data[position]
+            position += 1
+            if char in ESCAPES:
+                output += ESCAPES[char]
+            elif 0x30 <= char <= 0x37:
+                digits = bytes([char])
+                while len(digits) < 3 and 0x30 <= data[position] <= 0x37:
+                    digits += bytes([data[position]])
+                    position += 1
+                output.append(int(digits, 8) & 0xFF)
+            elif char == 0x0D:
+                if data[position] == 0x0A:
+                    position += 1
+            elif char != 0x0A:
+                output.append(char)
+            continue
+        if char == 0x28:
+            depth += 1
+        elif char == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(output), position
+        output.append(char)
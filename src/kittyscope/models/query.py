@@ -0,0 +1,219 @@
+from datetime import datetime
+
+import polars as pl
+
+from .analyzer import Analyzer
+from .scanner import to_scan_time
+
+
+class ResultsQuery:
+    """
+    A composable query over a results table.
+
+    Every filter and sort returns a new query that extends a polars LazyFrame
+    plan, and nothing is computed until the query is collected. Filters,
+    sorting, slicing and the Analyzer aggregations therefore run as one
+    optimized plan, and only the requested rows are materialized.
+
+    Attributes:
+        frame (pl.LazyFrame): The lazy plan of the query.
+    """
+
+    def __init__(self, results_table: pl.DataFrame | pl.LazyFrame) -> None:
+        """
+        Initializes the ResultsQuery object.
+
+        Args:
+            results_table (pl.DataFrame | pl.LazyFrame): The results table to query.
+        """
+        self.frame = results_table.lazy()
+
+    def filter(self, column: str, value) -> "ResultsQuery":
+        """
+        Keeps the rows whose column equals the value.
+
+        Args:
+            column (str): The column to filter by.
+            value: The value to keep.
+
+        Returns:
+            ResultsQuery: The extended query.
+        """
+        return ResultsQuery(self.frame.filter(pl.col(column) == value))
+
+    def filter_type(self, *types: str) -> "ResultsQuery":
+        """
+        Keeps the rows of the given element types.
+
+        Args:
+            *types (str): "file", "folder" or "unknown".
+
+        Returns:
+            ResultsQuery: The extended query.
+        """
+        return ResultsQuery(self.frame.filter(pl.col("type").is_in(types)))
+
+    def filter_file_type(self, *file_types: str) -> "ResultsQuery":
+        """
+        Keeps the rows classified as one of the given file types.
+
+        Args:
+            *file_types (str): File types like "image" or "document".
+
+        Returns:
+            ResultsQuery: The extended query.
+        """
+        return ResultsQuery(
+            self.frame.filter(pl.col("file_type").cast(pl.String).is_in(file_types))
+        )
+
+    def filter_extension(self, *extensions: str) -> "ResultsQuery":
+        """
+        Keeps the rows with one of the given extensions.
+
+        Args:
+            *extensions (str): Extensions with the leading dot, in any case.
+
+        Returns:
+            ResultsQuery: The extended query.
+        """
+        extensions = [extension.lower() for extension in extensions]
+        return ResultsQuery(
+            self.frame.filter(pl.col("extension").cast(pl.String).is_in(extensions))
+        )
+
+    def filter_size(
+        self, min_size: int | None = None, max_size: int | None = None
+    ) -> "ResultsQuery":
+        """
+        Keeps the rows whose size lies in the range.
+
+        Args:
+            min_size (int | None): The inclusive lower bound in bytes.
+            max_size (int | None): The inclusive upper bound in bytes.
+
+        Returns:
+            ResultsQuery: The extended query.
+        """
+        condition = pl.lit(True)
+        if min_size is not None:
+            condition &= pl.col("size") >= min_size
+        if max_size is not None:
+            condition &= pl.col("size") <= max_size
+        return ResultsQuery(self.frame.filter(condition))
+
+    def filter_date(
+        self,
+        column: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> "ResultsQuery":
+        """
+        Keeps the rows whose time lies in the range.
+
+        Args:
+            column (str): The time column, "last_access" or "last_modification".
+            start (datetime | None): The inclusive lower bound. Naive values are local time.
+            end (datetime | None): The exclusive upper bound. Naive values are local time.
+
+        Returns:
+            ResultsQuery: The extended query.
+        """
+        condition = pl.lit(True)
+        if start is not None:
+            condition &= pl.col(column) >= to_scan_time(start)
+        if end is not None:
+            condition &= pl.col(column) < to_scan_time(end)
+        return ResultsQuery(self.frame.filter(condition))
+
+    def filter_name(
+        self, pattern: str, regex: bool = False, case_sensitive: bool = False
+    ) -> "ResultsQuery":
+        """
+        Keeps the rows whose name contains the pattern.
+
+        Args:
+            pattern (str): The text or regular expression to search for.
+            regex (bool): If True, the pattern is a regular expression.
+            case_sensitive (bool): If True, the case of the letters must match.
+
+        Returns:
+            ResultsQuery: The extended query.
+        """
+        name = pl.col("name")
+        if regex:
+            pattern = pattern if case_sensitive else "(?i)" + pattern
+            condition = name.str.contains(pattern)
+        elif case_sensitive:
+            condition = name.str.contains(pattern, literal=True)
+        else:
+            condition = name.str.to_lowercase().str.contains(
+                pattern.lower(), literal=True
+            )
+        return ResultsQuery(self.frame.filter(condition))
+
+    def sort(self, column: str, descending: bool = False) -> "ResultsQuery":
+        """
+        Sorts the rows by a column, keeping nulls last and ties in scan order.
+
+        Args:
+            column (str): The column to sort by.
+            descending (bool): If True, sorts in descending order.
+
+        Returns:
+            ResultsQuery: The extended query.
+        """
+        return ResultsQuery(
+            self.frame.sort(
+                column, descending=descending, nulls_last=True, maintain_order=True
+            )
+        )
+
+    def collect(self) -> pl.DataFrame:
+        """
+        Runs the query.
+
+        Returns:
+            pl.DataFrame: The matching rows.
+        """
+        return self.frame.collect()
+
+    def collect_slice(self, offset: int, length: int) -> pl.DataFrame:
+        """
+        Runs the query for a window of the matching rows only.
+
+        Args:
+            offset (int): The index of the first row.
+            length (int): The maximal number of rows.
+
+        Returns:
+            pl.DataFrame: The matching rows in the window.
+        """
+        return self.frame.slice(offset, length).collect()
+
+    def count(self) -> int:
+        """
+        Counts the matching rows without materializing them.
+
+        Returns:
+            int: The number of matching rows.
+        """
+        return self.frame.select(pl.len()).collect().item()
+
+    def get_type_stat(self) -> dict[str, dict[str, list]]:
+        """
+        Runs Analyzer.get_type_stat over the matching rows.
+
+        Returns:
+            dict[str, dict[str, list]]: The counts per element type and per extension.
+        """
+        return Analyzer().get_type_stat(self.frame)
+
+    def get_file_type_stat(self) -> dict:
+        """
+        Runs Analyzer.get_file_type_stat over the matching rows.
+
+        Returns:
+            dict[str, list]: A dictionary with the count of entries for each file type.
+        """
+        return Analyzer().get_file_type_stat(self.frame)
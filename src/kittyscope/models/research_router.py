@@ -2,6 +2,9 @@ from pathlib import Path
 
 from kittyscope.utils import EXTENSION_TYPE_MAPPING
 
+from .content_sniffer import sniff_file
+from .ffprobe_pool import FFprobePool
+from .metadata_cache import MetadataCache
 from .researchers import (
     AudioResearcher,
     ImageResearcher,
@@ -11,33 +14,134 @@ from .researchers import (
 
 
 class ResearchRouter:
-    def __init__(self):
+    def __init__(
+        self,
+        cache: MetadataCache | None = None,
+        with_exif: bool = False,
+        ffprobe_pool: FFprobePool | None = None,
+        sniff_content: bool = False,
+    ):
         """
         Initializes the ResearchRouter instance.
 
-        The ResearchRouter maps file extensions to the relevant Researcher objects.
+        The ResearchRouter maps file types to the relevant Researcher objects.
+        The type of a file is its detected content type if one is known, and the
+        type of its extension otherwise. Their results are cached by
+        (path, size, mtime), so unchanged files are only researched once.
+
+        Args:
+            cache (MetadataCache | None): The cache of researched files. Defaults to
+                a cache backed by the shared SQLite database.
+            with_exif (bool): If True, image results include the decoded EXIF tags.
+            ffprobe_pool (FFprobePool | None): The pool probing video and audio files.
+            sniff_content (bool): If True, files routed without a detected type
+                are sniffed for one before falling back to their extension.
         """
+        ffprobe_pool = ffprobe_pool or FFprobePool()
+        self.cache = cache if cache is not None else MetadataCache()
         self.researchers = {
-            "image": ImageResearcher(),
+            "image": ImageResearcher(with_exif=with_exif),
             "document": PdfResearcher(),
-            "video": VideoResearcher(),
-            "audio": AudioResearcher(),
+            "video": VideoResearcher(ffprobe_pool),
+            "audio": AudioResearcher(ffprobe_pool),
         }
+        self.sniff_content = sniff_content
+
+    def get_file_type(
+        self, file_path: str, detected_type: str | None = None
+    ) -> str | None:
+        """
+        Returns the type a file is routed by.
+
+        Args:
+            file_path (str): The path to the file.
+            detected_type (str | None): The type detected from the content of the
+                file, like the "detected_type" column written by sniff_files.
+
+        Returns:
+            str | None: The detected type if there is one, or else the type of the
+                file extension. None if neither is known.
+        """
+        if detected_type is None and self.sniff_content:
+            detected_type = sniff_file(file_path)
+        if detected_type is not None:
+            return detected_type
+        return EXTENSION_TYPE_MAPPING.get(Path(file_path).suffix.lower())
 
-    def get_file_info(self, file_path: str) -> dict:
+    def get_file_info(self, file_path: str, detected_type: str | None = None) -> dict:
         """
-        Retrieves file information using the Researcher corresponding to the file extension.
+        Retrieves file information using the Researcher corresponding to the file type.
+
+        A cached result is returned if the size and mtime of the file are unchanged.
 
         Args:
             file_path (str): The path to the file.
+            detected_type (str | None): The type detected from the content of the file.
 
         Returns:
-            dict: The file information if the file extension is supported, otherwise None.
+            dict: The file information if the file type is supported, otherwise None.
         """
-        file_path = Path(file_path)
-        file_extension = file_path.suffix.lower()
-        if file_extension in EXTENSION_TYPE_MAPPING:
-            file_type = EXTENSION_TYPE_MAPPING[file_extension]
-            file_info = self.researchers[file_type].get_file_info(file_path)
+        researcher = self.researchers.get(self.get_file_type(file_path, detected_type))
+        if researcher is not None:
+            file_path = Path(file_path)
+            key = self.cache.get_key(file_path, researcher.cache_variant)
+            file_info = self.cache.get(key)
+            if file_info is not None:
+                return file_info
+
+            file_info = researcher.get_file_info(file_path)
+            self.cache.store(key, file_info)
 
             return file_info
+
+    def get_files_info(
+        self, file_paths: list[str], detected_types: list[str | None] | None = None
+    ) -> list[tuple[str, dict] | Exception | None]:
+        """
+        Retrieves file information of many files.
+
+        Cached results are reused, and the remaining files are passed to their
+        Researcher at once, so video and audio files are probed concurrently.
+
+        Args:
+            file_paths (list[str]): The paths to the files.
+            detected_types (list[str | None] | None): The types detected from the
+                content of the files, in the order of file_paths.
+
+        Returns:
+            list[tuple[str, dict] | Exception | None]: The information of every file,
+                in the order of file_paths. An exception raised for a file takes the
+                place of its information, and unsupported files get None.
+        """
+        files_info: list[tuple[str, dict] | Exception | None] = [None] * len(file_paths)
+        pending: dict[str, list[tuple[int, str, tuple]]] = {}
+        detected_types = detected_types or [None] * len(file_paths)
+        for index, (file_path, detected_type) in enumerate(
+            zip(file_paths, detected_types)
+        ):
+            file_type = self.get_file_type(file_path, detected_type)
+            if file_type not in self.researchers:
+                continue
+
+            try:
+                key = self.cache.get_key(
+                    file_path, self.researchers[file_type].cache_variant
+                )
+            except OSError as e:
+                files_info[index] = e
+                continue
+
+            files_info[index] = self.cache.get(key)
+            if files_info[index] is None:
+                pending.setdefault(file_type, []).append((index, file_path, key))
+
+        for file_type, files in pending.items():
+            researched = self.researchers[file_type].get_files_info(
+                [file_path for _, file_path, _ in files]
+            )
+            for (index, _, key), file_info in zip(files, researched):
+                files_info[index] = file_info
+                if not isinstance(file_info, Exception):
+                    self.cache.store(key, file_info)
+
+        return files_info
@@ -1,9 +1,8 @@
 from abc import ABC, abstractmethod
 
-import ffmpeg
-from PIL import Image
-from PIL.ExifTags import Base
-from pypdf import PdfReader
+from .ffprobe_pool import FFprobePool
+from .image_headers import read_image_header
+from .pdf_trailer import read_pdf_info
 
 
 class Researcher(ABC):
@@ -11,8 +10,14 @@ class Researcher(ABC):
     An abstract base class for researchers.
 
     This class provides a common interface for all researchers, including the [get_file_info](cci:1://file:///Users/a-/Documents/Study/%D0%9C%D0%B0%D0%B3%D0%B8%D1%81%D1%82%D1%80%D0%B0%D1%82%D1%83%D1%80%D0%B0/%D0%9F%D0%90%D0%9D%D0%94%D0%90%D0%9D/6_MODULE/%D1%82%D0%B5%D1%85%D0%BD%D0%BE%D0%BB%D0%BE%D0%B3%D0%B8%D0%B8_%D0%BF%D1%80%D0%BE%D0%B3%D1%80%D0%B0%D0%BC%D0%BC%D0%B8%D1%80%D0%BE%D0%B2%D0%B0%D0%BD%D0%B8%D1%8F/kittyscope/src/kittyscope/models/researchers.py:64:4-68:34) method.
+
+    Attributes:
+        cache_variant (str): Distinguishes cached results of differently configured
+            researchers of the same file.
     """
 
+    cache_variant = ""
+
     @abstractmethod
     def get_file_info(self, file_path: str) -> dict:
         """
@@ -26,26 +31,77 @@ class Researcher(ABC):
         """
         ...
 
+    def get_files_info(
+        self, file_paths: list[str]
+    ) -> list[tuple[str, dict] | Exception]:
+        """
+        Retrieves the file information for many files.
+
+        Researchers that can examine files concurrently override this method.
+
+        Args:
+            file_paths (list[str]): The paths to the files.
+
+        Returns:
+            list[tuple[str, dict] | Exception]: The information of every file, in the
+                order of file_paths, or the exception raised for it.
+        """
+        files_info = []
+        for file_path in file_paths:
+            try:
+                files_info.append(self.get_file_info(file_path))
+            except Exception as e:
+                files_info.append(e)
+        return files_info
+
 
 class ImageResearcher(Researcher):
     """
     A researcher for image files.
+
+    Without EXIF the dimensions of PNG, JPEG, GIF, BMP and WebP files are read
+    from their headers, and Pillow is only used for other formats. Pillow is
+    imported on first use.
     """
 
-    def get_file_info(self, file_path: str) -> tuple[str, dict]:
-        image = Image.open(file_path)
-        common_info = {
-            "width": str(image.width),
-            "height": str(image.height),
-            "format": image.format,
-            "color_mode": image.mode,
-        }
+    def __init__(self, with_exif: bool = False):
+        """
+        Initializes the ImageResearcher object.
 
-        image_exif = image.getexif()
+        Args:
+            with_exif (bool): If True, also decodes the EXIF tags with Pillow.
+        """
+        self.with_exif = with_exif
+        self.cache_variant = "exif" if with_exif else ""
+
+    def get_file_info(self, file_path: str) -> tuple[str, dict]:
+        header_info = None if self.with_exif else read_image_header(file_path)
         exif_info = {}
-        for tag, value in image_exif.items():
-            key = Base(tag).name
-            exif_info[key] = value
+        if header_info is not None:
+            common_info = {
+                "width": str(header_info["width"]),
+                "height": str(header_info["height"]),
+                "format": header_info["format"],
+                "color_mode": header_info["color_mode"],
+            }
+        else:
+            from PIL import Image
+            from PIL.ExifTags import Base
+
+            with Image.open(file_path) as image:
+                common_info = {
+                    "width": str(image.width),
+                    "height": str(image.height),
+                    "format": image.format,
+                    "color_mode": image.mode,
+                }
+                if self.with_exif:
+                    for tag, value in image.getexif().items():
+                        try:
+                            key = Base(tag).name
+                        except ValueError:
+                            key = str(tag)
+                        exif_info[key] = value
 
         image_data = {"common_info": common_info, "exif_info": exif_info}
         return "image", image_data
@@ -54,44 +110,80 @@ class ImageResearcher(Researcher):
 class PdfResearcher(Researcher):
     """
     A researcher for PDF files.
+
+    The metadata is read from the trailer and the root of the page tree, and
+    pypdf is only imported and used when that fast path fails.
     """
 
     def get_file_info(self, file_path: str) -> tuple[str, dict]:
+        pdf_info = read_pdf_info(file_path)
+        if pdf_info is not None:
+            return "pdf", pdf_info
+
+        from pypdf import PdfReader
+
         reader = PdfReader(file_path)
         pages_count = len(reader.pages)
         metadata = reader.metadata
 
         pdf_info = {
-            "author": metadata.author if metadata.author else "-",
-            "title": metadata.title if metadata.title else "-",
+            "author": metadata.author if metadata and metadata.author else "-",
+            "title": metadata.title if metadata and metadata.title else "-",
             "pages_count": pages_count if pages_count else "-",
-            "subject": metadata.subject if metadata.subject else "-",
-            "creator": metadata.creator if metadata.creator else "-",
-            "producer": metadata.producer if metadata.producer else "-",
+            "subject": metadata.subject if metadata and metadata.subject else "-",
+            "creator": metadata.creator if metadata and metadata.creator else "-",
+            "producer": metadata.producer if metadata and metadata.producer else "-",
         }
 
         return "pdf", pdf_info
 
 
-class VideoResearcher(Researcher):
+class MediaResearcher(Researcher):
     """
-    A researcher for video files.
+    A base class for researchers that read the format section of ffprobe.
+
+    Attributes:
+        tag (str): The tag returned with the file information.
+        ffprobe_pool (FFprobePool): The pool running the ffprobe processes.
     """
 
+    tag = "media"
+
+    def __init__(self, ffprobe_pool: FFprobePool | None = None):
+        """
+        Initializes the MediaResearcher object.
+
+        Args:
+            ffprobe_pool (FFprobePool | None): The pool running the ffprobe processes.
+        """
+        self.ffprobe_pool = ffprobe_pool or FFprobePool()
+
     def get_file_info(self, file_path: str) -> tuple[str, dict]:
-        probe = ffmpeg.probe(file_path)
+        probe = self.ffprobe_pool.probe(file_path)
+        return self.tag, probe.get("format", None)
 
-        video_info = probe.get("format", None)
-        return "video", video_info
+    def get_files_info(
+        self, file_paths: list[str]
+    ) -> list[tuple[str, dict] | Exception]:
+        return [
+            probe
+            if isinstance(probe, Exception)
+            else (self.tag, probe.get("format", None))
+            for probe in self.ffprobe_pool.probe_many(file_paths)
+        ]
 
 
-class AudioResearcher(Researcher):
+class VideoResearcher(MediaResearcher):
     """
-    A researcher for audio files.
+    A researcher for video files.
     """
 
-    def get_file_info(self, file_path: str) -> tuple[str, dict]:
-        probe = ffmpeg.probe(file_path)
+    tag = "video"
+
+
+class AudioResearcher(MediaResearcher):
+    """
+    A researcher for audio files.
+    """
 
-        audio_info = probe.get("format", None)
-        return "audio", audio_info
+    tag = "audio"
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import polars as pl
+
+from .crawler import RECURSIVE_SCHEMA, join_relative
+from .scanner import localize_categoricals
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "kittyscope",
+    "scans",
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+INDEX_FILE_NAME = "index.json"
+
+
+class ScanCache:
+    """
+    A persistent on-disk cache of results tables.
+
+    Every entry is a zstd-compressed Parquet file keyed by the scanned path and
+    the scan options, stored together with the (device, inode, mtime) fingerprint
+    of the directory. A flat scan is reused while the fingerprint of the root
+    is unchanged. A recursive scan also checks the mtime of every walked folder
+    against its row in the cached table. Entries are evicted in least recently
+    used order once the cache grows beyond max_bytes.
+
+    Changing the contents of a file in place does not touch the mtime of its
+    folder, so such changes are only picked up by a forced rescan.
+
+    Attributes:
+        cache_dir (str): The folder holding the Parquet files and the index.
+        max_bytes (int): The maximal total size of the Parquet files.
+    """
+
+    def __init__(
+        self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """
+        Initializes the ScanCache object.
+
+        Args:
+            cache_dir (str): The folder holding the Parquet files and the index.
+            max_bytes (int): The maximal total size of the Parquet files.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def get_fingerprint(self, path: str) -> list[int]:
+        """
+        Returns the fingerprint of a directory.
+
+        Args:
+            path (str): The path to the directory.
+
+        Returns:
+            list[int]: The device, inode and mtime in nanoseconds of the directory.
+        """
+        path_stat = os.stat(path)
+        return [path_stat.st_dev, path_stat.st_ino, path_stat.st_mtime_ns]
+
+    def load(
+        self, path: str, recursive: bool = False, max_depth: int | None = None
+    ) -> pl.DataFrame | None:
+        """
+        Loads the cached results table of a directory if it is still valid.
+
+        An entry whose Parquet file is missing or cannot be read is dropped, so
+        the directory is scanned and stored again.
+
+        Args:
+            path (str): The path to the scanned directory.
+            recursive (bool): Whether the scan was recursive.
+            max_depth (int | None): The depth limit of a recursive scan.
+
+        Returns:
+            pl.DataFrame | None: The cached results table, or None on a miss.
+        """
+        key = self.__get_key(path, recursive, max_depth)
+        with self._lock:
+            index = self.__read_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+
+            try:
+                if entry["fingerprint"] != self.get_fingerprint(path):
+                    return None
+            except OSError:
+                return None
+
+            try:
+                with pl.StringCache():
+                    results_table = self.__cast_to_schema(
+                        pl.read_parquet(os.path.join(self.cache_dir, entry["file"]))
+                    )
+            except (OSError, pl.exceptions.PolarsError):
+                self.__remove(index, key)
+                self.__write_index(index)
+                return None
+
+            if results_table is None:
+                return None
+            if recursive and not self.__folders_unchanged(path, results_table):
+                return None
+
+            entry["last_used"] = time.time()
+            self.__write_index(index)
+
+        return results_table
+
+    def store(
+        self,
+        path: str,
+        results_table: pl.DataFrame,
+        fingerprint: list[int],
+        recursive: bool = False,
+        max_depth: int | None = None,
+    ) -> None:
+        """
+        Stores the results table of a directory and evicts the least recently used entries.
+
+        Args:
+            path (str): The path to the scanned directory.
+            results_table (pl.DataFrame): The results table of the scan.
+            fingerprint (list[int]): The fingerprint of the directory taken before the scan.
+            recursive (bool): Whether the scan was recursive.
+            max_depth (int | None): The depth limit of a recursive scan.
+        """
+        key = self.__get_key(path, recursive, max_depth)
+        file_name = key + ".parquet"
+
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            file_path = os.path.join(self.cache_dir, file_name)
+            temp_path = file_path + ".tmp"
+            results_table.write_parquet(temp_path, compression="zstd")
+            os.replace(temp_path, file_path)
+
+            index = self.__read_index()
+            index[key] = {
+                "path": os.path.abspath(path),
+                "file": file_name,
+                "fingerprint": fingerprint,
+                "size": os.path.getsize(file_path),
+                "last_used": time.time(),
+            }
+            self.__evict(index)
+            self.__write_index(index)
+
+    def invalidate(self, path: str | None = None) -> None:
+        """
+        Removes the cached entries of a directory, or of every directory.
+
+        Args:
+            path (str | None): The path to the scanned directory. None clears the whole cache.
+        """
+        with self._lock:
+            index = self.__read_index()
+            for key, entry in list(index.items()):
+                if path is None or entry["path"] == os.path.abspath(path):
+                    self.__remove(index, key)
+            self.__write_index(index)
+
+    def __folders_unchanged(self, path: str, results_table: pl.DataFrame) -> bool:
+        """
+        Checks that every folder of a recursive scan still has its cached mtime.
+
+        Args:
+            path (str): The path to the crawl root.
+            results_table (pl.DataFrame): The cached results table.
+
+        Returns:
+            bool: True if no folder was modified since the scan.
+        """
+        folders = results_table.filter(pl.col("type") == "folder").select(
+            "parent", "name", pl.col("last_modification").dt.epoch("ns")
+        )
+        for parent, name, mtime_ns in folders.iter_rows():
+            try:
+                folder_path = os.path.join(path, join_relative(parent, name))
+                if os.stat(folder_path).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def __cast_to_schema(self, results_table: pl.DataFrame) -> pl.DataFrame | None:
+        """
+        Restores the dtypes that Parquet does not keep, like the lexical categorical ordering.
+
+        The table is read under a string cache, so its categories are made local.
+
+        Args:
+            results_table (pl.DataFrame): The table read from the Parquet file.
+
+        Returns:
+            pl.DataFrame | None: The table with the scan dtypes, or None if it was
+                stored with an older schema.
+        """
+        schema = {
+            column: dtype
+            for column, dtype in RECURSIVE_SCHEMA.items()
+            if column in results_table.columns
+        }
+        if "file_type" not in schema:
+            return None
+        return localize_categoricals(results_table.cast(schema))
+
+    def __evict(self, index: dict) -> None:
+        """
+        Removes the least recently used entries until the cache fits into max_bytes.
+
+        Args:
+            index (dict): The cache index.
+        """
+        total_size = sum(entry["size"] for entry in index.values())
+        for key in sorted(index, key=lambda key: index[key]["last_used"]):
+            if total_size <= self.max_bytes:
+                break
+            total_size -= index[key]["size"]
+            self.__remove(index, key)
+
+    def __remove(self, index: dict, key: str) -> None:
+        """
+        Removes an entry from the index and deletes its Parquet file.
+
+        Args:
+            index (dict): The cache index.
+            key (str): The key of the entry.
+        """
+        entry = index.pop(key)
+        try:
+            os.remove(os.path.join(self.cache_dir, entry["file"]))
+        except FileNotFoundError:
+            pass
+
+    def __read_index(self) -> dict:
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE_NAME), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def __write_index(self, index: dict) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        index_path = os.path.join(self.cache_dir, INDEX_FILE_NAME)
+        with open(index_path + ".tmp", "w") as f:
+            json.dump(index, f)
+        os.replace(index_path + ".tmp", index_path)
+
+    def __get_key(self, path: str, recursive: bool, max_depth: int | None) -> str:
+        scan_id = f"{os.path.abspath(path)}|{recursive}|{max_depth}"
+        return hashlib.sha1(scan_id.encode()).hexdigest()
@@ -0,0 +1,345 @@
+import os
+
+import polars as pl
+
+from .crawler import ROOT_PARENT, relative_path_expr
+
+CHANGE_TYPES = pl.Enum(["added", "removed", "resized"])
+CHANGE_COUNTS = [
+    (pl.col("change") == change).sum().cast(pl.Int64).alias(change)
+    for change in CHANGE_TYPES.categories
+]
+
+STATE_KEY = "__state_key"
+MATCH_KEY = "__match_key"
+CHECK_KEY = "check"
+
+
+class ScanDiff:
+    """
+    The differences between two scans of the same folder.
+
+    Every table is sorted by impact, the largest absolute byte delta first.
+
+    Attributes:
+        entries (pl.DataFrame): The "added", "removed" and "resized" entries with
+            their "path", "type", "file_type", "change", "old_size", "new_size"
+            and "delta". Folders are only listed when added or removed.
+        folders (pl.DataFrame): The "delta" of the file bytes below every folder
+            with changed files, the root being ".", and the number of "added",
+            "removed" and "resized" files below it.
+        file_types (pl.DataFrame): The "old_size", "new_size" and "delta" of the
+            file bytes of every file type, and its number of changed files.
+        summary (dict): The totals of both scans and the number of changes.
+    """
+
+    def __init__(
+        self,
+        entries: pl.DataFrame,
+        folders: pl.DataFrame,
+        file_types: pl.DataFrame,
+        summary: dict,
+    ) -> None:
+        self.entries = entries
+        self.folders = folders
+        self.file_types = file_types
+        self.summary = summary
+
+    def is_empty(self) -> bool:
+        return self.entries.is_empty()
+
+
+def get_key_columns(old_table: pl.DataFrame, new_table: pl.DataFrame) -> list[str]:
+    """
+    Returns the columns identifying an entry in both tables.
+
+    An entry whose type changed is reported as removed and added.
+
+    Args:
+        old_table (pl.DataFrame): The earlier results table.
+        new_table (pl.DataFrame): The later results table.
+
+    Returns:
+        list[str]: ["parent", "name", "type"] for recursive tables, otherwise
+            ["name", "type"].
+    """
+    if "parent" in old_table.columns and "parent" in new_table.columns:
+        return ["parent", "name", "type"]
+    return ["name", "type"]
+
+
+def match_rows(
+    old_table: pl.DataFrame, new_table: pl.DataFrame, keys: list[str]
+) -> pl.DataFrame:
+    """
+    Matches the changed rows of two scans by their key columns.
+
+    Joining on several columns, and on names in particular, is several times
+    slower than comparing integers. Every row is hashed with its size, and rows
+    whose hash is found in the other scan are unchanged and dropped with a
+    semi-join. Only the remaining rows are joined on a 64-bit hash of their keys,
+    checked with a second hash of another seed. If any matched pair fails the
+    check, those rows are joined on the key columns instead.
+
+    Args:
+        old_table (pl.DataFrame): The earlier results table.
+        new_table (pl.DataFrame): The later results table.
+        keys (list[str]): The columns identifying an entry.
+
+    Returns:
+        pl.DataFrame: The "old_row" and "new_row" of every added, removed or
+            resized entry, null if it is missing from that table, with its
+            "old_size" and "new_size".
+    """
+
+    def get_key_values(table: pl.DataFrame) -> list[pl.Expr]:
+        # Categorical columns hash their physical ids, which differ between
+        # scans, so every row takes the hash of its category string instead.
+        key_values = []
+        for key in keys:
+            column = table.get_column(key)
+            if isinstance(column.dtype, pl.Categorical):
+                category_hashes = column.cat.get_categories().hash()
+                key_values.append(
+                    pl.lit(category_hashes).gather(pl.col(key).to_physical()).alias(key)
+                )
+            else:
+                key_values.append(pl.col(key))
+        return key_values
+
+    def hash_rows(table: pl.DataFrame, prefix: str) -> pl.LazyFrame:
+        key_values = get_key_values(table)
+        return table.lazy().select(
+            pl.struct(*key_values, "size").hash().alias(STATE_KEY),
+            pl.struct(key_values).hash(seed=0).alias(MATCH_KEY),
+            pl.struct(key_values).hash(seed=1).alias(prefix + CHECK_KEY),
+            pl.int_range(pl.len(), dtype=pl.UInt32).alias(prefix + "row"),
+            pl.col("size").alias(prefix + "size"),
+        )
+
+    old_rows, new_rows = pl.collect_all(
+        [hash_rows(old_table, "old_"), hash_rows(new_table, "new_")]
+    )
+    old_rows, new_rows = (
+        old_rows.filter(pl.col(STATE_KEY).is_in(new_rows.get_column(STATE_KEY)).not_()),
+        new_rows.filter(pl.col(STATE_KEY).is_in(old_rows.get_column(STATE_KEY)).not_()),
+    )
+
+    matches = old_rows.drop(STATE_KEY).join(
+        new_rows.drop(STATE_KEY), on=MATCH_KEY, how="full", coalesce=True
+    )
+    if matches.filter(pl.col("old_" + CHECK_KEY) != pl.col("new_" + CHECK_KEY)).height:
+        old_keys = old_table.select(
+            pl.col(keys).gather(old_rows.get_column("old_row"))
+        ).with_columns(pl.col(pl.Categorical).cast(pl.String))
+        new_keys = new_table.select(
+            pl.col(keys).gather(new_rows.get_column("new_row"))
+        ).with_columns(pl.col(pl.Categorical).cast(pl.String))
+        matches = pl.concat(
+            [old_keys, old_rows.select("old_row", "old_size")], how="horizontal"
+        ).join(
+            pl.concat(
+                [new_keys, new_rows.select("new_row", "new_size")], how="horizontal"
+            ),
+            on=keys,
+            how="full",
+            coalesce=True,
+        )
+    return matches.select("old_row", "new_row", "old_size", "new_size")
+
+
+def get_changes(old_table: pl.DataFrame, new_table: pl.DataFrame) -> pl.DataFrame:
+    """
+    Matches the entries of two scans and keeps the changed ones.
+
+    The key columns are only gathered for the changed entries, so the cost of
+    unchanged entries stays that of hashing them.
+
+    Args:
+        old_table (pl.DataFrame): The earlier results table.
+        new_table (pl.DataFrame): The later results table.
+
+    Returns:
+        pl.DataFrame: The key columns, "file_type", "change", "old_size",
+            "new_size" and "delta" of every changed entry.
+    """
+    keys = get_key_columns(old_table, new_table)
+    change = (
+        pl.when(pl.col("old_row").is_null())
+        .then(pl.lit("added"))
+        .when(pl.col("new_row").is_null())
+        .then(pl.lit("removed"))
+        .when(pl.col("old_size") != pl.col("new_size"))
+        .then(pl.lit("resized"))
+        .cast(CHANGE_TYPES)
+    )
+    changes = (
+        match_rows(old_table, new_table, keys)
+        .with_columns(change.alias("change"))
+        .filter(pl.col("change").is_not_null())
+    )
+    old_rows = changes.get_column("old_row")
+    new_rows = changes.get_column("new_row")
+
+    def gather(column: str) -> pl.Expr:
+        # The categories of two scans are encoded differently, so categorical
+        # values are merged as strings.
+        new_values = new_table.get_column(column).gather(new_rows)
+        old_values = old_table.get_column(column).gather(old_rows)
+        if isinstance(new_values.dtype, pl.Categorical):
+            new_values = new_values.cast(pl.String)
+            old_values = old_values.cast(pl.String)
+        return pl.coalesce(new_values, old_values).alias(column)
+
+    changes = changes.select(
+        *[gather(column) for column in [*keys, "file_type"]],
+        "change",
+        "old_size",
+        "new_size",
+        (pl.col("new_size").fill_null(0) - pl.col("old_size").fill_null(0)).alias(
+            "delta"
+        ),
+    )
+    # Matched entries share their type, and only files are resized.
+    return changes.filter((pl.col("change") != "resized") | (pl.col("type") == "file"))
+
+
+def roll_up_folders(file_changes: pl.DataFrame) -> pl.DataFrame:
+    """
+    Adds the changes of every file to all the folders above it.
+
+    Files are first summed by parent with polars, so the Python loop only runs
+    over the folders that directly hold changed files, once per ancestor.
+
+    Args:
+        file_changes (pl.DataFrame): The changed files with their "parent",
+            "change" and "delta".
+
+    Returns:
+        pl.DataFrame: The "path", "delta", "added", "removed" and "resized" of
+            every folder with changed files below it.
+    """
+    per_parent = file_changes.group_by("parent").agg(
+        pl.col("delta").sum(), *CHANGE_COUNTS
+    )
+    totals: dict[str, list[int]] = {}
+    for parent, *values in per_parent.select(
+        pl.col("parent").cast(pl.String), "delta", *CHANGE_TYPES.categories
+    ).iter_rows():
+        folder = parent
+        while True:
+            folder_totals = totals.setdefault(folder, [0] * len(values))
+            for index, value in enumerate(values):
+                folder_totals[index] += value
+            if folder == ROOT_PARENT:
+                break
+            folder = os.path.dirname(folder) or ROOT_PARENT
+
+    columns = ["delta", *CHANGE_TYPES.categories]
+    return pl.DataFrame(
+        {
+            "path": list(totals),
+            **{
+                column: [folder_totals[index] for folder_totals in totals.values()]
+                for index, column in enumerate(columns)
+            },
+        },
+        schema={"path": pl.String, **{column: pl.Int64 for column in columns}},
+    )
+
+
+def get_file_type_sizes(results_table: pl.DataFrame, alias: str) -> pl.LazyFrame:
+    return (
+        results_table.lazy()
+        .filter(pl.col("type") == "file")
+        .group_by("file_type")
+        .agg(pl.col("size").sum().alias(alias))
+    )
+
+
+def by_impact(frame: pl.DataFrame, *columns: str) -> pl.DataFrame:
+    return frame.sort(
+        pl.col("delta").abs(), *columns, descending=[True] + [False] * len(columns)
+    )
+
+
+def diff_scans(old_table: pl.DataFrame, new_table: pl.DataFrame) -> ScanDiff:
+    """
+    Compares two scans of the same folder with polars joins.
+
+    Entries are matched by their path and type. Files whose size changed are
+    resized. Folder deltas are the sums of the file deltas below every folder,
+    so they do not depend on folder sizes being rolled up, and a flat scan only
+    reports its root.
+
+    Args:
+        old_table (pl.DataFrame): The earlier results table, like a snapshot.
+        new_table (pl.DataFrame): The later results table.
+
+    Returns:
+        ScanDiff: The changed entries and the per-folder and per-type deltas.
+    """
+    keys = get_key_columns(old_table, new_table)
+    path_expr = relative_path_expr() if "parent" in keys else pl.col("name")
+    changes = get_changes(old_table, new_table)
+    old_sizes, new_sizes = pl.collect_all(
+        [
+            get_file_type_sizes(old_table, "old_size"),
+            get_file_type_sizes(new_table, "new_size"),
+        ]
+    )
+
+    entries = by_impact(
+        changes.select(
+            path_expr.alias("path"),
+            "type",
+            "file_type",
+            "change",
+            "old_size",
+            "new_size",
+            "delta",
+        ),
+        "path",
+    )
+
+    file_changes = changes.filter(pl.col("type") == "file")
+    if "parent" not in keys:
+        file_changes = file_changes.with_columns(parent=pl.lit(ROOT_PARENT))
+    folders = by_impact(roll_up_folders(file_changes), "path")
+
+    file_types = by_impact(
+        old_sizes.join(
+            new_sizes, on="file_type", how="full", coalesce=True, join_nulls=True
+        )
+        .join(
+            file_changes.group_by("file_type").agg(*CHANGE_COUNTS),
+            on="file_type",
+            how="left",
+            join_nulls=True,
+        )
+        .select(
+            "file_type",
+            pl.col("old_size").fill_null(0),
+            pl.col("new_size").fill_null(0),
+            (pl.col("new_size").fill_null(0) - pl.col("old_size").fill_null(0)).alias(
+                "delta"
+            ),
+            *[pl.col(change).fill_null(0) for change in CHANGE_TYPES.categories],
+        ),
+        "file_type",
+    )
+
+    old_size = old_sizes.get_column("old_size").sum()
+    new_size = new_sizes.get_column("new_size").sum()
+    summary = {
+        "old_entries": old_table.height,
+        "new_entries": new_table.height,
+        "old_size": old_size,
+        "new_size": new_size,
+        "delta": new_size - old_size,
+        **{
+            change: entries.filter(pl.col("change") == change).height
+            for change in CHANGE_TYPES.categories
+        },
+    }
+    return ScanDiff(entries, folders, file_types, summary)
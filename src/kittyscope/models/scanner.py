@@ -0,0 +1,463 @@
+import os
+import stat
+import threading
+from array import array
+from datetime import datetime, timezone
+from itertools import repeat
+from typing import Callable
+
+import polars as pl
+
+from kittyscope.utils import EXTENSION_TYPE_MAPPING
+
+DEFAULT_BATCH_SIZE = 2000
+DEFAULT_CHUNK_SIZE = 65_536
+
+FILE_TYPES = pl.Enum(sorted(set(EXTENSION_TYPE_MAPPING.values())))
+ELEMENT_TYPES = pl.Enum(["file", "folder", "unknown"])
+DERIVED_COLUMNS = {"extension", "file_type"}
+
+# The suffix of a name following pathlib rules: a dot that is neither the first
+# nor the last character, followed by anything but dots.
+EXTENSION_PATTERN = r"(?s)^.+(\.[^.]+)$"
+
+# Integer columns are accumulated in typed arrays, which store every value in
+# its native width instead of as a Python int object.
+ARRAY_TYPECODES = {
+    pl.Int64: "q",
+    pl.Datetime("ns"): "q",
+    pl.UInt32: "I",
+    pl.UInt16: "H",
+}
+
+# Times are stored as naive UTC datetimes with nanosecond precision, straight
+# from st_atime_ns/st_mtime_ns, and are only converted to local time for display.
+RESULTS_SCHEMA = {
+    "name": pl.String,
+    "type": ELEMENT_TYPES,
+    "size": pl.Int64,
+    "extension": pl.Categorical(ordering="lexical"),
+    "file_type": FILE_TYPES,
+    "last_access": pl.Datetime("ns"),
+    "last_modification": pl.Datetime("ns"),
+}
+
+
+class ScanCancelled(Exception):
+    """
+    Raised when a scan is cancelled before it finishes.
+    """
+
+
+def get_element_type(mode: int) -> str:
+    """
+    Maps a stat mode to the element type used in the results table.
+
+    Args:
+        mode (int): The st_mode value of a stat result.
+
+    Returns:
+        str: "file", "folder" or "unknown".
+    """
+    if stat.S_ISREG(mode):
+        return "file"
+    if stat.S_ISDIR(mode):
+        return "folder"
+    return "unknown"
+
+
+def stat_entry(entry: os.DirEntry) -> os.stat_result:
+    """
+    Stats a directory entry with a single system call.
+
+    Symlinks are followed like os.path.getsize does. Broken symlinks fall back
+    to the stat result of the link itself instead of failing the whole scan.
+
+    Args:
+        entry (os.DirEntry): The entry returned by os.scandir.
+
+    Returns:
+        os.stat_result: The stat result of the entry.
+    """
+    try:
+        return entry.stat()
+    except OSError:
+        return entry.stat(follow_symlinks=False)
+
+
+def to_scan_time(value: datetime) -> datetime:
+    """
+    Converts a datetime to the naive UTC representation used by the time columns.
+
+    Args:
+        value (datetime): A timezone-aware datetime, or a naive one in local time.
+
+    Returns:
+        datetime: The same moment as a naive UTC datetime.
+    """
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class InternedColumn:
+    """
+    A string column stored as ids into its list of distinct values.
+
+    Repeated values, like the parent folder of every entry of a folder, are
+    kept once, and every row costs four bytes.
+
+    Attributes:
+        values (list[str]): The distinct values, in the order they were first seen.
+        ids (array): The index into values of every row.
+    """
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self.ids = array("I")
+        self._ids_by_value: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, value: str, count: int = 1) -> None:
+        value_id = self._ids_by_value.get(value)
+        if value_id is None:
+            value_id = self._ids_by_value[value] = len(self.values)
+            self.values.append(value)
+        if count == 1:
+            self.ids.append(value_id)
+        else:
+            self.ids.extend(repeat(value_id, count))
+
+    def extend(self, values) -> None:
+        for value in values:
+            self.append(value)
+
+    def to_series(self, name: str, dtype: pl.DataType) -> pl.Series:
+        """
+        Converts the column to a polars Series.
+
+        Args:
+            name (str): The name of the Series.
+            dtype (pl.DataType): A categorical dtype, so the values stay interned.
+
+        Returns:
+            pl.Series: The values of every row.
+        """
+        return (
+            pl.Series(name, self.values, dtype=dtype)
+            .gather(pl.Series(self.ids, dtype=pl.UInt32))
+            .alias(name)
+        )
+
+
+def localize_categoricals(results_table: pl.DataFrame) -> pl.DataFrame:
+    """
+    Re-encodes the categorical columns of a table built under a pl.StringCache.
+
+    The chunks of a scan are built and concatenated under one scoped string
+    cache, so they share their categories. Once the cache is released, the
+    global categories cannot be combined with those of another scan, so the
+    finished table gets local ones, which polars re-encodes when needed.
+
+    Args:
+        results_table (pl.DataFrame): The table built under the string cache.
+
+    Returns:
+        pl.DataFrame: The table with local categorical columns.
+    """
+    return results_table.with_columns(
+        results_table.get_column(column).cat.to_local()
+        for column, dtype in results_table.schema.items()
+        if isinstance(dtype, pl.Categorical)
+    )
+
+
+def concat_tables(tables: list[pl.DataFrame], how: str = "vertical") -> pl.DataFrame:
+    """
+    Concatenates tables whose categorical columns were encoded separately.
+
+    Polars re-encodes the local categories of every table on concatenation and
+    warns about it, so categorical columns are concatenated as strings and
+    encoded once afterwards.
+
+    Args:
+        tables (list[pl.DataFrame]): The tables to concatenate.
+        how (str): The concatenation strategy of pl.concat.
+
+    Returns:
+        pl.DataFrame: The concatenated table with local categorical columns.
+    """
+    categoricals = {
+        column: dtype
+        for table in tables
+        for column, dtype in table.schema.items()
+        if isinstance(dtype, pl.Categorical)
+    }
+    table = pl.concat(
+        [
+            table.with_columns(
+                pl.col(column).cast(pl.String)
+                for column in table.columns
+                if column in categoricals
+            )
+            for table in tables
+        ],
+        how=how,
+    )
+    return table.with_columns(
+        pl.col(column).cast(dtype) for column, dtype in categoricals.items()
+    )
+
+
+def create_columns(schema: dict) -> dict[str, list | array | InternedColumn]:
+    """
+    Creates empty columns for the scanned columns of the given schema.
+
+    Integer and time columns are typed arrays, categorical columns are
+    InternedColumn objects and the other columns are lists.
+
+    Args:
+        schema (dict): A mapping of column names to polars dtypes.
+
+    Returns:
+        dict[str, list | array | InternedColumn]: A mapping of column names to
+            empty columns.
+    """
+    columns = {}
+    for column, dtype in schema.items():
+        if column in DERIVED_COLUMNS:
+            continue
+        if isinstance(dtype, pl.Categorical):
+            columns[column] = InternedColumn()
+        elif dtype in ARRAY_TYPECODES:
+            columns[column] = array(ARRAY_TYPECODES[dtype])
+        else:
+            columns[column] = []
+    return columns
+
+
+def classify_extensions() -> list[pl.Expr]:
+    """
+    Returns expressions deriving the "extension" and "file_type" columns from "name".
+
+    Returns:
+        list[pl.Expr]: The lower-cased categorical "extension", "-" for names
+            without one, and the FILE_TYPES "file_type".
+    """
+    extension = (
+        pl.col("name").str.extract(EXTENSION_PATTERN).str.to_lowercase().fill_null("-")
+    )
+    return [
+        extension.cast(pl.Categorical(ordering="lexical")).alias("extension"),
+        extension.replace_strict(
+            EXTENSION_TYPE_MAPPING, default=None, return_dtype=FILE_TYPES
+        ).alias("file_type"),
+    ]
+
+
+def create_table(
+    columns: dict[str, list | array | InternedColumn], schema: dict
+) -> pl.DataFrame:
+    """
+    Builds a results table from scanned columns.
+
+    Extensions are derived from the names and classified for the whole column
+    at once. Columns of the schema that were not scanned are null.
+
+    Args:
+        columns (dict[str, list | array | InternedColumn]): The columns created by
+            create_columns.
+        schema (dict): The schema of the results table.
+
+    Returns:
+        pl.DataFrame: A DataFrame with the given schema.
+    """
+    scanned_table = pl.DataFrame(
+        [
+            values.to_series(column, schema[column])
+            if isinstance(values, InternedColumn)
+            else pl.Series(column, values, dtype=schema[column])
+            for column, values in columns.items()
+        ]
+    )
+    return scanned_table.with_columns(classify_extensions()).select(
+        column
+        if column in columns or column in DERIVED_COLUMNS
+        else pl.lit(None, dtype=dtype).alias(column)
+        for column, dtype in schema.items()
+    )
+
+
+def append_entry(
+    columns: dict[str, list | array], entry: os.DirEntry, entry_stat: os.stat_result
+) -> None:
+    """
+    Appends the scanned RESULTS_SCHEMA values of an entry to the columns.
+
+    Args:
+        columns (dict[str, list | array]): The columns to append to.
+        entry (os.DirEntry): The entry returned by os.scandir.
+        entry_stat (os.stat_result): The stat result of the entry.
+    """
+    columns["name"].append(entry.name)
+    columns["type"].append(get_element_type(entry_stat.st_mode))
+    columns["size"].append(entry_stat.st_size)
+    columns["last_access"].append(entry_stat.st_atime_ns)
+    columns["last_modification"].append(entry_stat.st_mtime_ns)
+
+
+class TableBuilder:
+    """
+    Accumulates scanned rows into a results table in fixed-size chunks.
+
+    Rows are appended to columns created by create_columns. Once a chunk holds
+    chunk_size rows, it is converted to a compact DataFrame and the columns
+    start over, so Python objects only exist for the rows of the current chunk.
+
+    Attributes:
+        schema (dict): The schema of the built table.
+        chunk_size (int): The number of rows converted at once.
+        on_chunk (Callable[[pl.DataFrame], None] | None): A callback receiving
+            every chunk as it is converted.
+        columns (dict[str, list | array | InternedColumn]): The rows of the
+            current chunk.
+    """
+
+    def __init__(
+        self,
+        schema: dict,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_chunk: Callable[[pl.DataFrame], None] | None = None,
+        scanned_schema: dict | None = None,
+    ) -> None:
+        """
+        Initializes the TableBuilder object.
+
+        Args:
+            schema (dict): The schema of the built table.
+            chunk_size (int): The number of rows converted at once.
+            on_chunk (Callable[[pl.DataFrame], None] | None): A callback receiving
+                every chunk as it is converted.
+            scanned_schema (dict | None): The columns of the schema that rows are
+                appended to. The other columns are null. Defaults to schema.
+        """
+        self.schema = schema
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+        self._scanned_schema = scanned_schema or schema
+        self.columns = create_columns(self._scanned_schema)
+        self._chunks: list[pl.DataFrame] = []
+        self._height = 0
+
+    def __len__(self) -> int:
+        return self._height + len(self.columns["name"])
+
+    def append_entry(self, entry: os.DirEntry, entry_stat: os.stat_result) -> None:
+        """
+        Appends the scanned values of an entry.
+
+        Args:
+            entry (os.DirEntry): The entry returned by os.scandir.
+            entry_stat (os.stat_result): The stat result of the entry.
+        """
+        append_entry(self.columns, entry, entry_stat)
+        if len(self.columns["name"]) >= self.chunk_size:
+            self.flush()
+
+    def extend(self, columns: dict[str, list | array], **values) -> None:
+        """
+        Appends the rows of other columns, like the children of a listed folder.
+
+        Args:
+            columns (dict[str, list | array]): The columns of the appended rows.
+            **values: Values shared by all the appended rows, by column.
+        """
+        count = len(columns["name"])
+        for column, column_values in columns.items():
+            self.columns[column].extend(column_values)
+        for column, value in values.items():
+            if isinstance(self.columns[column], InternedColumn):
+                self.columns[column].append(value, count)
+            else:
+                self.columns[column].extend(repeat(value, count))
+        if len(self.columns["name"]) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Converts the rows of the current chunk to a DataFrame.
+        """
+        if not self.columns["name"]:
+            return
+
+        chunk = create_table(self.columns, self.schema)
+        self.columns = create_columns(self._scanned_schema)
+        self._chunks.append(chunk)
+        self._height += chunk.height
+        if self.on_chunk is not None:
+            self.on_chunk(chunk)
+
+    def build(self) -> pl.DataFrame:
+        """
+        Converts the remaining rows and concatenates all chunks.
+
+        The chunks are not copied into contiguous memory, which would briefly
+        double the size of the table. The builder is empty afterwards.
+
+        Returns:
+            pl.DataFrame: A DataFrame with the schema of the builder.
+        """
+        self.flush()
+        chunks, self._chunks, self._height = self._chunks, [], 0
+        if not chunks:
+            return create_table(self.columns, self.schema)
+        return pl.concat(chunks, rechunk=False)
+
+
+def scan_directory(
+    path: str,
+    on_batch: Callable[[pl.DataFrame], None] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    cancel_event: threading.Event | None = None,
+) -> pl.DataFrame:
+    """
+    Scans the immediate children of a directory with os.scandir.
+
+    Type, size and times of every entry come from one stat result, so each
+    entry costs at most one system call. Rows are accumulated by a TableBuilder,
+    whose chunks are the batches passed to on_batch. The chunks share one scoped
+    string cache, and the returned table has local categories.
+
+    Args:
+        path (str): The path to the directory.
+        on_batch (Callable[[pl.DataFrame], None] | None): A callback receiving rows as they are scanned.
+        batch_size (int): The number of rows passed to on_batch at once.
+        cancel_event (threading.Event | None): An event that cancels the scan when set.
+
+    Raises:
+        Exception: If the path is not a directory or the directory is empty.
+        ScanCancelled: If the scan was cancelled.
+
+    Returns:
+        pl.DataFrame: A DataFrame with the RESULTS_SCHEMA columns.
+    """
+    if not os.path.isdir(path):
+        raise Exception("Path is not a directory")
+
+    with pl.StringCache():
+        builder = TableBuilder(
+            RESULTS_SCHEMA,
+            chunk_size=DEFAULT_CHUNK_SIZE if on_batch is None else batch_size,
+            on_chunk=on_batch,
+        )
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ScanCancelled("Scan cancelled")
+
+                builder.append_entry(entry, stat_entry(entry))
+
+        if len(builder) == 0:
+            raise Exception("Directory is empty")
+
+        return localize_categoricals(builder.build())
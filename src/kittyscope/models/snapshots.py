@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import polars as pl
+
+from .crawler import RECURSIVE_SCHEMA
+from .scanner import localize_categoricals, to_scan_time
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(
+    os.environ.get(
+        "XDG_DATA_HOME", os.path.join(os.path.expanduser("~"), ".local", "share")
+    ),
+    "kittyscope",
+    "snapshots",
+)
+INDEX_FILE_NAME = "index.json"
+SNAPSHOT_TIME_FORMAT = "%Y%m%dT%H%M%S%f"
+PARQUET_COMPRESSION = "zstd"
+
+
+class SnapshotStore:
+    """
+    A folder of timestamped scans, kept to compare a folder over time.
+
+    Every snapshot is a zstd-compressed Parquet file with the scanned columns of
+    a results table. Probe results and other added columns are left out. An
+    index lists the snapshots with their scanned path, options and time. Unlike
+    the ScanCache, snapshots are only removed on request.
+
+    Attributes:
+        snapshot_dir (str): The folder holding the Parquet files and the index.
+    """
+
+    def __init__(self, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR) -> None:
+        """
+        Initializes the SnapshotStore object.
+
+        Args:
+            snapshot_dir (str): The folder holding the Parquet files and the index.
+        """
+        self.snapshot_dir = snapshot_dir
+        self._lock = threading.Lock()
+
+    def save(
+        self,
+        path: str,
+        results_table: pl.DataFrame,
+        recursive: bool = False,
+        max_depth: int | None = None,
+        taken_at: datetime | None = None,
+    ) -> dict:
+        """
+        Saves a results table as a new snapshot.
+
+        Args:
+            path (str): The path to the scanned directory.
+            results_table (pl.DataFrame): The results table of the scan.
+            recursive (bool): Whether the scan was recursive.
+            max_depth (int | None): The depth limit of a recursive scan.
+            taken_at (datetime | None): The time of the scan. Defaults to now.
+
+        Returns:
+            dict: The index entry of the snapshot, with its "id".
+        """
+        taken_at = to_scan_time(taken_at or datetime.now(timezone.utc))
+        scan_key = self.__get_scan_key(path, recursive, max_depth)
+        snapshot_id = f"{scan_key[:12]}-{taken_at.strftime(SNAPSHOT_TIME_FORMAT)}"
+        file_name = snapshot_id + ".parquet"
+        columns = [
+            column for column in RECURSIVE_SCHEMA if column in results_table.columns
+        ]
+        entry = {
+            "id": snapshot_id,
+            "path": os.path.abspath(path),
+            "recursive": recursive,
+            "max_depth": max_depth,
+            "taken_at": taken_at.isoformat(),
+            "file": file_name,
+            "entries": results_table.height,
+            "size": results_table.filter(pl.col("type") == "file")
+            .get_column("size")
+            .sum(),
+        }
+
+        with self._lock:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            file_path = os.path.join(self.snapshot_dir, file_name)
+            temp_path = file_path + ".tmp"
+            results_table.select(columns).write_parquet(
+                temp_path, compression=PARQUET_COMPRESSION
+            )
+            os.replace(temp_path, file_path)
+
+            index = self.__read_index()
+            index[snapshot_id] = entry
+            self.__write_index(index)
+
+        return entry
+
+    def get_snapshots(
+        self,
+        path: str | None = None,
+        recursive: bool | None = None,
+        max_depth: int | None = None,
+    ) -> list[dict]:
+        """
+        Lists the saved snapshots, oldest first.
+
+        Args:
+            path (str | None): Only list the snapshots of this directory.
+            recursive (bool | None): Only list the snapshots taken with these
+                scan options. None lists the snapshots of any options.
+            max_depth (int | None): The depth limit, compared if recursive is given.
+
+        Returns:
+            list[dict]: The index entries of the snapshots.
+        """
+        with self._lock:
+            snapshots = list(self.__read_index().values())
+
+        if path is not None:
+            path = os.path.abspath(path)
+            snapshots = [entry for entry in snapshots if entry["path"] == path]
+        if recursive is not None:
+            snapshots = [
+                entry
+                for entry in snapshots
+                if entry["recursive"] == recursive and entry["max_depth"] == max_depth
+            ]
+        return sorted(snapshots, key=lambda entry: entry["taken_at"])
+
+    def load(self, snapshot_id: str) -> pl.DataFrame:
+        """
+        Loads the results table of a snapshot.
+
+        Args:
+            snapshot_id (str): The id of the snapshot.
+
+        Raises:
+            Exception: If there is no such snapshot.
+
+        Returns:
+            pl.DataFrame: The results table with the scan dtypes.
+        """
+        with self._lock:
+            entry = self.__read_index().get(snapshot_id)
+        if entry is None:
+            raise Exception(f"Unknown snapshot: {snapshot_id}")
+
+        # The row groups of a categorical column are read under a string cache,
+        # and the loaded table gets local categories like a scan.
+        with pl.StringCache():
+            results_table = pl.read_parquet(
+                os.path.join(self.snapshot_dir, entry["file"])
+            )
+            return localize_categoricals(
+                results_table.cast(
+                    {
+                        column: dtype
+                        for column, dtype in RECURSIVE_SCHEMA.items()
+                        if column in results_table.columns
+                    }
+                )
+            )
+
+    def delete(self, snapshot_id: str) -> None:
+        """
+        Removes a snapshot.
+
+        Args:
+            snapshot_id (str): The id of the snapshot.
+        """
+        with self._lock:
+            index = self.__read_index()
+            entry = index.pop(snapshot_id, None)
+            if entry is None:
+                return
+            try:
+                os.remove(os.path.join(self.snapshot_dir, entry["file"]))
+            except OSError:
+                pass
+            self.__write_index(index)
+
+    def __read_index(self) -> dict:
+        try:
+            with open(os.path.join(self.snapshot_dir, INDEX_FILE_NAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def __write_index(self, index: dict) -> None:
+        index_path = os.path.join(self.snapshot_dir, INDEX_FILE_NAME)
+        temp_path = index_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(temp_path, index_path)
+
+    @staticmethod
+    def __get_scan_key(path: str, recursive: bool, max_depth: int | None) -> str:
+        scan_id = f"{os.path.abspath(path)}|{recursive}|{max_depth}"
+        return hashlib.sha1(scan_id.encode()).hexdigest()
@@ -0,0 +1,215 @@
+import os
+from typing import NamedTuple
+
+import polars as pl
+
+from .crawler import ROOT_PARENT
+
+DEFAULT_MIN_CELL_AREA = 64
+OTHER_CELL = "other"
+
+
+class TreemapCell(NamedTuple):
+    """
+    A rectangle of a treemap layout, in the coordinates of the laid out area.
+
+    Attributes:
+        x (float): The left edge.
+        y (float): The top edge.
+        width (float): The width.
+        height (float): The height.
+        name (str): The name of the entry, or OTHER_CELL for grouped small entries.
+        size (int): The size of the entry, or the total size of the grouped entries.
+        type (str | None): The element type, "file" or "folder", or None for the
+            other cell.
+        file_type (str | None): The file type of a file.
+        count (int): The number of entries in the cell, more than one for the
+            other cell.
+    """
+
+    x: float
+    y: float
+    width: float
+    height: float
+    name: str
+    size: int
+    type: str | None
+    file_type: str | None
+    count: int = 1
+
+    def contains(self, x: float, y: float) -> bool:
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+
+def get_children(results_table: pl.DataFrame, relative_path: str) -> pl.DataFrame:
+    """
+    Returns the entries directly inside a folder, largest first.
+
+    A flat results table only holds the children of the scanned folder. Empty
+    entries are left out, since they take no space in a treemap.
+
+    Args:
+        results_table (pl.DataFrame): The results table of the scan.
+        relative_path (str): The folder path relative to the scanned folder, or
+            ROOT_PARENT.
+
+    Returns:
+        pl.DataFrame: The "name", "type", "file_type" and "size" of the children.
+    """
+    query = results_table.lazy()
+    if "parent" in results_table.columns:
+        query = query.filter(pl.col("parent") == relative_path)
+    elif relative_path != ROOT_PARENT:
+        return results_table.clear().select("name", "type", "file_type", "size")
+    return (
+        query.filter(pl.col("size") > 0)
+        .select(
+            "name",
+            pl.col("type").cast(pl.String),
+            pl.col("file_type").cast(pl.String),
+            "size",
+        )
+        .sort("size", "name", descending=[True, False])
+        .collect()
+    )
+
+
+def get_parent_path(relative_path: str) -> str:
+    """
+    Returns the parent of a folder path relative to the scanned folder.
+
+    Args:
+        relative_path (str): The folder path, or ROOT_PARENT.
+
+    Returns:
+        str: The parent folder path, ROOT_PARENT for the scanned folder itself.
+    """
+    if relative_path == ROOT_PARENT:
+        return ROOT_PARENT
+    return os.path.dirname(relative_path) or ROOT_PARENT
+
+
+def worst_ratio(row_sum: float, row_min: float, row_max: float, side: float) -> float:
+    """
+    Returns the worst aspect ratio of a row of areas laid out along a side.
+    """
+    row_sum_squared = row_sum * row_sum
+    side_squared = side * side
+    return max(
+        side_squared * row_max / row_sum_squared,
+        row_sum_squared / (side_squared * row_min),
+    )
+
+
+def squarify(
+    areas: list[float], x: float, y: float, width: float, height: float
+) -> list[tuple[float, float, float, float]]:
+    """
+    Lays out areas in a rectangle with the squarified treemap algorithm.
+
+    Areas are added to a row along the shorter side of the remaining rectangle
+    as long as this improves the worst aspect ratio of the row. The row is then
+    fixed and the rest of the rectangle is filled the same way.
+
+    Args:
+        areas (list[float]): The positive areas, largest first, summing to the
+            area of the rectangle.
+        x (float): The left edge of the rectangle.
+        y (float): The top edge of the rectangle.
+        width (float): The width of the rectangle.
+        height (float): The height of the rectangle.
+
+    Returns:
+        list[tuple[float, float, float, float]]: The x, y, width and height of
+            every area, in the order of the areas.
+    """
+    rectangles = []
+    start = 0
+    while start < len(areas):
+        side = min(width, height)
+        if side <= 0:
+            rectangles.extend((x, y, 0.0, 0.0) for _ in areas[start:])
+            break
+
+        end = start + 1
+        row_sum = row_max = row_min = areas[start]
+        ratio = worst_ratio(row_sum, row_min, row_max, side)
+        while end < len(areas):
+            area = areas[end]
+            next_ratio = worst_ratio(row_sum + area, area, row_max, side)
+            if next_ratio > ratio:
+                break
+            row_sum += area
+            row_min = area
+            ratio = next_ratio
+            end += 1
+
+        thickness = row_sum / side
+        offset = 0.0
+        for area in areas[start:end]:
+            length = area / thickness
+            if width >= height:
+                rectangles.append((x, y + offset, thickness, length))
+            else:
+                rectangles.append((x + offset, y, length, thickness))
+            offset += length
+
+        if width >= height:
+            x += thickness
+            width -= thickness
+        else:
+            y += thickness
+            height -= thickness
+        start = end
+    return rectangles
+
+
+def layout_treemap(
+    children: pl.DataFrame,
+    width: float,
+    height: float,
+    min_cell_area: float = DEFAULT_MIN_CELL_AREA,
+) -> list[TreemapCell]:
+    """
+    Lays out the children of a folder as treemap cells.
+
+    Only the children whose cell would cover at least min_cell_area pixels get a
+    cell. The smaller ones are grouped into a single OTHER_CELL cell, so the
+    number of laid out and drawn cells is bounded by the size of the area rather
+    than by the number of children.
+
+    Args:
+        children (pl.DataFrame): The children returned by get_children.
+        width (float): The width of the area in pixels.
+        height (float): The height of the area in pixels.
+        min_cell_area (float): The smallest area of a cell of its own, in pixels.
+
+    Returns:
+        list[TreemapCell]: The cells, largest first.
+    """
+    total = children.get_column("size").sum() if children.height else 0
+    if total <= 0 or width <= 0 or height <= 0:
+        return []
+
+    scale = width * height / total
+    min_size = min_cell_area / scale
+    shown = children.filter(pl.col("size") >= min_size)
+    other_count = children.height - shown.height
+    other_size = total - (shown.get_column("size").sum() if shown.height else 0)
+
+    cells = [
+        (size * scale, name, size, element_type, file_type, 1)
+        for name, element_type, file_type, size in shown.iter_rows()
+    ]
+    if other_count:
+        # The other cell can outweigh the shown ones, so it is laid out in size
+        # order like them to keep its neighbours from becoming thin strips.
+        cells.append(
+            (other_size * scale, OTHER_CELL, other_size, None, None, other_count)
+        )
+        cells.sort(key=lambda cell: cell[0], reverse=True)
+
+    rectangles = squarify([cell[0] for cell in cells], 0.0, 0.0, width, height)
+    return [
+        TreemapCell(*rectangle, *cell[1:]) for rectangle, cell in zip(rectangles, cells)
+    ]
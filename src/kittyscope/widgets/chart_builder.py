@@ -1,3 +1,5 @@
+import time
+
 from PySide6.QtCharts import (
     QBarCategoryAxis,
     QBarSet,
@@ -6,39 +8,68 @@ from PySide6.QtCharts import (
     QHorizontalStackedBarSeries,
     QValueAxis,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QPainter
 
+DEFAULT_MAX_BARS = 8
+OTHER_BAR = "other"
+FRAME_INTERVAL_MS = 100
+ANIMATION_MIN_INTERVAL_MS = 500
+MAX_ANIMATED_CHANGES = 3
+
 
 class BarChartBuilder:
     """
     A class to build and update bar charts.
 
     This class provides methods to create and update bar charts using the PySide6 QtCharts library.
-    It allows for customization of the chart's title, axis labels, and data series.
+    The series and axes are created and attached once. Updates change the values of the
+    existing bar sets in place, and only add or remove the bar sets of categories that
+    appear or disappear. The largest max_bars categories get a bar set of their own and
+    the rest are summed into an "other" bar set.
+
+    Updates are throttled: the first update is drawn at once and later ones are coalesced
+    so that at most one redraw happens every FRAME_INTERVAL_MS milliseconds, always ending
+    with the latest data. Animations are turned off for updates that arrive less than
+    ANIMATION_MIN_INTERVAL_MS milliseconds apart or that add or remove more than
+    MAX_ANIMATED_CHANGES bar sets.
 
     Attributes:
         series (QHorizontalStackedBarSeries): The data series for the chart.
         axisY (QBarCategoryAxis): The Y-axis for the chart.
         axisX (QValueAxis): The X-axis for the chart.
         chart (QChart): The chart object.
+        max_bars (int): The number of categories drawn as bar sets of their own.
 
     Methods:
         __init__(): Initializes the chart builder with default settings.
         build(chart_data: dict): Builds the chart with the provided data.
         update(chart_data: dict): Updates the chart with new data.
+        flush(): Draws a pending update at once.
     """
 
-    def __init__(self):
+    def __init__(self, max_bars: int = DEFAULT_MAX_BARS):
         """
         Initializes the chart builder with default settings.
 
         Creates a new instance of the QHorizontalStackedBarSeries, QBarCategoryAxis, QValueAxis, and QChart classes.
+
+        Args:
+            max_bars (int): The number of categories drawn as bar sets of their own.
         """
         self.series = QHorizontalStackedBarSeries()
         self.axisY = QBarCategoryAxis()
         self.axisX = QValueAxis()
         self.chart = QChart()
+        self.max_bars = max_bars
+
+        self._bar_sets: dict[str, QBarSet] = {}
+        self._pending_data: dict | None = None
+        self._last_draw = 0.0
+        self._frame_timer = QTimer()
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(FRAME_INTERVAL_MS)
+        self._frame_timer.timeout.connect(self.flush)
 
     def build(self, chart_data: dict):
         """
@@ -50,33 +81,20 @@ class BarChartBuilder:
         Returns:
             QChartView: The chart view object.
         """
-        self.series.clear()
-        self.axisY.clear()
-
-        group_count = chart_data["group_count"]
-        for param_value in range(group_count):
-            param = chart_data["file_type"][param_value]
-            value = chart_data["count"][param_value]
-            bar_set = QBarSet(param)
-            bar_set.append(value)
-            self.series.append(bar_set)
-
         self.chart.addSeries(self.series)
         self.chart.setTitle("File types count")
-        self.chart.setAnimationOptions(QChart.SeriesAnimations)
 
-        categories = ["File type"]
-        self.axisY.append(categories)
+        self.axisY.append(["File type"])
         self.axisX.setLabelFormat("%d")
 
-        max_range = sum(chart_data["count"])
-        self.axisX.setRange(0, max_range)
-
         self.chart.addAxis(self.axisY, Qt.AlignLeft)
         self.chart.addAxis(self.axisX, Qt.AlignBottom)
         self.series.attachAxis(self.axisY)
         self.series.attachAxis(self.axisX)
 
+        self.__draw(chart_data)
+        self._frame_timer.start()
+
         chart_view = QChartView(self.chart)
         chart_view.setRenderHint(QPainter.Antialiasing)
 
@@ -86,29 +104,80 @@ class BarChartBuilder:
         """
         Updates the chart with new data.
 
+        The data is drawn at once if the last redraw is at least FRAME_INTERVAL_MS
+        old, otherwise it replaces any pending data and is drawn when the interval ends.
+
         Args:
             chart_data (dict): A dictionary containing the new chart data.
         """
-        self.series.clear()
-        self.axisY.clear()
+        self._pending_data = chart_data
+        if not self._frame_timer.isActive():
+            self.flush()
+
+    def flush(self):
+        """
+        Draws the pending data, if any, and starts a new frame interval.
+        """
+        if self._pending_data is None:
+            return
 
-        group_count = chart_data["group_count"]
-        for param_value in range(group_count):
-            param = chart_data["file_type"][param_value]
-            value = chart_data["count"][param_value]
-            bar_set = QBarSet(param)
-            bar_set.append(value)
-            self.series.append(bar_set)
+        chart_data = self._pending_data
+        self._pending_data = None
+        self.__draw(chart_data)
+        self._frame_timer.start()
 
-        self.chart.addSeries(self.series)
-        self.chart.setTitle("File types count")
-        self.chart.setAnimationOptions(QChart.SeriesAnimations)
+    def __draw(self, chart_data: dict):
+        """
+        Applies chart data to the existing bar sets.
 
-        categories = ["File type"]
-        self.axisY.append(categories)
+        Args:
+            chart_data (dict): A dictionary containing the chart data.
+        """
+        values = self.__get_bar_values(chart_data)
+        removed = [label for label in self._bar_sets if label not in values]
+        added = [label for label in values if label not in self._bar_sets]
+
+        now = time.monotonic()
+        rapid = (now - self._last_draw) * 1000 < ANIMATION_MIN_INTERVAL_MS
+        large = len(added) + len(removed) > MAX_ANIMATED_CHANGES
+        self._last_draw = now
+        self.chart.setAnimationOptions(
+            QChart.NoAnimation if rapid or large else QChart.SeriesAnimations
+        )
+
+        for label in removed:
+            self.series.remove(self._bar_sets.pop(label))
+        for label, value in values.items():
+            bar_set = self._bar_sets.get(label)
+            if bar_set is None:
+                bar_set = QBarSet(label)
+                bar_set.append(value)
+                self.series.append(bar_set)
+                self._bar_sets[label] = bar_set
+            elif bar_set.at(0) != value:
+                bar_set.replace(0, value)
+
+        max_range = sum(values.values())
+        if self.axisX.max() != max_range:
+            self.axisX.setRange(0, max_range)
+
+    def __get_bar_values(self, chart_data: dict) -> dict[str, int]:
+        """
+        Returns the value of every bar set, the smallest categories summed into "other".
 
-        self.axisX.setLabelFormat("%d")
-        max_range = sum(chart_data["count"])
-        self.axisX.setRange(0, max_range)
+        Args:
+            chart_data (dict): A dictionary containing the chart data.
 
-        self.chart.update()
+        Returns:
+            dict[str, int]: The value of every bar set by label, largest first.
+        """
+        categories = sorted(
+            zip(chart_data["file_type"], chart_data["count"]),
+            key=lambda category: category[1],
+            reverse=True,
+        )
+        values = dict(categories[: self.max_bars])
+        other = sum(count for _, count in categories[self.max_bars :])
+        if other:
+            values[OTHER_BAR] = values.get(OTHER_BAR, 0) + other
+        return values
@@ -0,0 +1,121 @@
+import os
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+MAX_WATCHED_FOLDERS = 4096
+DEBOUNCE_MS = 300
+
+
+class FolderWatcher(QObject):
+    """
+    Watches the folders of a scan and reports which of them changed.
+
+    Change notifications are coalesced for DEBOUNCE_MS, so a burst of writes to
+    one folder leads to a single refresh. A folder watch only reports entries
+    that are added, removed or renamed, so the files of the watched folders are
+    watched too, to report files modified in place as a change of their folder.
+    Folders take precedence, and folders and files together are capped at
+    MAX_WATCHED_FOLDERS to stay within the inotify watch limit. Modifying a file
+    that did not fit is not noticed until its folder changes otherwise.
+
+    Signals:
+        folders_changed (list): The changed folders relative to the watched root,
+            parents before children.
+    """
+
+    folders_changed = Signal(list)
+
+    def __init__(self):
+        """
+        Initializes the FolderWatcher object.
+        """
+        super().__init__()
+        self._root = ""
+        self._changed_folders: set[str] = set()
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self.__on_directory_changed)
+        self._watcher.fileChanged.connect(self.__on_file_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self.__emit_changes)
+
+    def watch(
+        self, root: str, relative_folders: list[str], relative_files: list[str]
+    ) -> None:
+        """
+        Starts watching a scanned folder, the given subfolders and their files.
+
+        Args:
+            root (str): The path to the scanned folder.
+            relative_folders (list[str]): The subfolders relative to root.
+            relative_files (list[str]): The files relative to root.
+        """
+        self.stop()
+        self._root = root
+        self._watcher.addPath(root)
+        self.add_folders(relative_folders)
+        self.add_files(relative_files)
+
+    def add_folders(self, relative_folders: list[str]) -> None:
+        """
+        Adds subfolders of the watched root, up to MAX_WATCHED_FOLDERS in total.
+
+        Args:
+            relative_folders (list[str]): The subfolders relative to the watched root.
+        """
+        self.__add_paths(relative_folders, self._watcher.directories())
+
+    def add_files(self, relative_files: list[str]) -> None:
+        """
+        Adds files of the watched folders, up to MAX_WATCHED_FOLDERS in total.
+
+        Files that replaced a watched file, like on an atomic save, are watched
+        again when added.
+
+        Args:
+            relative_files (list[str]): The files relative to the watched root.
+        """
+        self.__add_paths(relative_files, self._watcher.files())
+
+    def stop(self) -> None:
+        """
+        Stops watching all folders and drops pending changes.
+        """
+        self._timer.stop()
+        self._changed_folders.clear()
+        paths = self._watcher.directories() + self._watcher.files()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def __add_paths(self, relative_paths: list[str], watched: list[str]) -> None:
+        free_slots = (
+            MAX_WATCHED_FOLDERS
+            - len(self._watcher.directories())
+            - len(self._watcher.files())
+        )
+        watched = set(watched)
+        paths = [
+            path
+            for path in (os.path.join(self._root, item) for item in relative_paths)
+            if path not in watched
+        ]
+        if paths and free_slots > 0:
+            self._watcher.addPaths(paths[:free_slots])
+
+    def __on_directory_changed(self, path: str) -> None:
+        self._changed_folders.add(os.path.relpath(path, self._root))
+        self._timer.start()
+
+    def __on_file_changed(self, path: str) -> None:
+        self._changed_folders.add(os.path.relpath(os.path.dirname(path), self._root))
+        self._timer.start()
+
+    def __emit_changes(self) -> None:
+        changed_folders = sorted(
+            self._changed_folders, key=lambda folder: folder.count(os.sep)
+        )
+        self._changed_folders.clear()
+        self.folders_changed.emit(changed_folders)
@@ -11,18 +11,39 @@ from PySide6.QtWidgets import (
     QProgressBar,
     QMenuBar,
     QMenu,
+    QCheckBox,
+    QComboBox,
+    QTabWidget,
+    QWidget,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, QObject
 from PySide6.QtGui import QPixmap
+import polars as pl
 from kittyscope.models.finder import Finder
 from kittyscope.models.analyzer import Analyzer
+from kittyscope.models.crawler import ROOT_PARENT, relative_path_expr
 from kittyscope.models.research_router import ResearchRouter
+from kittyscope.models.scan_cache import ScanCache
+from kittyscope.models.scanner import FILE_TYPES
+from kittyscope.models.snapshots import SnapshotStore
 from kittyscope.utils.static_texts import ABOUT
 from kittyscope.widgets.table import TableResults
 from kittyscope.widgets.q_lines import PathLine, SearchInput
 from kittyscope.widgets.chart_builder import BarChartBuilder
+from kittyscope.widgets.workers import (
+    EXPORT_FILTERS,
+    ExportWorker,
+    ProbeWorker,
+    RefreshWorker,
+    ScanWorker,
+)
+from kittyscope.widgets.folder_watcher import FolderWatcher
+from kittyscope.widgets.snapshot_dialog import SnapshotDialog
+from kittyscope.widgets.treemap import TreemapWidget
 import os
 
+EMPTY_STAT = {"file_type": [], "count": [], "group_count": 0}
+
 
 class Dialog(QDialog):
     """
@@ -35,6 +56,14 @@ class Dialog(QDialog):
         _actions_box (QGroupBox): The actions box for performing actions.
         _table (TableResults): The table for displaying file information.
         _path_line (PathLine): The path line for displaying the selected folder.
+        _finder (Finder | None): The Finder of the last finished scan.
+        _scan_worker (ScanWorker | None): The worker running the current scan.
+        _refresh_worker (RefreshWorker | None): The worker refreshing changed folders.
+        _pending_folders (list[str]): The changed folders waiting for the next refresh.
+        _probe_worker (ProbeWorker | None): The worker probing the media metadata.
+        _export_worker (ExportWorker | None): The worker exporting the results.
+        _scan_threads (list[tuple[QThread, QObject]]): The threads of running and abandoned
+            scans, probes and exports.
     """
 
     def __init__(self):
@@ -44,7 +73,26 @@ class Dialog(QDialog):
         super().__init__()
 
         self._analyzer = Analyzer()
+        self._scan_cache = ScanCache()
+        self._snapshot_store = SnapshotStore()
+        self._research_router = ResearchRouter(with_exif=True, sniff_content=True)
         self.chart_builder: BarChartBuilder | None = None
+        self._finder: Finder | None = None
+        self._scan_id = 0
+        self._scan_worker: ScanWorker | None = None
+        self._refresh_id = 0
+        self._refresh_worker: RefreshWorker | None = None
+        self._refresh_base: pl.DataFrame | None = None
+        self._pending_folders: list[str] = []
+        self._probe_id = 0
+        self._probe_worker: ProbeWorker | None = None
+        self._export_id = 0
+        self._export_worker: ExportWorker | None = None
+        self._scan_threads: list[tuple[QThread, QObject]] = []
+        self._stat_data: dict = EMPTY_STAT
+
+        self._folder_watcher = FolderWatcher()
+        self._folder_watcher.folders_changed.connect(self.apply_folder_changes)
         self.create_menu()
         self.create_search_box()
         self.create_table_box()
@@ -76,7 +124,16 @@ class Dialog(QDialog):
         self._about_action = self._program_menu.addAction("&About")
         self._menu_bar.addMenu(self._program_menu)
 
+        self._snapshot_menu = QMenu("&Snapshots", self)
+        self._save_snapshot_action = self._snapshot_menu.addAction("&Save snapshot")
+        self._compare_snapshot_action = self._snapshot_menu.addAction(
+            "&Compare with snapshot…"
+        )
+        self._menu_bar.addMenu(self._snapshot_menu)
+
         self._about_action.triggered.connect(self.show_about)
+        self._save_snapshot_action.triggered.connect(self.save_snapshot)
+        self._compare_snapshot_action.triggered.connect(self.compare_snapshot)
 
     def create_search_box(self):
         """
@@ -89,7 +146,26 @@ class Dialog(QDialog):
         choose_path_button.setAutoDefault(False)
         choose_path_button.clicked.connect(self.open_search_folder_dialog)
 
+        self._recursive_checkbox = QCheckBox("Recursive")
+
+        self._watch_checkbox = QCheckBox("Watch")
+        self._watch_checkbox.toggled.connect(self.toggle_watch)
+
+        self._rescan_button = QPushButton("Rescan")
+        self._rescan_button.setAutoDefault(False)
+        self._rescan_button.setEnabled(False)
+        self._rescan_button.clicked.connect(self.rescan)
+
+        self._cancel_scan_button = QPushButton("Cancel scan")
+        self._cancel_scan_button.setAutoDefault(False)
+        self._cancel_scan_button.setEnabled(False)
+        self._cancel_scan_button.clicked.connect(self.cancel_scan)
+
         layout.addWidget(choose_path_button)
+        layout.addWidget(self._recursive_checkbox)
+        layout.addWidget(self._watch_checkbox)
+        layout.addWidget(self._rescan_button)
+        layout.addWidget(self._cancel_scan_button)
 
         self._search_box.setLayout(layout)
 
@@ -111,20 +187,45 @@ class Dialog(QDialog):
         self.search_input_label = QLabel("Search: ")
 
         self._search_input = SearchInput()
-        self._search_input.textChanged.connect(self._table.search)
+        self._search_input.search_requested.connect(self.search)
         self._search_input.returnPressed.connect(self.step_through_results)
 
+        self._search_mode = QComboBox()
+        self._search_mode.addItem("Contains", "substring")
+        self._search_mode.addItem("Glob", "glob")
+        self._search_mode.addItem("Regex", "regex")
+        self._search_mode.currentIndexChanged.connect(self._search_input.request_search)
+
+        self._file_type_filter = QComboBox()
+        self._file_type_filter.addItem("All file types", None)
+        for file_type in FILE_TYPES.categories:
+            self._file_type_filter.addItem(file_type.capitalize(), file_type)
+        self._file_type_filter.currentIndexChanged.connect(self.filter_file_type)
+
         search_input_layout.addWidget(self.search_input_label)
         search_input_layout.addWidget(self._search_input)
+        search_input_layout.addWidget(self._search_mode)
+        search_input_layout.addWidget(self._file_type_filter)
+
+        self._export_button = QPushButton("Export")
+        self._export_button.clicked.connect(self.toggle_export)
+        self._export_button.setAutoDefault(False)
 
-        self._csv_download_button = QPushButton("Download CSV")
-        self._csv_download_button.clicked.connect(self.open_csv_folder_dialog)
-        self._csv_download_button.setAutoDefault(False)
+        self._export_view_checkbox = QCheckBox("Filtered view only")
+
+        self._probe_button = QPushButton("Probe media")
+        self._probe_button.clicked.connect(self.toggle_probe)
+        self._probe_button.setAutoDefault(False)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self._export_button)
+        buttons_layout.addWidget(self._export_view_checkbox)
+        buttons_layout.addWidget(self._probe_button)
 
         layout.addLayout(search_input_layout)
         layout.addWidget(self._table)
         layout.addWidget(self._path_line)
-        layout.addWidget(self._csv_download_button)
+        layout.addLayout(buttons_layout)
 
         self._table_box.setLayout(layout)
         self.__set_style_classes()
@@ -133,10 +234,42 @@ class Dialog(QDialog):
         """
         Creates the box for displaying statistics.
 
+        The box holds the file type chart and the size treemap in two tabs.
+
         Attributes:
             _stat_box (QGroupBox): The box for displaying statistics.
         """
         self._stat_box = QGroupBox("Stats")
+        self._stat_tabs = QTabWidget()
+
+        self._chart_page = QWidget()
+        self._chart_page.setLayout(QVBoxLayout())
+        self._stat_tabs.addTab(self._chart_page, "File types")
+
+        self._treemap = TreemapWidget()
+        self._treemap.root_changed.connect(self.display_treemap_root)
+
+        self._treemap_up_button = QPushButton("Up")
+        self._treemap_up_button.setAutoDefault(False)
+        self._treemap_up_button.setEnabled(False)
+        self._treemap_up_button.clicked.connect(self._treemap.go_up)
+
+        self._treemap_path = QLabel()
+
+        treemap_path_layout = QHBoxLayout()
+        treemap_path_layout.addWidget(self._treemap_up_button)
+        treemap_path_layout.addWidget(self._treemap_path, 1)
+
+        treemap_page = QWidget()
+        treemap_layout = QVBoxLayout()
+        treemap_layout.addLayout(treemap_path_layout)
+        treemap_layout.addWidget(self._treemap)
+        treemap_page.setLayout(treemap_layout)
+        self._stat_tabs.addTab(treemap_page, "Sizes")
+
+        layout = QVBoxLayout()
+        layout.addWidget(self._stat_tabs)
+        self._stat_box.setLayout(layout)
 
     def display_stat(self, stat_data: dict):
         """
@@ -145,16 +278,26 @@ class Dialog(QDialog):
         Args:
             stat_data (dict): A dictionary containing the statistics data.
         """
-        layout = QVBoxLayout()
-
         if not self.chart_builder:
             self.chart_builder = BarChartBuilder()
             self.chart = self.chart_builder.build(stat_data)
-            layout.addWidget(self.chart)
+            self._chart_page.layout().addWidget(self.chart)
         else:
             self.chart_builder.update(stat_data)
 
-        self._stat_box.setLayout(layout)
+    def display_treemap_root(self, relative_path: str):
+        """
+        Shows the folder displayed by the treemap.
+
+        Args:
+            relative_path (str): The folder relative to the scanned folder, or ROOT_PARENT.
+        """
+        self._treemap_up_button.setEnabled(relative_path != ROOT_PARENT)
+        self._treemap_path.setText(
+            self._path_line.text()
+            if relative_path == ROOT_PARENT
+            else os.path.join(self._path_line.text(), relative_path)
+        )
 
     def show_error(self, title: str, message: str):
         """
@@ -189,30 +332,163 @@ class Dialog(QDialog):
         about_modal.setIconPixmap(icon)
         about_modal.exec()
 
-    def show_csv_saved(self):
+    def show_export_saved(self, path: str):
         """
-        Shows a message box with the text "CSV file saved" when the user downloads a CSV file.
+        Shows a message box telling where the results were exported.
 
-        This function is called by the CSV download button in the main dialog window.
+        Args:
+            path (str): The path of the exported file.
+        """
+        export_saved_modal = QMessageBox()
+        export_saved_modal.setFixedSize(400, 200)
+        export_saved_modal.setWindowTitle("KittyScope")
+        export_saved_modal.setInformativeText(path)
+        export_saved_modal.setText("Results exported")
+        export_saved_modal.setIcon(QMessageBox.Information)
+        export_saved_modal.exec()
+
+    def toggle_export(self):
+        """
+        Asks for the file to export the results to, or cancels a running export.
+        """
+        if self._export_worker is not None:
+            self.cancel_export()
+            return
+
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export results",
+            "kittyscope_results.csv",
+            ";;".join(EXPORT_FILTERS),
+        )
+        if not path:
+            return
+
+        if os.path.splitext(path)[1].lower() not in EXPORT_FILTERS.values():
+            path += EXPORT_FILTERS.get(selected_filter, ".csv")
+        self.start_export(path)
+
+    def start_export(self, path: str):
         """
-        csv_saved_modal = QMessageBox()
-        csv_saved_modal.setFixedSize(400, 200)
-        csv_saved_modal.setWindowTitle("KittyScope")
-        csv_saved_modal.setInformativeText("CSV file saved")
-        csv_saved_modal.setText("CSV file saved")
-        csv_saved_modal.setIcon(QMessageBox.Information)
-        csv_saved_modal.exec()
+        Starts exporting the results on a background thread.
 
-    def open_csv_folder_dialog(self):
+        The whole results table is exported, or only the rows shown by the table
+        in their display order if "Filtered view only" is checked.
+
+        Args:
+            path (str): The path of the exported file. Its extension picks the format.
+        """
+        if self._export_view_checkbox.isChecked() or self._finder is None:
+            table = self._table.model().table
+        else:
+            table = self._finder.results_table
+
+        self._export_id += 1
+        worker = ExportWorker(self._export_id, table, path)
+        thread = QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.update_export_progress)
+        worker.export_finished.connect(self.finish_export)
+        worker.export_failed.connect(self.fail_export)
+        worker.done.connect(thread.quit)
+        thread.finished.connect(self.__release_scan_threads)
+
+        self._export_worker = worker
+        self._scan_threads.append((thread, worker))
+
+        self._progress_bar.setRange(0, 0)
+        self.__set_exporting(True)
+        thread.start()
+
+    def cancel_export(self):
         """
-        Opens a dialog for selecting a folder to save the CSV file.
+        Cancels the running export. The target file is left untouched.
         """
-        folder_path = QFileDialog.getExistingDirectory(self, "Choose Directory")
-        if folder_path:
-            file_name = "kittyscope_results.csv"
-            folder_path = os.path.join(folder_path, file_name)
-            self._finder.save_to_csv(folder_path)
-            self.show_csv_saved()
+        if self._export_worker is not None:
+            self._export_worker.cancel()
+        self.__set_exporting(False)
+
+    def update_export_progress(self, export_id: int, written: int, total: int):
+        """
+        Shows the number of exported rows.
+
+        Args:
+            export_id (int): The id of the export.
+            written (int): The number of written rows.
+            total (int): The number of rows to write.
+        """
+        if export_id != self._export_id or self._export_worker is None:
+            return
+
+        self._progress_bar.setRange(0, total)
+        self._progress_bar.setValue(written)
+
+    def finish_export(self, export_id: int, path: str):
+        """
+        Tells the user where the results were exported.
+
+        Args:
+            export_id (int): The id of the finished export.
+            path (str): The path of the exported file.
+        """
+        if export_id != self._export_id or self._export_worker is None:
+            return
+
+        self.__set_exporting(False)
+        self.show_export_saved(path)
+
+    def fail_export(self, export_id: int, message: str):
+        """
+        Shows the error of a failed export.
+
+        Args:
+            export_id (int): The id of the failed export.
+            message (str): The error message.
+        """
+        if export_id != self._export_id or self._export_worker is None:
+            return
+
+        self.__set_exporting(False)
+        self.show_error(title="Export failed", message=message)
+
+    def save_snapshot(self):
+        """
+        Saves the current results as a snapshot to compare later scans with.
+        """
+        if self._scan_worker is not None or self._finder is None:
+            self.show_error(
+                title="No results", message="Wait for a scan to finish first."
+            )
+            return
+
+        try:
+            entry = self._finder.save_snapshot(self._snapshot_store)
+        except Exception as e:
+            self.show_error(title="Snapshot failed", message=e.__str__())
+            return
+
+        snapshot_saved_modal = QMessageBox()
+        snapshot_saved_modal.setFixedSize(400, 200)
+        snapshot_saved_modal.setWindowTitle("KittyScope")
+        snapshot_saved_modal.setInformativeText(
+            f"{entry['entries']:,} entries of {entry['path']}"
+        )
+        snapshot_saved_modal.setText("Snapshot saved")
+        snapshot_saved_modal.setIcon(QMessageBox.Information)
+        snapshot_saved_modal.exec()
+
+    def compare_snapshot(self):
+        """
+        Opens the dialog comparing the current results with a snapshot.
+        """
+        if self._scan_worker is not None or self._finder is None:
+            self.show_error(
+                title="No results", message="Wait for a scan to finish first."
+            )
+            return
+
+        SnapshotDialog(self._finder, self._snapshot_store, self).exec()
 
     def open_search_folder_dialog(self):
         """
@@ -220,21 +496,379 @@ class Dialog(QDialog):
         """
         folder_path = QFileDialog.getExistingDirectory(self, "Choose Directory")
         if folder_path:
-            try:
-                self.__hide_ui(True)
-                self._finder = Finder(folder_path)
-                table_data = self._finder.get_results()
-                self.display_results(table_data)
-
-                stat_data = self._analyzer.get_file_type_stat(
-                    self._finder.results_table
+            self.start_scan(folder_path)
+
+    def rescan(self):
+        """
+        Scans the current folder again, ignoring its cached results.
+        """
+        if self._path_line.text():
+            self.start_scan(self._path_line.text(), force_rescan=True)
+
+    def start_scan(self, folder_path: str, force_rescan: bool = False):
+        """
+        Starts scanning the given folder on a background thread.
+
+        A scan that is still running is cancelled first, and its remaining
+        signals are ignored. Unchanged folders are loaded from the scan cache.
+
+        Args:
+            folder_path (str): The path to the folder to scan.
+            force_rescan (bool): If True, ignores the cached results of the folder.
+        """
+        self._table.clear_results()
+        self.cancel_scan()
+        self.cancel_probe()
+        self.cancel_refresh()
+        self._folder_watcher.stop()
+
+        self._scan_id += 1
+        self._stat_data = EMPTY_STAT
+        self._treemap.clear()
+        self._path_line.setText(folder_path)
+        self.display_treemap_root(ROOT_PARENT)
+
+        worker = ScanWorker(
+            self._scan_id,
+            folder_path,
+            recursive=self._recursive_checkbox.isChecked(),
+            cache=self._scan_cache,
+            force_rescan=force_rescan,
+        )
+        thread = QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.batch_ready.connect(self.append_batch)
+        worker.scan_finished.connect(self.finish_scan)
+        worker.scan_failed.connect(self.fail_scan)
+        worker.done.connect(thread.quit)
+        thread.finished.connect(self.__release_scan_threads)
+
+        self._probe_button.setEnabled(False)
+        self._scan_worker = worker
+        self._scan_threads.append((thread, worker))
+
+        self._progress_bar.setRange(0, 0)
+        self._progress_bar.setHidden(False)
+        self._rescan_button.setEnabled(True)
+        self._cancel_scan_button.setEnabled(True)
+        thread.start()
+
+    def cancel_scan(self):
+        """
+        Cancels the current scan, keeping the rows received so far.
+        """
+        if self._scan_worker is not None:
+            self._scan_worker.cancel()
+            self._scan_worker = None
+            self._table.finish_results()
+        self.__set_scanning(False)
+
+    def append_batch(self, scan_id: int, batch: pl.DataFrame):
+        """
+        Adds a batch of scanned rows to the table and refreshes the chart.
+
+        Args:
+            scan_id (int): The id of the scan the batch belongs to.
+            batch (pl.DataFrame): The scanned rows.
+        """
+        if scan_id != self._scan_id:
+            return
+
+        self._table.append_results(batch)
+        self.__hide_ui(False)
+
+        self._stat_data = self._analyzer.update_file_type_stat(
+            self._stat_data, batch, batch.clear()
+        )
+        self.display_stat(self._stat_data)
+
+    def finish_scan(self, scan_id: int, finder: Finder):
+        """
+        Displays the final results of a scan.
+
+        Recursive scans are displayed again, because folder sizes are only
+        rolled up once the whole tree is crawled. The streamed rows of a flat
+        scan are only sorted once.
+
+        Args:
+            scan_id (int): The id of the finished scan.
+            finder (Finder): The Finder holding the results table.
+        """
+        if scan_id != self._scan_id:
+            return
+
+        self._finder = finder
+        if finder.recursive:
+            self.display_results(finder.results_table)
+        else:
+            self._table.finish_results()
+
+        self._stat_data = self._analyzer.get_file_type_stat(finder.results_table)
+        self.display_stat(self._stat_data)
+        self._treemap.set_table(finder.results_table)
+        self.__hide_ui(False)
+        self._scan_worker = None
+        self.__set_scanning(False)
+        self._probe_button.setEnabled(True)
+        self.toggle_watch(self._watch_checkbox.isChecked())
+
+    def filter_file_type(self, index: int):
+        """
+        Displays only the rows of the file type chosen in the filter.
+
+        Args:
+            index (int): The index of the chosen filter item.
+        """
+        self._table.filter_file_type(self._file_type_filter.itemData(index))
+
+    def toggle_probe(self):
+        """
+        Starts probing the media metadata of the scanned files, or cancels a running probe.
+        """
+        if self._probe_worker is not None:
+            self.cancel_probe()
+            return
+
+        if self._scan_worker is not None or self._finder is None:
+            return
+
+        self._probe_id += 1
+        worker = ProbeWorker(
+            self._probe_id, self._finder.path, self._finder.results_table
+        )
+        thread = QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.update_probe_progress)
+        worker.probe_finished.connect(self.finish_probe)
+        worker.probe_failed.connect(self.fail_probe)
+        worker.done.connect(thread.quit)
+        thread.finished.connect(self.__release_scan_threads)
+
+        self._probe_worker = worker
+        self._scan_threads.append((thread, worker))
+
+        self._progress_bar.setRange(0, 0)
+        self._progress_bar.setHidden(False)
+        self._probe_button.setText("Cancel probe")
+        thread.start()
+
+    def cancel_probe(self):
+        """
+        Cancels the running probe, leaving the results table unchanged.
+        """
+        if self._probe_worker is not None:
+            self._probe_worker.cancel()
+        self.__set_probing(False)
+
+    def update_probe_progress(self, probe_id: int, probed: int, total: int):
+        """
+        Shows the number of probed files.
+
+        Args:
+            probe_id (int): The id of the probe.
+            probed (int): The number of probed files.
+            total (int): The number of files to probe.
+        """
+        if probe_id != self._probe_id or self._probe_worker is None:
+            return
+
+        self._progress_bar.setRange(0, total)
+        self._progress_bar.setValue(probed)
+
+    def finish_probe(self, probe_id: int, probe_results: pl.DataFrame):
+        """
+        Merges the probed media metadata into the results table.
+
+        Args:
+            probe_id (int): The id of the finished probe.
+            probe_results (pl.DataFrame): The probe results.
+        """
+        if probe_id != self._probe_id or self._probe_worker is None:
+            return
+
+        self.__set_probing(False)
+        self._finder.merge_probe_results(probe_results)
+        self._table.update_results(self._finder.results_table)
+
+    def fail_probe(self, probe_id: int, message: str):
+        """
+        Shows the error of a failed probe.
+
+        Args:
+            probe_id (int): The id of the failed probe.
+            message (str): The error message.
+        """
+        if probe_id != self._probe_id or self._probe_worker is None:
+            return
+
+        self.__set_probing(False)
+        self.show_error(title="Probe failed", message=message)
+
+    def toggle_watch(self, flag: bool):
+        """
+        Starts or stops watching the scanned folders for changes.
+
+        Args:
+            flag (bool): If True, the scanned folders are watched.
+        """
+        if not flag or self._scan_worker is not None or self._finder is None:
+            self._folder_watcher.stop()
+            return
+
+        self._folder_watcher.watch(
+            self._finder.path,
+            self.__get_walked_folders(),
+            self.__get_watched_files(),
+        )
+
+    def apply_folder_changes(self, folders: list[str]):
+        """
+        Queues the changes of watched folders for a refresh on a background thread.
+
+        Folders that change while a refresh runs are refreshed together once it
+        finishes.
+
+        Args:
+            folders (list[str]): The changed folders relative to the scanned folder.
+        """
+        if self._scan_worker is not None or self._finder is None:
+            return
+
+        self._pending_folders.extend(
+            folder for folder in folders if folder not in self._pending_folders
+        )
+        if self._refresh_worker is None:
+            self.start_refresh()
+
+    def start_refresh(self):
+        """
+        Starts listing the queued folders again on a background thread.
+        """
+        folders, self._pending_folders = self._pending_folders, []
+        self._refresh_id += 1
+        self._refresh_base = self._finder.results_table
+
+        worker = RefreshWorker(self._refresh_id, self._finder, folders)
+        thread = QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.refresh_finished.connect(self.finish_refresh)
+        worker.refresh_failed.connect(self.fail_refresh)
+        worker.done.connect(thread.quit)
+        thread.finished.connect(self.__release_scan_threads)
+
+        self._refresh_worker = worker
+        self._scan_threads.append((thread, worker))
+        thread.start()
+
+    def cancel_refresh(self):
+        """
+        Abandons the running refresh and forgets the queued folders.
+        """
+        self._refresh_id += 1
+        self._refresh_worker = None
+        self._pending_folders = []
+
+    def finish_refresh(
+        self, refresh_id: int, results_table: pl.DataFrame, changes: list
+    ):
+        """
+        Applies refreshed folders to the table and the chart.
+
+        The table keeps its sort order and search results, and the statistics
+        are updated incrementally. If the results table changed meanwhile, like
+        when probe results were merged, the folders are refreshed again from it.
+
+        Args:
+            refresh_id (int): The id of the finished refresh.
+            results_table (pl.DataFrame): The refreshed results table.
+            changes (list[FolderChanges]): The changes of every refreshed folder.
+        """
+        if refresh_id != self._refresh_id or self._refresh_worker is None:
+            return
+
+        folders = self._refresh_worker.folders
+        self._refresh_worker = None
+        if self._finder.results_table is not self._refresh_base:
+            self.apply_folder_changes(folders)
+            return
+
+        changes = [
+            folder_changes
+            for folder_changes in changes
+            if not folder_changes.is_empty()
+        ]
+        if changes:
+            self._finder.results_table = results_table
+            for folder_changes in changes:
+                self._stat_data = self._analyzer.update_file_type_stat(
+                    self._stat_data, folder_changes.added, folder_changes.removed
+                )
+                if self._finder.recursive:
+                    self._folder_watcher.add_folders(
+                        self.__get_walked_folders(folder_changes.added)
+                    )
+                self._folder_watcher.add_files(
+                    self.__get_watched_files(folder_changes.added)
+                    + self.__get_watched_files(folder_changes.modified)
                 )
-                self.display_stat(stat_data)
 
-                self.__hide_ui(False)
-            except Exception as e:
-                self.show_error(title="Invalid path", message=e.__str__())
-            self._path_line.setText(folder_path)
+            self._table.update_results(self._finder.results_table)
+            self.display_stat(self._stat_data)
+            self._treemap.set_table(self._finder.results_table)
+
+        if self._pending_folders:
+            self.start_refresh()
+
+    def fail_refresh(self, refresh_id: int, message: str):
+        """
+        Shows the error of a failed refresh.
+
+        Args:
+            refresh_id (int): The id of the failed refresh.
+            message (str): The error message.
+        """
+        if refresh_id != self._refresh_id or self._refresh_worker is None:
+            return
+
+        self._refresh_worker = None
+        self.show_error(title="Refresh failed", message=message)
+        if self._pending_folders:
+            self.start_refresh()
+
+    def fail_scan(self, scan_id: int, message: str):
+        """
+        Shows the error of a failed scan.
+
+        Args:
+            scan_id (int): The id of the failed scan.
+            message (str): The error message.
+        """
+        if scan_id != self._scan_id:
+            return
+
+        self._scan_worker = None
+        self._table.finish_results()
+        self.__set_scanning(False)
+        self.show_error(title="Invalid path", message=message)
+
+    def done(self, result: int):
+        """
+        Cancels running scans and waits for their threads before the dialog closes.
+
+        Args:
+            result (int): The dialog result code.
+        """
+        self.cancel_scan()
+        self.cancel_probe()
+        self.cancel_refresh()
+        self.cancel_export()
+        for thread, _ in list(self._scan_threads):
+            thread.quit()
+            thread.wait()
+        super().done(result)
 
     def display_file_info(self, row, column):
         """
@@ -244,12 +878,12 @@ class Dialog(QDialog):
             row (int): The row of the selected file.
             column (int): The column of the selected file.
         """
-        file_name = self._table.item(row, column).text()
-        file_path = os.path.join(self._path_line.text(), file_name)
+        file_path = os.path.join(
+            self._path_line.text(), self._table.get_relative_path(row)
+        )
 
-        research_router = ResearchRouter()
         try:
-            tag, file_info = research_router.get_file_info(file_path)
+            tag, file_info = self._research_router.get_file_info(file_path)
             file_info_dialog = QDialog()
             file_info_dialog.setWindowTitle("KittyScope")
             main_layout = QVBoxLayout()
@@ -381,13 +1015,28 @@ class Dialog(QDialog):
         """
         self.__display_video_info(file_info, main_layout)
 
+    def search(self, text: str):
+        """
+        Searches the names in the chosen search mode.
+
+        Args:
+            text (str): The text to search for.
+        """
+        self._search_input.drop_steps()
+        self._table.search(text, self._search_mode.currentData())
+
     def step_through_results(self):
         """
         Steps through the search results.
 
         Increments the search step counter and attempts to display the next result.
         If there are no more results, resets the counter and displays the first result.
+        A search still waiting for typing to pause runs instead.
         """
+        if self._search_input.is_search_pending():
+            self._search_input.request_search()
+            return
+
         self._search_input.add_search_step()
         step = self._search_input._search_steps
         try:
@@ -396,20 +1045,99 @@ class Dialog(QDialog):
             self._table.step_through_results(0)
             self._search_input.drop_steps()
 
-    def display_results(self, table_data: dict[str, list]):
+    def display_results(self, results_table: pl.DataFrame):
         """
         Displays the file information for the given folder.
 
-        Hides the table and progress bar, displays the progress bar, displays the table data, hides the progress bar, and displays the table again.
+        Args:
+            results_table (pl.DataFrame): The results table of the scanned folder.
+        """
+        self._table.display_results(results_table)
+
+    def __get_walked_folders(self, rows: pl.DataFrame | None = None) -> list[str]:
+        """
+        Returns the folders of a recursive scan relative to the scanned folder.
 
         Args:
-            table_data (dict[str, list]): A dictionary of file and folder information.
+            rows (pl.DataFrame | None): The rows to take folders from. Defaults to the results table.
+
+        Returns:
+            list[str]: The relative paths of the walked folders.
         """
-        self._progress_bar.setHidden(False)
-        self._table.setHidden(True)
-        self._table.display_results(table_data, self._progress_bar)
-        self._progress_bar.setHidden(True)
-        self._table.setHidden(False)
+        if not self._finder.recursive:
+            return []
+
+        if rows is None:
+            rows = self._finder.results_table
+        return (
+            rows.filter(pl.col("type") == "folder", pl.col("file_count").is_not_null())
+            .select(relative_path_expr())
+            .to_series()
+            .to_list()
+        )
+
+    def __get_watched_files(self, rows: pl.DataFrame | None = None) -> list[str]:
+        """
+        Returns the files and other non-folder entries relative to the scanned folder.
+
+        Args:
+            rows (pl.DataFrame | None): The rows to take files from. Defaults to the results table.
+
+        Returns:
+            list[str]: The relative paths of the files.
+        """
+        if rows is None:
+            rows = self._finder.results_table
+        path = relative_path_expr() if self._finder.recursive else pl.col("name")
+        return (
+            rows.filter(pl.col("type") != "folder").select(path).to_series().to_list()
+        )
+
+    def __set_scanning(self, flag: bool):
+        """
+        Shows or hides the scan progress indicator.
+
+        Args:
+            flag (bool): If True, a scan is running.
+        """
+        self._progress_bar.setHidden(not flag)
+        self._cancel_scan_button.setEnabled(flag)
+
+    def __set_probing(self, flag: bool):
+        """
+        Shows or hides the probe progress and resets the probe worker when it stops.
+
+        Args:
+            flag (bool): If True, a probe is running.
+        """
+        if not flag:
+            self._probe_worker = None
+        self._progress_bar.setHidden(not flag)
+        self._probe_button.setText("Cancel probe" if flag else "Probe media")
+
+    def __set_exporting(self, flag: bool):
+        """
+        Shows or hides the export progress and resets the export worker when it stops.
+
+        Args:
+            flag (bool): If True, an export is running.
+        """
+        if not flag:
+            self._export_worker = None
+        self._progress_bar.setHidden(not flag)
+        self._export_button.setText("Cancel export" if flag else "Export")
+
+    def __release_scan_threads(self):
+        """
+        Forgets the threads of scans, probes and refreshes that have stopped.
+        """
+        running_threads = []
+        for thread, worker in self._scan_threads:
+            if thread.isFinished():
+                thread.deleteLater()
+            else:
+                running_threads.append((thread, worker))
+        self._scan_threads = running_threads
 
     def __hide_ui(self, flag: bool):
         """
@@ -1,5 +1,8 @@
+from PySide6.QtCore import QTimer, Signal
 from PySide6.QtWidgets import QLineEdit
 
+SEARCH_DELAY_MS = 150
+
 
 class PathLine(QLineEdit):
     """
@@ -20,6 +23,16 @@ class PathLine(QLineEdit):
 
 
 class SearchInput(QLineEdit):
+    """
+    A line edit for searching by name that waits for typing to pause.
+
+    Signals:
+        search_requested (str): Emitted with the text once no key was pressed for
+            SEARCH_DELAY_MS milliseconds, so a search does not run on every keystroke.
+    """
+
+    search_requested = Signal(str)
+
     def __init__(self):
         """
         Initializes the SearchInput widget.
@@ -31,6 +44,25 @@ class SearchInput(QLineEdit):
 
         self._search_steps: int = 0
 
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.request_search)
+        self.textChanged.connect(self._search_timer.start)
+
+    def is_search_pending(self) -> bool:
+        """
+        Returns True if the text changed and the search has not run yet.
+        """
+        return self._search_timer.isActive()
+
+    def request_search(self):
+        """
+        Emits search_requested with the current text right away.
+        """
+        self._search_timer.stop()
+        self.search_requested.emit(self.text())
+
     def add_search_step(self):
         """
         Increments the search steps counter.
@@ -0,0 +1,339 @@
+from collections import OrderedDict
+
+import polars as pl
+import polars.selectors as cs
+from PySide6.QtCore import QAbstractTableModel, QDateTime, QModelIndex, Qt
+
+from kittyscope.models.name_index import NameIndex
+from kittyscope.models.query import ResultsQuery
+
+BLOCK_SIZE = 256
+MAX_CACHED_BLOCKS = 64
+SOURCE_ROW = "__source_row"
+
+COLUMN_LABELS = {
+    "name": "Name",
+    "type": "Type",
+    "size": "Size (bytes)",
+    "extension": "Extension",
+    "file_type": "File type",
+    "detected_type": "Detected type",
+    "last_access": "Last access",
+    "last_modification": "Last modification",
+    "depth": "Depth",
+    "parent": "Parent",
+    "file_count": "Files",
+    "media_type": "Media",
+    "width": "Width",
+    "height": "Height",
+    "color_mode": "Color mode",
+    "media_format": "Format",
+    "duration": "Duration (s)",
+    "bit_rate": "Bit rate",
+    "nb_streams": "Streams",
+    "pages_count": "Pages",
+    "author": "Author",
+    "title": "Title",
+    "probe_error": "Probe error",
+    "path": "Path",
+    "change": "Change",
+    "old_size": "Old size (bytes)",
+    "new_size": "New size (bytes)",
+    "delta": "Delta (bytes)",
+    "added": "Added",
+    "removed": "Removed",
+    "resized": "Resized",
+}
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """
+    A table model that reads lazily from a polars results table.
+
+    Rows are materialized in blocks of BLOCK_SIZE only when the view asks for
+    them, and display values are formatted on demand in data(). The file type
+    filter and the sort order are applied to the source table as one lazy
+    ResultsQuery. Time columns are materialized as epoch milliseconds and
+    turned into local QDateTime values only for display. Names are searched
+    through a NameIndex over the source table, built on the first search.
+
+    Attributes:
+        _source (pl.DataFrame): The unfiltered results table, in scan order.
+        _table (pl.DataFrame): The displayed results table, in display order.
+        _source_rows (pl.Series): The source row of every displayed row.
+        _display_rows (pl.Series | None): The displayed row of every source row, null
+            for filtered out rows, or None until a search needs it.
+        _name_index (NameIndex | None): The name index of the source table, or None
+            until a search needs it.
+        _file_type (str | None): The displayed file type, or None to display every row.
+        _blocks (OrderedDict[int, list[tuple]]): The least recently used materialized row blocks.
+        _sort_column (int): The sorted column, or -1 if the table is in scan order.
+        _sort_order (Qt.SortOrder): The order of the sorted column.
+        _sort_pending (bool): Whether rows were appended after the last sort.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._source = pl.DataFrame()
+        self._table = pl.DataFrame()
+        self._source_rows = pl.Series(dtype=pl.UInt32)
+        self._display_rows: pl.Series | None = None
+        self._name_index: NameIndex | None = None
+        self._file_type: str | None = None
+        self._blocks: OrderedDict[int, list[tuple]] = OrderedDict()
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._sort_pending = False
+        self._datetime_columns: set[int] = set()
+
+    @property
+    def table(self) -> pl.DataFrame:
+        return self._table
+
+    @property
+    def columns(self) -> list[str]:
+        return self._table.columns
+
+    def set_table(self, table: pl.DataFrame) -> None:
+        """
+        Replaces the displayed table, keeping the current filter and sort order.
+
+        Args:
+            table (pl.DataFrame): The results table to display.
+        """
+        self.beginResetModel()
+        self._source = table
+        self._name_index = None
+        self._sort_pending = False
+        self.__set_view(self.__query(table, sort=True).collect())
+        self._datetime_columns = {
+            column_index
+            for column_index, dtype in enumerate(table.dtypes)
+            if dtype == pl.Datetime
+        }
+        self._blocks.clear()
+        self.endResetModel()
+
+    def append_rows(self, batch: pl.DataFrame) -> None:
+        """
+        Appends a batch of rows after the displayed ones, keeping the current filter.
+
+        Sorting the whole table for every batch of a scan would make streaming
+        quadratic, so with a sort column the appended rows stay in scan order
+        until finish_rows or the next sort.
+
+        Args:
+            batch (pl.DataFrame): The rows to append.
+        """
+        if self._source.columns != batch.columns:
+            self.set_table(batch)
+            return
+
+        if self._name_index is not None:
+            self._name_index.append(batch.get_column("name"))
+        view = self.__query(batch, sort=False, offset=self._source.height).collect()
+        self._source = pl.concat([self._source, batch])
+        self._display_rows = None
+        if view.height == 0:
+            return
+
+        first_row = self._table.height
+        self.beginInsertRows(QModelIndex(), first_row, first_row + view.height - 1)
+        self._source_rows = pl.concat([self._source_rows, view.get_column(SOURCE_ROW)])
+        self._table = pl.concat([self._table, view.drop(SOURCE_ROW)])
+        self.endInsertRows()
+        self._sort_pending = 0 <= self._sort_column < self._table.width
+
+    def finish_rows(self) -> None:
+        """
+        Sorts the rows appended since the last sort, once no more rows are coming.
+        """
+        if self._sort_pending:
+            self.sort(self._sort_column, self._sort_order)
+
+    def rowCount(self, parent: QModelIndex | None = None) -> int:
+        return 0 if parent is not None and parent.isValid() else self._table.height
+
+    def columnCount(self, parent: QModelIndex | None = None) -> int:
+        return 0 if parent is not None and parent.isValid() else self._table.width
+
+    def headerData(
+        self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole
+    ):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            column = self._table.columns[section]
+            return COLUMN_LABELS.get(column, column)
+        return section + 1
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if index.column() == 0:
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        return Qt.ItemIsEnabled
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+
+        value = self.get_row(index.row())[index.column()]
+        if value is None:
+            return "-"
+        if index.column() in self._datetime_columns:
+            return QDateTime.fromMSecsSinceEpoch(value)
+        return value
+
+    def set_file_type(self, file_type: str | None) -> None:
+        """
+        Displays only the rows of a file type, keeping the current sort order.
+
+        Args:
+            file_type (str | None): The file type to display, or None to display every row.
+        """
+        self._file_type = file_type
+        self.set_table(self._source)
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        """
+        Sorts the whole table with polars. A negative column keeps the scan order.
+
+        Persistent indexes, like the selection of the view, follow their rows.
+
+        Args:
+            column (int): The column to sort by.
+            order (Qt.SortOrder): The sort order.
+        """
+        self._sort_column = column
+        self._sort_order = order
+        self._sort_pending = False
+        if column < 0 or column >= self._table.width:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        persistent_indexes = self.persistentIndexList()
+        old_source_rows = self._source_rows
+        self.__set_view(self.__query(self._source, sort=True).collect())
+        self._blocks.clear()
+        if persistent_indexes:
+            new_rows = self.__get_display_rows().gather(
+                old_source_rows.gather([index.row() for index in persistent_indexes])
+            )
+            self.changePersistentIndexList(
+                persistent_indexes,
+                [
+                    self.index(row, index.column())
+                    for row, index in zip(new_rows, persistent_indexes)
+                ],
+            )
+        self.layoutChanged.emit()
+
+    def get_row(self, row: int) -> tuple:
+        """
+        Returns the values of a row, materializing its block if needed.
+
+        Args:
+            row (int): The row in display order.
+
+        Returns:
+            tuple: The row values in column order.
+        """
+        block_index = row // BLOCK_SIZE
+        block = self._blocks.get(block_index)
+        if block is None:
+            block = (
+                self._table.slice(block_index * BLOCK_SIZE, BLOCK_SIZE)
+                .with_columns(cs.datetime().dt.epoch("ms"))
+                .rows()
+            )
+            self._blocks[block_index] = block
+            if len(self._blocks) > MAX_CACHED_BLOCKS:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(block_index)
+
+        return block[row % BLOCK_SIZE]
+
+    def get_value(self, row: int, column: str):
+        """
+        Returns a single value of the table.
+
+        Args:
+            row (int): The row in display order.
+            column (str): The name of the column.
+
+        Returns:
+            The value of the cell. Time values are epoch milliseconds.
+        """
+        return self.get_row(row)[self._table.columns.index(column)]
+
+    def find_rows(self, text: str, mode: str = "substring") -> list[int]:
+        """
+        Finds the rows whose name matches the given text.
+
+        Args:
+            text (str): The text to search for.
+            mode (str): The NameIndex search mode, "substring", "glob" or "regex".
+
+        Returns:
+            list[int]: The matching rows in display order.
+        """
+        if not text or self._table.height == 0 or "name" not in self._source.columns:
+            return []
+
+        if self._name_index is None:
+            self._name_index = NameIndex(self._source.get_column("name"))
+
+        source_rows = self._name_index.search(text, mode)
+        return (
+            self.__get_display_rows().gather(source_rows).drop_nulls().sort().to_list()
+        )
+
+    def __get_display_rows(self) -> pl.Series:
+        """
+        Returns the displayed row of every source row, building it if needed.
+
+        Returns:
+            pl.Series: The displayed rows, null for filtered out rows.
+        """
+        if self._display_rows is None:
+            self._display_rows = pl.repeat(
+                None, self._source.height, dtype=pl.UInt32, eager=True
+            ).scatter(
+                self._source_rows,
+                pl.int_range(self._source_rows.len(), dtype=pl.UInt32, eager=True),
+            )
+        return self._display_rows
+
+    def __set_view(self, view: pl.DataFrame) -> None:
+        """
+        Displays the rows collected by a display query.
+
+        Args:
+            view (pl.DataFrame): The collected rows with their source rows.
+        """
+        self._source_rows = view.get_column(SOURCE_ROW)
+        self._table = view.drop(SOURCE_ROW)
+        self._display_rows = None
+
+    def __query(self, table: pl.DataFrame, sort: bool, offset: int = 0) -> ResultsQuery:
+        """
+        Builds the query that filters and sorts a table for display.
+
+        Args:
+            table (pl.DataFrame): The table to display.
+            sort (bool): If True, the rows are sorted by the current sort column.
+            offset (int): The source row of the first row of the table.
+
+        Returns:
+            ResultsQuery: The display query of the table, with the source row of
+                every row in the SOURCE_ROW column.
+        """
+        query = ResultsQuery(table.lazy().with_row_index(SOURCE_ROW, offset))
+        if self._file_type is not None and "file_type" in table.columns:
+            query = query.filter_file_type(self._file_type)
+        if sort and 0 <= self._sort_column < table.width:
+            query = query.sort(
+                table.columns[self._sort_column],
+                descending=self._sort_order == Qt.DescendingOrder,
+            )
+        return query
@@ -0,0 +1,358 @@
+from PySide6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QPushButton,
+    QFileDialog,
+    QMessageBox,
+    QLabel,
+    QProgressBar,
+    QComboBox,
+    QTabWidget,
+    QTableView,
+    QAbstractItemView,
+    QHeaderView,
+)
+from PySide6.QtCore import Qt, QThread, QObject
+import polars as pl
+from kittyscope.models.finder import Finder
+from kittyscope.models.scan_diff import ScanDiff
+from kittyscope.models.snapshots import SnapshotStore
+from kittyscope.widgets.results_model import ResultsTableModel
+from kittyscope.widgets.workers import EXPORT_FILTERS, DiffWorker, ExportWorker
+import os
+
+DIFF_TABS = {
+    "folders": "Folders",
+    "file_types": "File types",
+    "entries": "Entries",
+}
+
+
+class SnapshotDialog(QDialog):
+    """
+    A dialog comparing the current results with a saved snapshot.
+
+    The growth is shown by folder, by file type and by entry, each sorted by the
+    largest change first. Comparisons and exports run on background threads.
+
+    Attributes:
+        _finder (Finder): The Finder holding the current results.
+        _store (SnapshotStore): The store holding the snapshots.
+        _diff (ScanDiff | None): The last comparison, or None before the first one.
+        _diff_worker (DiffWorker | None): The worker running the current comparison.
+        _export_worker (ExportWorker | None): The worker exporting a diff table.
+        _threads (list[tuple[QThread, QObject]]): The threads of running and
+            abandoned comparisons and exports.
+    """
+
+    def __init__(self, finder: Finder, store: SnapshotStore, parent=None):
+        """
+        Initializes the dialog window.
+
+        Args:
+            finder (Finder): The Finder holding the current results.
+            store (SnapshotStore): The store holding the snapshots.
+            parent (QWidget | None): The parent widget.
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Compare with snapshot")
+
+        self._finder = finder
+        self._store = store
+        self._diff: ScanDiff | None = None
+        self._diff_id = 0
+        self._diff_worker: DiffWorker | None = None
+        self._export_id = 0
+        self._export_worker: ExportWorker | None = None
+        self._threads: list[tuple[QThread, QObject]] = []
+
+        self._snapshot_combo = QComboBox()
+        for entry in reversed(
+            store.get_snapshots(finder.path, finder.recursive, finder.max_depth)
+        ):
+            self._snapshot_combo.addItem(
+                f"{entry['taken_at'][:19].replace('T', ' ')}"
+                f"  ({entry['entries']:,} entries, {entry['size']:,} bytes)",
+                entry["id"],
+            )
+        self._snapshot_combo.currentIndexChanged.connect(self.start_diff)
+
+        self._delete_button = QPushButton("Delete snapshot")
+        self._delete_button.setAutoDefault(False)
+        self._delete_button.clicked.connect(self.delete_snapshot)
+
+        snapshot_layout = QHBoxLayout()
+        snapshot_layout.addWidget(QLabel("Snapshot: "))
+        snapshot_layout.addWidget(self._snapshot_combo, 1)
+        snapshot_layout.addWidget(self._delete_button)
+
+        self._summary_label = QLabel()
+        self._progress_bar = QProgressBar()
+        self._progress_bar.setHidden(True)
+
+        self._tabs = QTabWidget()
+        self._models: dict[str, ResultsTableModel] = {}
+        for name, label in DIFF_TABS.items():
+            model = ResultsTableModel()
+            view = QTableView()
+            view.setModel(model)
+            view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+            view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+            view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+            view.setSortingEnabled(True)
+            self._models[name] = model
+            self._tabs.addTab(view, label)
+
+        self._export_button = QPushButton("Export")
+        self._export_button.setAutoDefault(False)
+        self._export_button.setEnabled(False)
+        self._export_button.clicked.connect(self.toggle_export)
+
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(snapshot_layout)
+        main_layout.addWidget(self._summary_label)
+        main_layout.addWidget(self._progress_bar)
+        main_layout.addWidget(self._tabs)
+        main_layout.addWidget(self._export_button)
+        self.setLayout(main_layout)
+        self.resize(800, 600)
+
+        self.start_diff()
+
+    def start_diff(self):
+        """
+        Starts comparing the chosen snapshot with the current results.
+        """
+        snapshot_id = self._snapshot_combo.currentData()
+        self._diff_id += 1
+        self._diff = None
+        for model in self._models.values():
+            model.set_table(pl.DataFrame())
+        self._export_button.setEnabled(False)
+        self._delete_button.setEnabled(snapshot_id is not None)
+
+        if snapshot_id is None:
+            self._summary_label.setText(
+                "There is no snapshot of this folder with the same scan options yet."
+            )
+            return
+
+        worker = DiffWorker(
+            self._diff_id, self._store, snapshot_id, self._finder.results_table
+        )
+        thread = QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.diff_finished.connect(self.finish_diff)
+        worker.diff_failed.connect(self.fail_diff)
+        worker.done.connect(thread.quit)
+        thread.finished.connect(self.__release_threads)
+
+        self._diff_worker = worker
+        self._threads.append((thread, worker))
+
+        self._summary_label.setText("Comparing…")
+        self._progress_bar.setRange(0, 0)
+        self._progress_bar.setHidden(False)
+        thread.start()
+
+    def finish_diff(self, diff_id: int, diff: ScanDiff):
+        """
+        Displays the differences with the snapshot.
+
+        Args:
+            diff_id (int): The id of the finished comparison.
+            diff (ScanDiff): The differences.
+        """
+        if diff_id != self._diff_id:
+            return
+
+        self._diff = diff
+        self._diff_worker = None
+        self._progress_bar.setHidden(True)
+        for name, model in self._models.items():
+            model.set_table(getattr(diff, name))
+
+        summary = diff.summary
+        self._summary_label.setText(
+            f"{summary['delta']:+,} bytes since the snapshot "
+            f"({summary['old_size']:,} → {summary['new_size']:,}): "
+            f"{summary['added']:,} added, {summary['removed']:,} removed, "
+            f"{summary['resized']:,} resized"
+        )
+        self._export_button.setEnabled(True)
+
+    def fail_diff(self, diff_id: int, message: str):
+        """
+        Shows the error of a failed comparison.
+
+        Args:
+            diff_id (int): The id of the failed comparison.
+            message (str): The error message.
+        """
+        if diff_id != self._diff_id:
+            return
+
+        self._diff_worker = None
+        self._progress_bar.setHidden(True)
+        self._summary_label.setText(f"Comparison failed: {message}")
+
+    def delete_snapshot(self):
+        """
+        Deletes the chosen snapshot after asking for confirmation.
+        """
+        snapshot_id = self._snapshot_combo.currentData()
+        if snapshot_id is None:
+            return
+
+        answer = QMessageBox.question(
+            self,
+            "KittyScope",
+            f"Delete the snapshot of {self._snapshot_combo.currentText()}?",
+        )
+        if answer != QMessageBox.Yes:
+            return
+
+        self._store.delete(snapshot_id)
+        self._snapshot_combo.removeItem(self._snapshot_combo.currentIndex())
+
+    def toggle_export(self):
+        """
+        Asks for the file to export the shown diff table to, or cancels a running export.
+        """
+        if self._export_worker is not None:
+            self.cancel_export()
+            return
+
+        if self._diff is None:
+            return
+
+        name = list(DIFF_TABS)[self._tabs.currentIndex()]
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export differences",
+            f"kittyscope_diff_{name}.csv",
+            ";;".join(EXPORT_FILTERS),
+        )
+        if not path:
+            return
+
+        if os.path.splitext(path)[1].lower() not in EXPORT_FILTERS.values():
+            path += EXPORT_FILTERS.get(selected_filter, ".csv")
+        self.start_export(self._models[name].table, path)
+
+    def start_export(self, table: pl.DataFrame, path: str):
+        """
+        Starts exporting a diff table on a background thread.
+
+        Args:
+            table (pl.DataFrame): The diff table in its display order.
+            path (str): The path of the exported file. Its extension picks the format.
+        """
+        self._export_id += 1
+        worker = ExportWorker(self._export_id, table, path)
+        thread = QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.update_export_progress)
+        worker.export_finished.connect(self.finish_export)
+        worker.export_failed.connect(self.fail_export)
+        worker.done.connect(thread.quit)
+        thread.finished.connect(self.__release_threads)
+
+        self._export_worker = worker
+        self._threads.append((thread, worker))
+
+        self._progress_bar.setRange(0, 0)
+        self.__set_exporting(True)
+        thread.start()
+
+    def cancel_export(self):
+        """
+        Cancels the running export. The target file is left untouched.
+        """
+        if self._export_worker is not None:
+            self._export_worker.cancel()
+        self.__set_exporting(False)
+
+    def update_export_progress(self, export_id: int, written: int, total: int):
+        """
+        Shows the number of exported rows.
+
+        Args:
+            export_id (int): The id of the export.
+            written (int): The number of written rows.
+            total (int): The number of rows to write.
+        """
+        if export_id != self._export_id or self._export_worker is None:
+            return
+
+        self._progress_bar.setRange(0, total)
+        self._progress_bar.setValue(written)
+
+    def finish_export(self, export_id: int, path: str):
+        """
+        Tells the user where the differences were exported.
+
+        Args:
+            export_id (int): The id of the finished export.
+            path (str): The path of the exported file.
+        """
+        if export_id != self._export_id or self._export_worker is None:
+            return
+
+        self.__set_exporting(False)
+        QMessageBox.information(self, "KittyScope", f"Differences exported to {path}")
+
+    def fail_export(self, export_id: int, message: str):
+        """
+        Shows the error of a failed export.
+
+        Args:
+            export_id (int): The id of the failed export.
+            message (str): The error message.
+        """
+        if export_id != self._export_id or self._export_worker is None:
+            return
+
+        self.__set_exporting(False)
+        QMessageBox.critical(self, "Export failed", message)
+
+    def done(self, result: int):
+        """
+        Cancels running exports and waits for the threads before the dialog closes.
+
+        Args:
+            result (int): The dialog result code.
+        """
+        self._diff_id += 1
+        self.cancel_export()
+        for thread, _ in list(self._threads):
+            thread.quit()
+            thread.wait()
+        super().done(result)
+
+    def __set_exporting(self, flag: bool):
+        """
+        Shows or hides the export progress and resets the export worker when it stops.
+
+        Args:
+            flag (bool): If True, an export is running.
+        """
+        if not flag:
+            self._export_worker = None
+        self._progress_bar.setHidden(not flag)
+        self._export_button.setText("Cancel export" if flag else "Export")
+
+    def __release_threads(self):
+        """
+        Forgets the threads of comparisons and exports that have stopped.
+        """
+        running_threads = []
+        for thread, worker in self._threads:
+            if thread.isFinished():
+                thread.deleteLater()
+            else:
+                running_threads.append((thread, worker))
+        self._threads = running_threads
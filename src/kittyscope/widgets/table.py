@@ -1,105 +1,149 @@
-from PySide6.QtWidgets import (
-    QTableWidget,
-    QAbstractItemView,
-    QTableWidgetItem,
-    QProgressBar,
-    QApplication,
-)
-from PySide6.QtCore import Qt, QDateTime
-import time
-
-
-class TableResults(QTableWidget):
+from PySide6.QtWidgets import QTableView, QAbstractItemView
+from PySide6.QtCore import Qt, Signal, QModelIndex
+import polars as pl
+import os
+
+from kittyscope.widgets.results_model import ResultsTableModel
+
+
+class TableResults(QTableView):
     """
-    A table widget for displaying file information.
+    A table view for displaying file information.
 
-    Attributes:
-        _finder (Finder): The Finder object used to retrieve file information.
+    The rows are read lazily from a ResultsTableModel backed by the polars
+    results table, so only the visible rows are ever materialized.
+
+    Signals:
+        cellDoubleClicked (int, int): Emitted with the row and column of a double-clicked cell.
 
     Methods:
-        display_results(self, folder_path: str): Displays the file information for the given folder.
+        display_results(self, results_table: pl.DataFrame): Displays the given results table.
     """
 
+    cellDoubleClicked = Signal(int, int)
+
     def __init__(self):
         super().__init__()
+        self._model = ResultsTableModel()
+        self.setModel(self._model)
         self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.setSortingEnabled(True)
-        self.setColumnCount(6)
-        self.setHorizontalHeaderLabels(
-            [
-                "Name",
-                "Type",
-                "Size (bytes)",
-                "Extension",
-                "Last access",
-                "Last modification",
-            ]
-        )
-        self._search_items = []
-
-    def display_results(
-        self, table_data: dict[str, list], progress_bar: QProgressBar
-    ) -> None:
-        """
-        Displays the file information for the given folder.
+        self.doubleClicked.connect(self.__emit_cell_double_clicked)
+        self._search_rows: list[int] = []
+        self._search_text = ""
+        self._search_mode = "substring"
+
+    def clear_results(self) -> None:
+        """
+        Removes all rows from the table.
+        """
+        self._model.set_table(pl.DataFrame())
+        self._search_rows = []
+
+    def display_results(self, results_table: pl.DataFrame) -> None:
+        """
+        Replaces the table contents with the given results table.
 
         Args:
-            folder_path (str): The path to the folder containing the files.
+            results_table (pl.DataFrame): The results table to display.
         """
-        self.setRowCount(0)
-        table_params = list(table_data.keys())
-        table_rows = len(table_data["name"])
+        self._model.set_table(results_table)
+        self._search_rows = []
+        self.setColumnWidth(0, 150)
 
-        for i in range(table_rows):
-            self.insertRow(i)
+    def append_results(self, batch: pl.DataFrame) -> None:
+        """
+        Appends a batch of rows to the table.
 
-        progress_bar.setMaximum(table_rows * len(table_params))
-        progress_bar_counter = 0
-        for param, values in table_data.items():
-            for i, value in enumerate(values):
-                item = QTableWidgetItem()
-                param_index = table_params.index(param)
+        Args:
+            batch (pl.DataFrame): The rows to append.
+        """
+        first_batch = self._model.rowCount() == 0
+        self._model.append_rows(batch)
+        if first_batch:
+            self.setColumnWidth(0, 150)
 
-                if isinstance(value, int) | isinstance(value, QDateTime):
-                    item.setData(Qt.DisplayRole, value)
-                else:
-                    item.setText(value)
+    def finish_results(self) -> None:
+        """
+        Sorts the appended rows once all batches of a scan have arrived.
+        """
+        self._model.finish_rows()
 
-                if param_index != 0:
-                    item.setFlags(
-                        item.flags() & ~Qt.ItemIsEditable & ~Qt.ItemIsSelectable
-                    )
+    def update_results(self, results_table: pl.DataFrame) -> None:
+        """
+        Replaces the table contents after an incremental update.
 
-                self.setItem(i, param_index, item)
+        Unlike display_results, this keeps the sort order, the search results
+        and the scroll position.
 
-                progress_bar_counter += 1
-                progress_bar.setValue(progress_bar_counter)
-                QApplication.processEvents()
-                time.sleep(0.001)
+        Args:
+            results_table (pl.DataFrame): The updated results table.
+        """
+        scroll_position = self.verticalScrollBar().value()
+        self._model.set_table(results_table)
+        self._search_rows = self._model.find_rows(self._search_text, self._search_mode)
+        self.verticalScrollBar().setValue(scroll_position)
 
-        self.setColumnWidth(0, 150)
+    def filter_file_type(self, file_type: str | None) -> None:
+        """
+        Displays only the rows of a file type, keeping the sort order and the search.
 
-        for column in range(1, self.columnCount()):
-            self.resizeColumnToContents(column)
+        Args:
+            file_type (str | None): The file type to display, or None to display every row.
+        """
+        self._model.set_file_type(file_type)
+        self._search_rows = self._model.find_rows(self._search_text, self._search_mode)
 
-    def search(self, text: str) -> None:
+    def get_relative_path(self, row: int) -> str:
         """
-        Searches the table for the given text and sets the current item to the first found item.
+        Returns the path of the element in the given row relative to the scanned folder.
+
+        Args:
+            row (int): The row of the element.
+
+        Returns:
+            str: The relative path of the element.
+        """
+        name = self._model.get_value(row, "name")
+        if "parent" in self._model.columns:
+            return os.path.join(self._model.get_value(row, "parent"), name)
+        return name
+
+    def search(self, text: str, mode: str = "substring") -> None:
+        """
+        Searches the names for the given text and selects the first found row.
 
         Args:
             text (str): The text to search for.
+            mode (str): The search mode, "substring", "glob" or "regex".
         """
-        self._search_items = self.findItems(text, Qt.MatchContains)
-        if self._search_items:
-            item = self._search_items[0]
-            self.setCurrentItem(item)
+        self._search_text = text
+        self._search_mode = mode
+        self._search_rows = self._model.find_rows(text, mode)
+        if self._search_rows:
+            self.__select_row(self._search_rows[0])
 
     def step_through_results(self, step: int) -> None:
         """
-        Steps through the search results and sets the current item to the item at the given step.
+        Steps through the search results and selects the row at the given step.
 
         Args:
             step (int): The step to move to in the search results.
         """
-        if self._search_items:
-            self.setCurrentItem(self._search_items[step])
+        if self._search_rows:
+            self.__select_row(self._search_rows[step])
+
+    def __select_row(self, row: int) -> None:
+        """
+        Makes the name cell of the given row current and scrolls to it.
+
+        Args:
+            row (int): The row to select.
+        """
+        index = self._model.index(row, 0)
+        self.setCurrentIndex(index)
+        self.scrollTo(index)
+
+    def __emit_cell_double_clicked(self, index: QModelIndex) -> None:
+        self.cellDoubleClicked.emit(index.row(), index.column())
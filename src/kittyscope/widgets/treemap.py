@@ -0,0 +1,220 @@
+from PySide6.QtCore import QRectF, Qt, Signal
+from PySide6.QtGui import QColor, QPainter, QPen
+from PySide6.QtWidgets import QToolTip, QWidget
+import polars as pl
+
+from kittyscope.models.crawler import ROOT_PARENT, join_relative
+from kittyscope.models.scanner import FILE_TYPES
+from kittyscope.models.treemap import (
+    DEFAULT_MIN_CELL_AREA,
+    OTHER_CELL,
+    TreemapCell,
+    get_children,
+    get_parent_path,
+    layout_treemap,
+)
+
+MIN_LABEL_WIDTH = 40
+MIN_LABEL_HEIGHT = 16
+LABEL_MARGIN = 3
+
+FOLDER_COLOR = QColor(110, 140, 190)
+OTHER_COLOR = QColor(170, 170, 170)
+UNKNOWN_COLOR = QColor(200, 200, 200)
+FILE_TYPE_COLORS = {
+    file_type: QColor.fromHsv(index * 360 // len(FILE_TYPES.categories), 110, 230)
+    for index, file_type in enumerate(FILE_TYPES.categories)
+}
+
+
+class TreemapWidget(QWidget):
+    """
+    A squarified treemap of the sizes of the entries of one folder.
+
+    Cells are painted directly with QPainter. Only the children of the shown
+    folder are queried and laid out, when the folder or the widget size changes,
+    and children smaller than min_cell_area pixels are grouped into one "other"
+    cell. The cost of a repaint therefore depends on the size of the widget, not
+    on the size of the scanned tree.
+
+    Clicking a folder cell shows that folder, and a right click goes back up.
+
+    Signals:
+        root_changed (str): The shown folder relative to the scanned folder, or ".".
+
+    Attributes:
+        _table (pl.DataFrame | None): The results table of the scan.
+        _root (str): The shown folder relative to the scanned folder.
+        _children (pl.DataFrame | None): The children of the shown folder.
+        _cells (list[TreemapCell]): The laid out cells of the current size.
+    """
+
+    root_changed = Signal(str)
+
+    def __init__(self, min_cell_area: float = DEFAULT_MIN_CELL_AREA):
+        """
+        Initializes the TreemapWidget.
+
+        Args:
+            min_cell_area (float): The smallest area in pixels of an entry drawn in
+                a cell of its own.
+        """
+        super().__init__()
+        self.setMouseTracking(True)
+        self.setMinimumHeight(200)
+        self.min_cell_area = min_cell_area
+        self._table: pl.DataFrame | None = None
+        self._root = ROOT_PARENT
+        self._children: pl.DataFrame | None = None
+        self._cells: list[TreemapCell] = []
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    def set_table(self, results_table: pl.DataFrame) -> None:
+        """
+        Shows a new or updated results table.
+
+        The shown folder is kept while it still has entries, otherwise the
+        scanned folder is shown.
+
+        Args:
+            results_table (pl.DataFrame): The results table of the scan.
+        """
+        self._table = results_table
+        root = self._root
+        if root != ROOT_PARENT and (
+            "parent" not in results_table.columns
+            or results_table.filter(pl.col("parent") == root).is_empty()
+        ):
+            root = ROOT_PARENT
+        self.set_root(root)
+
+    def clear(self) -> None:
+        """
+        Removes the results table and all cells.
+        """
+        self._table = None
+        self._children = None
+        self._cells = []
+        self._root = ROOT_PARENT
+        self.update()
+
+    def set_root(self, relative_path: str) -> None:
+        """
+        Shows the children of a folder.
+
+        Args:
+            relative_path (str): The folder relative to the scanned folder, or ".".
+        """
+        changed = relative_path != self._root
+        self._root = relative_path
+        if self._table is not None:
+            self._children = get_children(self._table, relative_path)
+        self.__layout()
+        if changed:
+            self.root_changed.emit(relative_path)
+
+    def go_up(self) -> None:
+        """
+        Shows the parent of the shown folder.
+        """
+        if self._root != ROOT_PARENT:
+            self.set_root(get_parent_path(self._root))
+
+    def cell_at(self, x: float, y: float) -> TreemapCell | None:
+        """
+        Returns the cell at a position of the widget.
+
+        Args:
+            x (float): The horizontal position.
+            y (float): The vertical position.
+
+        Returns:
+            TreemapCell | None: The cell, or None if there is none there.
+        """
+        for cell in self._cells:
+            if cell.contains(x, y):
+                return cell
+        return None
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().base())
+        border = QPen(self.palette().window().color().darker(130))
+        border.setWidthF(0.5)
+        painter.setPen(border)
+
+        for cell in self._cells:
+            rect = QRectF(cell.x, cell.y, cell.width, cell.height)
+            painter.fillRect(rect, self.__get_color(cell))
+            if cell.width >= 2 and cell.height >= 2:
+                painter.drawRect(rect)
+
+        painter.setPen(self.palette().text().color())
+        metrics = painter.fontMetrics()
+        for cell in self._cells:
+            if cell.width < MIN_LABEL_WIDTH or cell.height < MIN_LABEL_HEIGHT:
+                continue
+            label = cell.name if cell.count == 1 else f"{cell.count:,} others"
+            rect = QRectF(cell.x, cell.y, cell.width, cell.height).adjusted(
+                LABEL_MARGIN, LABEL_MARGIN, -LABEL_MARGIN, -LABEL_MARGIN
+            )
+            painter.drawText(
+                rect,
+                Qt.AlignLeft | Qt.AlignTop,
+                metrics.elidedText(label, Qt.ElideRight, int(rect.width())),
+            )
+        painter.end()
+
+    def resizeEvent(self, event):
+        self.__layout()
+        super().resizeEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.RightButton or event.button() == Qt.BackButton:
+            self.go_up()
+            return
+
+        position = event.position()
+        cell = self.cell_at(position.x(), position.y())
+        if (
+            event.button() == Qt.LeftButton
+            and cell is not None
+            and cell.type == "folder"
+            and "parent" in self._table.columns
+        ):
+            self.set_root(join_relative(self._root, cell.name))
+
+    def mouseMoveEvent(self, event):
+        position = event.position()
+        cell = self.cell_at(position.x(), position.y())
+        if cell is None:
+            QToolTip.hideText()
+            return
+
+        name = cell.name if cell.count == 1 else f"{cell.count:,} smaller entries"
+        QToolTip.showText(
+            event.globalPosition().toPoint(), f"{name}\n{cell.size:,} bytes", self
+        )
+
+    def __layout(self) -> None:
+        """
+        Lays out the children of the shown folder for the current size and repaints.
+        """
+        if self._children is None:
+            self._cells = []
+        else:
+            self._cells = layout_treemap(
+                self._children, self.width(), self.height(), self.min_cell_area
+            )
+        self.update()
+
+    @staticmethod
+    def __get_color(cell: TreemapCell) -> QColor:
+        if cell.name == OTHER_CELL and cell.type is None:
+            return OTHER_COLOR
+        if cell.type == "folder":
+            return FOLDER_COLOR
+        return FILE_TYPE_COLORS.get(cell.file_type, UNKNOWN_COLOR)
@@ -0,0 +1,336 @@
+import copy
+import threading
+
+import polars as pl
+from PySide6.QtCore import QObject, Signal
+
+from kittyscope.models.batch_prober import DEFAULT_PROBE_WORKERS, probe_files
+from kittyscope.models.content_sniffer import sniff_files
+from kittyscope.models.exporter import export_table
+from kittyscope.models.finder import Finder
+from kittyscope.models.scan_cache import ScanCache
+from kittyscope.models.scan_diff import diff_scans
+from kittyscope.models.scanner import ScanCancelled
+from kittyscope.models.snapshots import SnapshotStore
+
+EXPORT_FILTERS = {
+    "CSV (*.csv)": ".csv",
+    "Parquet (*.parquet)": ".parquet",
+    "NDJSON (*.ndjson)": ".ndjson",
+}
+
+
+class ScanWorker(QObject):
+    """
+    Runs a Finder scan on a background thread and streams its rows back.
+
+    Every signal carries the id of the scan, so the receiver can drop signals of
+    scans it has already abandoned.
+
+    Signals:
+        batch_ready (int, object): A polars DataFrame with the next scanned rows.
+        scan_finished (int, object): The Finder holding the final results table.
+        scan_failed (int, str): The error message of a failed scan.
+        done (): Emitted last, whatever the outcome of the scan.
+    """
+
+    batch_ready = Signal(int, object)
+    scan_finished = Signal(int, object)
+    scan_failed = Signal(int, str)
+    done = Signal()
+
+    def __init__(
+        self,
+        scan_id: int,
+        path: str,
+        recursive: bool = False,
+        cache: ScanCache | None = None,
+        force_rescan: bool = False,
+    ):
+        """
+        Initializes the ScanWorker object.
+
+        Args:
+            scan_id (int): The id attached to every emitted signal.
+            path (str): The path to the directory to scan.
+            recursive (bool): If True, crawls the whole tree.
+            cache (ScanCache | None): The cache shared by all scans.
+            force_rescan (bool): If True, ignores a valid cached table.
+        """
+        super().__init__()
+        self.scan_id = scan_id
+        self.path = path
+        self.recursive = recursive
+        self.cache = cache
+        self.force_rescan = force_rescan
+        self._cancel_event = threading.Event()
+
+    def run(self):
+        """
+        Runs the scan. Connected to QThread.started.
+        """
+        try:
+            finder = Finder(
+                self.path,
+                recursive=self.recursive,
+                cancel_event=self._cancel_event,
+                on_batch=lambda batch: self.batch_ready.emit(self.scan_id, batch),
+                cache=self.cache,
+                force_rescan=self.force_rescan,
+            )
+            self.scan_finished.emit(self.scan_id, finder)
+        except ScanCancelled:
+            pass
+        except Exception as e:
+            self.scan_failed.emit(self.scan_id, e.__str__())
+        finally:
+            self.done.emit()
+
+    def cancel(self):
+        """
+        Cancels the scan. Safe to call from any thread.
+        """
+        self._cancel_event.set()
+
+
+class RefreshWorker(QObject):
+    """
+    Lists changed folders of a scan again on a background thread.
+
+    The folders are refreshed on a copy of the Finder, so the GUI thread keeps
+    reading the current results table meanwhile. The receiver replaces the
+    results table of its Finder with the refreshed one.
+
+    Signals:
+        refresh_finished (int, object, object): The refreshed polars DataFrame
+            and the list of FolderChanges of every folder.
+        refresh_failed (int, str): The error message of a failed refresh.
+        done (): Emitted last, whatever the outcome of the refresh.
+    """
+
+    refresh_finished = Signal(int, object, object)
+    refresh_failed = Signal(int, str)
+    done = Signal()
+
+    def __init__(self, refresh_id: int, finder: Finder, folders: list[str]):
+        """
+        Initializes the RefreshWorker object.
+
+        Args:
+            refresh_id (int): The id attached to every emitted signal.
+            finder (Finder): The Finder holding the results table to refresh.
+            folders (list[str]): The changed folders relative to the scanned folder.
+        """
+        super().__init__()
+        self.refresh_id = refresh_id
+        self.finder = copy.copy(finder)
+        self.folders = folders
+
+    def run(self):
+        """
+        Runs the refresh. Connected to QThread.started.
+        """
+        try:
+            changes = [self.finder.refresh_folder(folder) for folder in self.folders]
+            self.refresh_finished.emit(
+                self.refresh_id, self.finder.results_table, changes
+            )
+        except Exception as e:
+            self.refresh_failed.emit(self.refresh_id, e.__str__())
+        finally:
+            self.done.emit()
+
+
+class ProbeWorker(QObject):
+    """
+    Extracts the media metadata of a results table on a background thread.
+
+    The type of every file is first detected from its content, so files are
+    probed by what they contain rather than by their extension. The worker only
+    reads the given table. The receiver merges the probe results, which include
+    the "detected_type" column, into its Finder on the GUI thread.
+
+    Signals:
+        progress (int, int, int): The probe id, the probed and the total number of files.
+        probe_finished (int, object): A polars DataFrame with the probe results.
+        probe_failed (int, str): The error message of a failed probe.
+        done (): Emitted last, whatever the outcome of the probe.
+    """
+
+    progress = Signal(int, int, int)
+    probe_finished = Signal(int, object)
+    probe_failed = Signal(int, str)
+    done = Signal()
+
+    def __init__(
+        self,
+        probe_id: int,
+        path: str,
+        results_table: pl.DataFrame,
+        max_workers: int = DEFAULT_PROBE_WORKERS,
+    ):
+        """
+        Initializes the ProbeWorker object.
+
+        Args:
+            probe_id (int): The id attached to every emitted signal.
+            path (str): The path to the scanned directory.
+            results_table (pl.DataFrame): The results table of the scan.
+            max_workers (int): The number of worker processes.
+        """
+        super().__init__()
+        self.probe_id = probe_id
+        self.path = path
+        self.results_table = results_table
+        self.max_workers = max_workers
+        self._cancel_event = threading.Event()
+
+    def run(self):
+        """
+        Runs the probe. Connected to QThread.started.
+        """
+
+        def on_progress(done: int, total: int) -> None:
+            self.progress.emit(self.probe_id, done, total)
+
+        try:
+            detected_types = sniff_files(
+                self.path,
+                self.results_table,
+                on_progress=on_progress,
+                cancel_event=self._cancel_event,
+            )
+            probe_results = probe_files(
+                self.path,
+                self.results_table,
+                max_workers=self.max_workers,
+                on_progress=on_progress,
+                cancel_event=self._cancel_event,
+                detected_types=detected_types,
+            )
+            self.probe_finished.emit(
+                self.probe_id,
+                detected_types.join(probe_results, on="path", how="left"),
+            )
+        except ScanCancelled:
+            pass
+        except Exception as e:
+            self.probe_failed.emit(self.probe_id, e.__str__())
+        finally:
+            self.done.emit()
+
+    def cancel(self):
+        """
+        Cancels the probe. Safe to call from any thread.
+        """
+        self._cancel_event.set()
+
+
+class ExportWorker(QObject):
+    """
+    Writes a results table to a file on a background thread.
+
+    Signals:
+        progress (int, int, int): The export id, the written and the total number of rows.
+        export_finished (int, str): The path of the exported file.
+        export_failed (int, str): The error message of a failed export.
+        done (): Emitted last, whatever the outcome of the export.
+    """
+
+    progress = Signal(int, int, int)
+    export_finished = Signal(int, str)
+    export_failed = Signal(int, str)
+    done = Signal()
+
+    def __init__(self, export_id: int, table: pl.DataFrame, path: str):
+        """
+        Initializes the ExportWorker object.
+
+        Args:
+            export_id (int): The id attached to every emitted signal.
+            table (pl.DataFrame): The table to export. It is only read.
+            path (str): The path of the exported file. Its extension picks the format.
+        """
+        super().__init__()
+        self.export_id = export_id
+        self.table = table
+        self.path = path
+        self._cancel_event = threading.Event()
+
+    def run(self):
+        """
+        Runs the export. Connected to QThread.started.
+        """
+        try:
+            export_table(
+                self.table,
+                self.path,
+                on_progress=lambda written, total: self.progress.emit(
+                    self.export_id, written, total
+                ),
+                cancel_event=self._cancel_event,
+            )
+            self.export_finished.emit(self.export_id, self.path)
+        except ScanCancelled:
+            pass
+        except Exception as e:
+            self.export_failed.emit(self.export_id, e.__str__())
+        finally:
+            self.done.emit()
+
+    def cancel(self):
+        """
+        Cancels the export. Safe to call from any thread.
+        """
+        self._cancel_event.set()
+
+
+class DiffWorker(QObject):
+    """
+    Loads a snapshot and compares it with a results table on a background thread.
+
+    Signals:
+        diff_finished (int, object): The ScanDiff between the snapshot and the table.
+        diff_failed (int, str): The error message of a failed comparison.
+        done (): Emitted last, whatever the outcome of the comparison.
+    """
+
+    diff_finished = Signal(int, object)
+    diff_failed = Signal(int, str)
+    done = Signal()
+
+    def __init__(
+        self,
+        diff_id: int,
+        store: SnapshotStore,
+        snapshot_id: str,
+        results_table: pl.DataFrame,
+    ):
+        """
+        Initializes the DiffWorker object.
+
+        Args:
+            diff_id (int): The id attached to every emitted signal.
+            store (SnapshotStore): The store holding the snapshot.
+            snapshot_id (str): The id of the earlier snapshot.
+            results_table (pl.DataFrame): The later results table. It is only read.
+        """
+        super().__init__()
+        self.diff_id = diff_id
+        self.store = store
+        self.snapshot_id = snapshot_id
+        self.results_table = results_table
+
+    def run(self):
+        """
+        Runs the comparison. Connected to QThread.started.
+        """
+        try:
+            snapshot_table = self.store.load(self.snapshot_id)
+            self.diff_finished.emit(
+                self.diff_id, diff_scans(snapshot_table, self.results_table)
+            )
+        except Exception as e:
+            self.diff_failed.emit(self.diff_id, e.__str__())
+        finally:
+            self.done.emit()
@@ -0,0 +1,54 @@
+import codecs
+
+import pytest
+
+from kittyscope.models.content_sniffer import TEXT_TYPE, detect_type, sniff_file
+
+MP3_FRAME = b"\xff\xfb\x90\x64" + bytes(60)
+
+
+@pytest.mark.parametrize(
+    ("bom", "encoding"),
+    [
+        (codecs.BOM_UTF8, "utf-8"),
+        (codecs.BOM_UTF16_LE, "utf-16-le"),
+        (codecs.BOM_UTF16_BE, "utf-16-be"),
+    ],
+    ids=["utf-8", "utf-16-le", "utf-16-be"],
+)
+def test_text_with_bom(bom: bytes, encoding: str) -> None:
+    assert detect_type(bom + "hello world".encode(encoding)) == TEXT_TYPE
+
+
+@pytest.mark.parametrize(
+    ("head", "file_type"),
+    [
+        (b"\xef\xbb\xbf<?xml version='1.0'?>", "data"),
+        (b"\xef\xbb\xbf<!DOCTYPE html>", "web"),
+        (b"<?xml version='1.0'?>", "data"),
+    ],
+)
+def test_markup_with_bom(head: bytes, file_type: str) -> None:
+    assert detect_type(head) == file_type
+
+
+def test_mp3_frame_without_id3() -> None:
+    assert detect_type(MP3_FRAME) == "audio"
+
+
+@pytest.mark.parametrize(
+    "head", [b"\xff\xfe\x00\x00", b"\xff\xff\xff\xff"], ids=["fffe", "ffff"]
+)
+def test_mpeg_sync_excludes_bom_and_blank_bytes(head: bytes) -> None:
+    assert detect_type(head) != "audio"
+
+
+def test_midi_is_data() -> None:
+    assert detect_type(b"MThd\x00\x00\x00\x06\x00\x01\x00\x02\x01\xe0") == "data"
+
+
+def test_sniff_file(tmp_path) -> None:
+    path = tmp_path / "song.dat"
+    path.write_bytes(MP3_FRAME * 4)
+
+    assert sniff_file(str(path)) == "audio"
@@ -0,0 +1,162 @@
+import zlib
+
+import pytest
+
+from kittyscope.models.pdf_trailer import read_pdf_info
+from kittyscope.models.researchers import PdfResearcher
+
+HEADER = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
+CATALOG = b"<< /Type /Catalog /Pages 2 0 R >>"
+PAGE = b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>"
+INFO = b"<< /Title (Quarterly report) /Author (Kitty) /Producer (tests) >>"
+
+
+def pages(*numbers: int) -> bytes:
+    kids = b" ".join(b"%d 0 R" % number for number in numbers)
+    return b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(numbers))
+
+
+def write_object(data: bytearray, number: int, body: bytes) -> int:
+    offset = len(data)
+    data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    return offset
+
+
+def write_xref_table(data: bytearray, offsets: dict[int, int], trailer: bytes) -> int:
+    xref_offset = len(data)
+    data += b"xref\n"
+    for number, offset in sorted(offsets.items()):
+        entry = b"%010d 00000 n" % offset if offset else b"0000000000 65535 f"
+        data += b"%d 1\n%s\r\n" % (number, entry)
+    data += b"trailer\n<< %s >>\nstartxref\n%d\n%%%%EOF\n" % (trailer, xref_offset)
+    return xref_offset
+
+
+def build_classic_pdf() -> tuple[bytearray, int]:
+    data = bytearray(HEADER)
+    offsets = {0: 0}
+    for number, body in [
+        (1, CATALOG),
+        (2, pages(3, 4)),
+        (3, PAGE),
+        (4, PAGE),
+        (5, INFO),
+    ]:
+        offsets[number] = write_object(data, number, body)
+    xref_offset = write_xref_table(data, offsets, b"/Size 6 /Root 1 0 R /Info 5 0 R")
+    return data, xref_offset
+
+
+def build_xref_stream_pdf() -> bytearray:
+    data = bytearray(HEADER)
+    offsets = {1: write_object(data, 1, CATALOG), 5: write_object(data, 5, INFO)}
+
+    # The page tree is stored compressed in the object stream 6.
+    header = b""
+    content = b""
+    for number, body in [(2, pages(3, 4)), (3, PAGE), (4, PAGE)]:
+        header += b"%d %d " % (number, len(content))
+        content += body + b"\n"
+    stream = zlib.compress(header + content)
+    offsets[6] = write_object(
+        data,
+        6,
+        b"<< /Type /ObjStm /N 3 /First %d /Filter /FlateDecode /Length %d >>\n"
+        b"stream\n%s\nendstream" % (len(header), len(stream), stream),
+    )
+
+    # Entries are a type byte, a 4-byte offset or stream number and a 2-byte
+    # index in the stream.
+    entries = [b"\x00" + bytes(4) + b"\xff\xff"]
+    for number in range(1, 7):
+        if number in offsets:
+            entries.append(b"\x01" + offsets[number].to_bytes(4, "big") + bytes(2))
+        else:
+            entries.append(
+                b"\x02" + (6).to_bytes(4, "big") + (number - 2).to_bytes(2, "big")
+            )
+    xref = zlib.compress(b"".join(entries))
+    xref_offset = write_object(
+        data,
+        7,
+        b"<< /Type /XRef /Size 8 /Index [0 7] /W [1 4 2] /Root 1 0 R /Info 5 0 R "
+        b"/Filter /FlateDecode /Length %d >>\nstream\n%s\nendstream"
+        % (len(xref), xref),
+    )
+    data += b"startxref\n%d\n%%%%EOF\n" % xref_offset
+    return data
+
+
+def build_incremental_pdf() -> bytearray:
+    data, previous_xref = build_classic_pdf()
+    offsets = {
+        2: write_object(data, 2, pages(3, 4, 6)),
+        5: write_object(data, 5, b"<< /Title (Revised report) /Author (Kitty) >>"),
+        6: write_object(data, 6, PAGE),
+    }
+    write_xref_table(
+        data,
+        offsets,
+        b"/Size 7 /Root 1 0 R /Info 5 0 R /Prev %d" % previous_xref,
+    )
+    return data
+
+
+@pytest.fixture
+def write_pdf(tmp_path):
+    def write(data: bytes) -> str:
+        path = tmp_path / "document.pdf"
+        path.write_bytes(data)
+        return str(path)
+
+    return write
+
+
+def test_classic_xref_table(write_pdf) -> None:
+    info = read_pdf_info(write_pdf(build_classic_pdf()[0]))
+
+    assert info == {
+        "author": "Kitty",
+        "title": "Quarterly report",
+        "pages_count": 2,
+        "subject": "-",
+        "creator": "-",
+        "producer": "tests",
+    }
+
+
+def test_xref_stream_with_object_stream(write_pdf) -> None:
+    info = read_pdf_info(write_pdf(build_xref_stream_pdf()))
+
+    assert info["title"] == "Quarterly report"
+    assert info["pages_count"] == 2
+
+
+def test_incremental_update(write_pdf) -> None:
+    info = read_pdf_info(write_pdf(build_incremental_pdf()))
+
+    assert info["title"] == "Revised report"
+    assert info["producer"] == "-"
+    assert info["pages_count"] == 3
+
+
+def test_corrupt_xref_falls_back_to_pypdf(write_pdf) -> None:
+    # The startxref offset points into the object before the table, which
+    # pypdf recovers from by searching for the table.
+    data, xref_offset = build_classic_pdf()
+    data = data[: data.rindex(b"startxref")]
+    data += b"startxref\n%d\n%%%%EOF\n" % (xref_offset - 10)
+    path = write_pdf(data)
+
+    assert read_pdf_info(path) is None
+    assert PdfResearcher().get_file_info(path) == (
+        "pdf",
+        {
+            "author": "Kitty",
+            "title": "Quarterly report",
+            "pages_count": 2,
+            "subject": "-",
+            "creator": "-",
+            "producer": "tests",
+        },
+    )